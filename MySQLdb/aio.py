@@ -0,0 +1,444 @@
+import asyncio
+import collections
+import concurrent.futures
+import ctypes
+import functools
+import os
+import socket
+
+from MySQLdb import libmysql
+from MySQLdb.connection import Connection, strconv
+from MySQLdb.cursors import Result
+from MySQLdb.exceptions import NotSupportedError
+
+
+# The size of the pool of worker threads connections share, unless they're
+# given an executor of their own.
+DEFAULT_MAX_WORKERS = 32
+_executor = None
+
+
+def _shutdown_socket(db):
+    # Once the socket is shut down, anything the client library sends on it,
+    # like the COM_QUIT mysql_close() sends, fails straight away rather than
+    # blocking on the server.
+    fd = libmysql.c.mysql_get_socket(db)
+    if fd < 0:
+        return
+    try:
+        sock = socket.socket(fileno=os.dup(fd))
+    except OSError:
+        return
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+    finally:
+        sock.close()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = concurrent.futures.ThreadPoolExecutor(DEFAULT_MAX_WORKERS)
+    return _executor
+
+
+class AsyncConnection(object):
+    # Wraps a Connection for use from asyncio. Every blocking call is run on
+    # a bounded pool of worker threads shared with other connections, so the
+    # event loop never blocks. A connection's calls are made one at a time,
+    # in order, so it's only ever used from one thread at once.
+    def __init__(self, connection, executor, loop):
+        self._connection = connection
+        self._executor = executor
+        self._loop = loop
+        self._lock = asyncio.Lock()
+
+    async def _run(self, func, *args, **kwargs):
+        await self._lock.acquire()
+        try:
+            future = self._loop.run_in_executor(self._executor,
+                functools.partial(func, *args, **kwargs))
+        except BaseException:
+            self._lock.release()
+            raise
+        # The lock is held until the call is done, even if the caller is
+        # cancelled in the meantime, as the worker thread carries on anyway.
+        future.add_done_callback(lambda future: self._lock.release())
+        return await asyncio.shield(future)
+
+    @property
+    def connection(self):
+        return self._connection
+
+    @property
+    def closed(self):
+        return self._connection.closed
+
+    def cursor(self, cursor_class=None, **kwargs):
+        return AsyncCursor(self, self._connection.cursor(cursor_class, **kwargs))
+
+    async def autocommit(self, flag):
+        await self._run(self._connection.autocommit, flag)
+
+    async def commit(self):
+        await self._run(self._connection.commit)
+
+    async def rollback(self):
+        await self._run(self._connection.rollback)
+
+    async def ping(self):
+        await self._run(self._connection.ping)
+
+    async def close(self):
+        await self._run(self._connection.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if not self.closed:
+            await self.close()
+
+
+class AsyncCursor(object):
+    def __init__(self, connection, cursor):
+        self.connection = connection
+        self._cursor = cursor
+        # Rows fetched ahead for async iteration.
+        self._rows = collections.deque()
+
+    def _run(self, func, *args):
+        return self.connection._run(func, *args)
+
+    @property
+    def cursor(self):
+        return self._cursor
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def arraysize(self):
+        return self._cursor.arraysize
+
+    @arraysize.setter
+    def arraysize(self, value):
+        self._cursor.arraysize = value
+
+    async def execute(self, query, args=None):
+        self._rows.clear()
+        return await self._run(self._cursor.execute, query, args)
+
+    async def executemany(self, query, args):
+        self._rows.clear()
+        return await self._run(self._cursor.executemany, query, args)
+
+    async def execute_multi(self, statements):
+        self._rows.clear()
+        return await self._run(self._cursor.execute_multi, statements)
+
+    async def nextset(self):
+        self._rows.clear()
+        return await self._run(self._cursor.nextset)
+
+    async def callproc(self, procname, args=()):
+        self._rows.clear()
+        return await self._run(self._cursor.callproc, procname, args)
+
+    async def fetchone(self):
+        if self._rows:
+            return self._rows.popleft()
+        return await self._run(self._cursor.fetchone)
+
+    async def fetchmany(self, size=None):
+        if size is None:
+            size = self._cursor.arraysize
+        rows = []
+        while self._rows and len(rows) < size:
+            rows.append(self._rows.popleft())
+        if len(rows) < size:
+            rows.extend(await self._run(self._cursor.fetchmany,
+                size - len(rows)))
+        return rows
+
+    async def fetchall(self):
+        rows = list(self._rows)
+        self._rows.clear()
+        rows.extend(await self._run(self._cursor.fetchall))
+        return rows
+
+    async def close(self):
+        self._rows.clear()
+        await self._run(self._cursor.close)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        # Rows are fetched arraysize (at least 100) at a time, rather than
+        # going to the worker thread for each one.
+        if not self._rows:
+            self._rows.extend(await self._run(self._cursor.fetchmany,
+                max(self._cursor.arraysize, 100)))
+            if not self._rows:
+                raise StopAsyncIteration
+        return self._rows.popleft()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+
+class NonBlockingConnection(AsyncConnection):
+    # Drives the connection from the event loop with MariaDB's non-blocking
+    # API, waiting for its socket with add_reader/add_writer, so there's no
+    # thread per connection. Calls that don't do any I/O are made directly,
+    # the others hold the lock while they're in progress, so calls from
+    # different coroutines aren't interleaved.
+    def __init__(self, connection, loop):
+        super(NonBlockingConnection, self).__init__(connection, None, loop)
+
+    def _run(self, func, *args, **kwargs):
+        future = self._loop.create_future()
+        try:
+            future.set_result(func(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def cursor(self, cursor_class=None, **kwargs):
+        cursor = self._connection.cursor(cursor_class, **kwargs)
+        if cursor._use_result:
+            raise NotSupportedError(0, "Unbuffered cursors can't be used "
+                "with non-blocking connections")
+        return NonBlockingCursor(self, cursor)
+
+    async def _wait(self, status, db):
+        fd = libmysql.c.mysql_get_socket(db)
+        future = self._loop.create_future()
+        def ready(event):
+            if not future.done():
+                future.set_result(event)
+        timer = None
+        if status & libmysql.MYSQL_WAIT_READ:
+            self._loop.add_reader(fd, ready, libmysql.MYSQL_WAIT_READ)
+        if status & libmysql.MYSQL_WAIT_WRITE:
+            self._loop.add_writer(fd, ready, libmysql.MYSQL_WAIT_WRITE)
+        if status & libmysql.MYSQL_WAIT_TIMEOUT:
+            timer = self._loop.call_later(
+                libmysql.c.mysql_get_timeout_value_ms(db) / 1000.0,
+                ready, libmysql.MYSQL_WAIT_TIMEOUT)
+        try:
+            return await future
+        finally:
+            if status & libmysql.MYSQL_WAIT_READ:
+                self._loop.remove_reader(fd)
+            if status & libmysql.MYSQL_WAIT_WRITE:
+                self._loop.remove_writer(fd)
+            if timer is not None:
+                timer.cancel()
+
+    async def _call(self, start, cont, ret, *args):
+        # Runs start(&ret, *args) to completion, args[0] is the handle the
+        # call is continued on.
+        status = start(ctypes.byref(ret), *args)
+        try:
+            while status:
+                ready = await self._wait(status, args[0])
+                status = cont(ctypes.byref(ret), args[0], ready)
+        except BaseException:
+            # The call can't be picked up again, and the connection is stuck
+            # half way through it. It's closed without waiting on the
+            # server, which may be why the call failed.
+            connection = self._connection
+            if not connection.closed:
+                _shutdown_socket(connection._db)
+                connection.close()
+            raise
+        return ret
+
+    async def _connect(self):
+        connection = self._connection
+        connect_args = connection._connect_args
+        connection._connect_args = None
+        res = await self._call(libmysql.c.mysql_real_connect_start,
+            libmysql.c.mysql_real_connect_cont, libmysql.MYSQL_P(),
+            connection._db, *connect_args)
+        if not res:
+            connection._exception()
+        if connection._charset is not None:
+            res = await self._call(libmysql.c.mysql_set_character_set_start,
+                libmysql.c.mysql_set_character_set_cont, ctypes.c_int(),
+                connection._db, strconv(connection._charset))
+            if res.value:
+                connection._exception()
+        if connection._sql_mode is not None:
+            async with self.cursor() as cursor:
+                await cursor.execute("SET SESSION sql_mode=%s",
+                    (connection._sql_mode,))
+        await self.autocommit(False)
+
+    async def _call_bool(self, name, *args):
+        connection = self._connection
+        async with self._lock:
+            connection._check_closed()
+            connection._check_unbuffered()
+            res = await self._call(getattr(libmysql.c, name + "_start"),
+                getattr(libmysql.c, name + "_cont"), ctypes.c_char(),
+                connection._db, *args)
+            if ord(res.value):
+                connection._exception()
+
+    async def autocommit(self, flag):
+        await self._call_bool("mysql_autocommit", int(flag))
+
+    async def commit(self):
+        await self._call_bool("mysql_commit")
+
+    async def rollback(self):
+        await self._call_bool("mysql_rollback")
+
+    async def ping(self):
+        connection = self._connection
+        async with self._lock:
+            connection._check_closed()
+            connection._check_unbuffered()
+            res = await self._call(libmysql.c.mysql_ping_start,
+                libmysql.c.mysql_ping_cont, ctypes.c_int(), connection._db)
+            if res.value:
+                connection._exception()
+
+    async def close(self):
+        connection = self._connection
+        async with self._lock:
+            connection._check_closed()
+            connection._check_busy()
+            connection._statements.clear()
+            # The handle is given up straight away, mysql_close_cont frees it
+            # once the server has been told.
+            db = connection._db
+            connection._db = None
+            try:
+                status = libmysql.c.mysql_close_start(db)
+                while status:
+                    ready = await self._wait(status, db)
+                    status = libmysql.c.mysql_close_cont(db, ready)
+            except BaseException:
+                _shutdown_socket(db)
+                Connection._mysql_close(db)
+                raise
+
+
+class StoredResult(Result):
+    # A result that has already been read with mysql_store_result_start.
+    def __init__(self, cursor, result, forward_only=False):
+        self._stored = result
+        super(StoredResult, self).__init__(cursor, False, forward_only)
+
+    def _open(self):
+        return self._stored
+
+
+class NonBlockingCursor(AsyncCursor):
+    # Results are always buffered, so only sending queries and reading their
+    # results goes through the event loop, fetching rows is plain Python.
+    async def _query(self, query):
+        async with self.connection._lock:
+            await self._locked_query(query)
+
+    async def _locked_query(self, query):
+        cursor = self._cursor
+        connection = self.connection
+        cursor._start_query(query)
+        db = connection.connection._db
+        res = await connection._call(libmysql.c.mysql_real_query_start,
+            libmysql.c.mysql_real_query_cont, ctypes.c_int(), db, query,
+            len(query))
+        if res.value:
+            connection.connection._exception()
+        result = await connection._call(libmysql.c.mysql_store_result_start,
+            libmysql.c.mysql_store_result_cont, libmysql.MYSQL_RES_P(), db)
+        cursor._result = StoredResult(cursor, result, cursor.forward_only)
+        await self._drop_more_results(db)
+        cursor._check_more_results()
+
+    async def _drop_more_results(self, db):
+        # Only the first result set is kept, any others (such as the status
+        # a CALL ends with) are read and dropped now, rather than blocking
+        # the next time the cursor is used.
+        connection = self.connection
+        while ord(libmysql.c.mysql_more_results(db)):
+            res = await connection._call(libmysql.c.mysql_next_result_start,
+                libmysql.c.mysql_next_result_cont, ctypes.c_int(), db)
+            if res.value > 0:
+                connection.connection._exception()
+            result = await connection._call(
+                libmysql.c.mysql_store_result_start,
+                libmysql.c.mysql_store_result_cont, libmysql.MYSQL_RES_P(), db)
+            if result:
+                libmysql.c.mysql_free_result(result)
+            elif libmysql.c.mysql_errno(db):
+                connection.connection._exception()
+
+    async def execute(self, query, args=None):
+        self._rows.clear()
+        cursor = self._cursor
+        cursor._check_closed()
+        cursor._clear()
+        await self._query(cursor._format_query(query, args))
+
+    async def executemany(self, query, args):
+        rowcount = 0
+        for arg in args:
+            await self.execute(query, arg)
+            rowcount += self._cursor.rowcount
+        self._cursor.rowcount = rowcount
+        return rowcount
+
+    async def execute_multi(self, statements):
+        raise NotSupportedError(0, "Multiple result sets aren't supported "
+            "on non-blocking connections")
+
+    async def nextset(self):
+        raise NotSupportedError(0, "Multiple result sets aren't supported "
+            "on non-blocking connections")
+
+    async def callproc(self, procname, args=()):
+        raise NotSupportedError(0, "Multiple result sets aren't supported "
+            "on non-blocking connections")
+
+
+async def connect(*args, **kwargs):
+    # With nonblocking=True the connection is driven by the event loop
+    # rather than worker threads, this needs MariaDB's client library.
+    # Otherwise its calls run on executor, get_executor()'s shared pool by
+    # default.
+    loop = kwargs.pop("loop", None)
+    executor = kwargs.pop("executor", None)
+    if loop is None:
+        loop = asyncio.get_running_loop()
+    if kwargs.get("nonblocking"):
+        if not libmysql.HAS_NONBLOCKING:
+            raise NotSupportedError(0, "The client library doesn't have the "
+                "non-blocking API")
+        conn = NonBlockingConnection(Connection(*args, **kwargs), loop)
+        await conn._connect()
+        return conn
+    if executor is None:
+        executor = get_executor()
+    connection = await loop.run_in_executor(executor,
+        functools.partial(Connection, *args, **kwargs))
+    return AsyncConnection(connection, executor, loop)
@@ -0,0 +1,64 @@
+import collections
+
+
+class LRUCache(object):
+    # A mapping which holds on to at most max_size items, discarding the least
+    # recently used ones first. on_evict, if given, is called with each value
+    # that's discarded.
+    def __init__(self, max_size, on_evict=None):
+        self.max_size = max_size
+        self.on_evict = on_evict
+        self._items = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, default=None):
+        try:
+            value = self._items[key]
+        except KeyError:
+            return default
+        self._items.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if self.max_size <= 0:
+            if self.on_evict is not None:
+                self.on_evict(value)
+            return
+        if key in self._items:
+            self._items.move_to_end(key)
+        self._items[key] = value
+        while len(self._items) > self.max_size:
+            key, evicted = self._items.popitem(last=False)
+            if self.on_evict is not None:
+                self.on_evict(evicted)
+
+    def pop(self, key, default=None):
+        return self._items.pop(key, default)
+
+    def clear(self):
+        items = list(self._items.values())
+        self._items.clear()
+        if self.on_evict is not None:
+            for value in items:
+                self.on_evict(value)
+
+
+class EncoderCache(object):
+    # Encoders resolved by the type of the value, for a chain of encoders. The
+    # chain is a list which may be changed in place, so it's compared with the
+    # one the cache was filled for, which neither copies nor hashes anything
+    # while it's unchanged, and a changed chain starts an empty cache.
+    def __init__(self):
+        self._chain = None
+        self._types = {}
+
+    def get(self, chain):
+        if chain != self._chain:
+            self._chain = list(chain)
+            self._types = {}
+        return self._types
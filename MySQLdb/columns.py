@@ -0,0 +1,150 @@
+import array
+import ctypes
+
+from MySQLdb import converters, cursors
+from MySQLdb.constants import field_types, FLAG
+
+
+INTEGER_TYPES = frozenset([
+    field_types.TINY, field_types.SHORT, field_types.LONG,
+    field_types.LONGLONG, field_types.INT24, field_types.YEAR,
+])
+FLOAT_TYPES = frozenset([field_types.FLOAT, field_types.DOUBLE])
+# The most digits a DECIMAL can have for its scaled values to fit in 64 bits.
+MAX_SCALED_DIGITS = 18
+
+def decimal_digits(field):
+    # The length of a DECIMAL column counts its sign and decimal point.
+    return (field.length - (field.decimals > 0) -
+        (not field.flags & FLAG.UNSIGNED))
+
+def column_typecode(field, decoder):
+    # The array.array typecode a column is collected into, or None for a
+    # list. Only columns that would be decoded to ints or floats anyway go
+    # into arrays, so the values are the same either way.
+    type_code = field.type
+    if decoder is int and type_code in INTEGER_TYPES:
+        return "Q" if field.flags & FLAG.UNSIGNED else "q"
+    elif decoder is float and (type_code in FLOAT_TYPES or
+        type_code in converters.DECIMAL_TYPES):
+        return "d"
+    elif (decoder is converters.scaled_decoder and
+        type_code in converters.DECIMAL_TYPES and
+        decimal_digits(field) <= MAX_SCALED_DIGITS):
+        return "q"
+    return None
+
+
+class ColumnBatch(object):
+    # Rows of a result, stored by column. Each column is an array.array for
+    # numeric types, with 0 standing in for NULL, or a list. validity has a
+    # bitmap per column, with the bit for each row (least significant bit
+    # first) set unless the value is NULL.
+    def __init__(self, description, columns, validity, num_rows):
+        self.description = description
+        self.columns = columns
+        self.validity = validity
+        self.num_rows = num_rows
+
+    @property
+    def names(self):
+        return [field[0].decode("utf-8") for field in self.description]
+
+    def column(self, name):
+        return self.columns[self.names.index(name)]
+
+    def is_valid(self, column, row):
+        return bool(self.validity[column][row >> 3] & (1 << (row & 7)))
+
+    def __len__(self):
+        return self.num_rows
+
+
+def append_rows(rows, typecodes, appends, nulls, num_rows=0):
+    # Appends rows that were already decoded to the columns, returns the
+    # number of rows the columns then have.
+    for row in rows:
+        for i, value in enumerate(row):
+            if value is None:
+                appends[i](0 if typecodes[i] else None)
+                nulls[i].append(num_rows)
+            else:
+                appends[i](value)
+        num_rows += 1
+    return num_rows
+
+def make_validity(num_rows, nulls):
+    bitmap = bytearray(b"\xff" * ((num_rows + 7) // 8))
+    if num_rows % 8:
+        bitmap[-1] = (1 << (num_rows % 8)) - 1
+    for row in nulls:
+        bitmap[row >> 3] &= ~(1 << (row & 7)) & 0xff
+    return bitmap
+
+
+_column_fillers = {}
+_COLUMN_FILLERS_MAX_SIZE = 1024
+
+def get_column_filler(typecodes, decoders, type_codes):
+    # Generates a function appending the values of one row to the columns,
+    # like cursors.get_row_builder does for tuples.
+    key = (tuple(typecodes), tuple([
+        decoder if decoder is not None else (None, type_code)
+        for decoder, type_code in zip(decoders, type_codes)
+    ]))
+    try:
+        return _column_fillers[key]
+    except KeyError:
+        pass
+
+    namespace = {
+        "string_at": ctypes.string_at,
+        "missing_decoder": cursors._missing_decoder,
+    }
+    n = len(typecodes)
+    lines = [
+        "def fill_row(values, lengths, row, appends, nulls):",
+    ]
+    if n:
+        lines.extend([
+            "    %s, = values" % ", ".join("v%d" % i for i in range(n)),
+            "    %s, = lengths" % ", ".join("l%d" % i for i in range(n)),
+        ])
+    for i, (typecode, decoder) in enumerate(zip(*key)):
+        value = "string_at(v%d, l%d)" % (i, i)
+        if typecode is not None:
+            if decoder is int or decoder is float:
+                value = "%s(%s)" % (decoder.__name__, value)
+            else:
+                namespace["d%d" % i] = decoder
+                value = "d%d(%s)" % (i, value)
+            missing = "0"
+        else:
+            if isinstance(decoder, tuple):
+                value = "missing_decoder(%d, %s)" % (decoder[1], value)
+            elif decoder is not bytes:
+                namespace["d%d" % i] = decoder
+                value = "d%d(%s)" % (i, value)
+            missing = "None"
+        lines.extend([
+            "    if v%d is None:" % i,
+            "        appends[%d](%s)" % (i, missing),
+            "        nulls[%d].append(row)" % i,
+            "    else:",
+            "        appends[%d](%s)" % (i, value),
+        ])
+    lines.append("    return None")
+    exec("\n".join(lines) + "\n", namespace)
+    fill_row = namespace["fill_row"]
+    fill_row.typecodes = key[0]
+
+    if len(_column_fillers) >= _COLUMN_FILLERS_MAX_SIZE:
+        _column_fillers.clear()
+    _column_fillers[key] = fill_row
+    return fill_row
+
+def new_columns(typecodes):
+    return [
+        array.array(typecode) if typecode is not None else []
+        for typecode in typecodes
+    ]
@@ -1,9 +1,12 @@
 import contextlib
+import threading
+import weakref
 from ctypes import (addressof, cast, create_string_buffer, string_at, c_char,
     c_uint, POINTER)
 
-from MySQLdb import cursors, libmysql, converters
-from MySQLdb.constants import error_codes
+from MySQLdb import cursors, libmysql, converters, statements, infile
+from MySQLdb.cache import EncoderCache, LRUCache
+from MySQLdb.constants import error_codes, CLIENT
 
 
 def strconv(val):
@@ -11,6 +14,33 @@ def strconv(val):
         return val.encode('utf-8')
     return val
 
+def to_text(obj):
+    if isinstance(obj, bytes):
+        return obj.decode('utf-8', 'surrogateescape')
+    elif not isinstance(obj, str):
+        return str(obj)
+    return obj
+
+# The same escaping mysql_real_escape_string does for charsets where none of
+# the special characters can appear inside a multibyte sequence.
+ESCAPE_TABLE = str.maketrans({
+    "\0": "\\0",
+    "\n": "\\n",
+    "\r": "\\r",
+    "\\": "\\\\",
+    "'": "\\'",
+    '"': '\\"',
+    "\x1a": "\\Z",
+})
+TRANSLATE_SAFE_CHARSETS = frozenset([
+    "utf8", "utf8mb3", "utf8mb4", "latin1", "ascii", "binary",
+])
+
+def quote_identifier(name):
+    return ".".join([
+        "`%s`" % part.replace("`", "``") for part in name.split(".")
+    ])
+
 
 class Connection(object):
     # This alias is for use in stuff called via __del__, which needs to be sure
@@ -33,9 +63,34 @@ class Connection(object):
 
     def __init__(self, host=None, user=None, passwd=None, db=None, port=0,
         client_flag=0, charset=None, init_command=None, connect_timeout=None,
-        sql_mode=None, encoders=None, decoders=None, use_unicode=True):
+        sql_mode=None, encoders=None, decoders=None, use_unicode=True,
+        plan_cache_size=256, max_statement_size=None,
+        multi_statement_batch=None, statement_cache_size=64,
+        local_infile=False, nonblocking=False, read_timeout=None,
+        write_timeout=None, decimal_mode=None):
 
         self._db = libmysql.c.mysql_init(None)
+        self._unbuffered_result = None
+        self._pending_results = None
+        # The thread a fanout() query is running on, nothing else can use the
+        # connection until it's done.
+        self._busy_thread = None
+        # Decoders and row builders for the result shapes seen on this
+        # connection, see cursors.Result.
+        self._result_plans = LRUCache(plan_cache_size)
+        # Server side prepared statements, by query.
+        self._statements = LRUCache(statement_cache_size,
+            on_evict=statements.PreparedStatement.close)
+        # Encoders resolved by type, for the cursors using the connection's
+        # encoders.
+        self._encoder_cache = EncoderCache()
+        # The largest statement executemany() will send, defaults to the
+        # server's max_allowed_packet.
+        self.max_statement_size = max_statement_size
+        self._max_allowed_packet = None
+        # How many statements a non-INSERT executemany() sends per round trip,
+        # None sends them one by one.
+        self.multi_statement_batch = multi_statement_batch
 
         if connect_timeout is not None:
             connect_timeout = c_uint(connect_timeout)
@@ -45,6 +100,17 @@ class Connection(object):
             )
             if res:
                 self._exception()
+        for option, timeout in [
+            (libmysql.MYSQL_OPT_READ_TIMEOUT, read_timeout),
+            (libmysql.MYSQL_OPT_WRITE_TIMEOUT, write_timeout),
+        ]:
+            if timeout is not None:
+                timeout = c_uint(timeout)
+                res = libmysql.c.mysql_options(self._db, option,
+                    cast(addressof(timeout), POINTER(c_char))
+                )
+                if res:
+                    self._exception()
         if init_command is not None:
             res = libmysql.c.mysql_options(self._db,
                 libmysql.MYSQL_INIT_COMMAND, init_command
@@ -52,31 +118,63 @@ class Connection(object):
             if res:
                 self._exception()
 
-        res = libmysql.c.mysql_real_connect(
-            self._db,
-            strconv(host),
-            strconv(user),
-            strconv(passwd),
-            strconv(db),
-            port, None, client_flag)
-        if not res:
-            self._exception()
+        if local_infile:
+            enable = c_uint(1)
+            res = libmysql.c.mysql_options(self._db,
+                libmysql.MYSQL_OPT_LOCAL_INFILE,
+                cast(addressof(enable), POINTER(c_char))
+            )
+            if res:
+                self._exception()
+            infile.set_handler(self._db)
+            client_flag |= CLIENT.LOCAL_FILES
 
         if encoders is None:
             encoders = converters.DEFAULT_ENCODERS
         if decoders is None:
             decoders = converters.DEFAULT_DECODERS
+        if decimal_mode is not None:
+            decoders = [converters.decimal_mode_decoder(decimal_mode)] + list(decoders)
         self.encoders = encoders
         self.decoders = decoders
+        self._charset = charset
+        self._sql_mode = sql_mode
+
+        # Multiple result sets are always understood, statements only send
+        # them when they're asked to.
+        client_flag |= CLIENT.MULTI_RESULTS
+        self._client_flag = client_flag
+        connect_args = (strconv(host), strconv(user), strconv(passwd),
+            strconv(db), port, None, client_flag)
+        # Only kept until a non-blocking connection has connected, as it
+        # includes the password.
+        self._connect_args = None
 
-        if charset is not None:
-            res = libmysql.c.mysql_set_character_set(self._db, charset)
+        if nonblocking:
+            # MySQLdb.aio connects and sets up the session from the event
+            # loop.
+            res = libmysql.c.mysql_options(self._db,
+                libmysql.MYSQL_OPT_NONBLOCK, None)
             if res:
                 self._exception()
+            self._connect_args = connect_args
+            return
 
-        if sql_mode is not None:
+        res = libmysql.c.mysql_real_connect(self._db, *connect_args)
+        if not res:
+            self._exception()
+        self._init_session()
+
+    def _init_session(self):
+        if self._charset is not None:
+            res = libmysql.c.mysql_set_character_set(self._db,
+                strconv(self._charset))
+            if res:
+                self._exception()
+
+        if self._sql_mode is not None:
             with contextlib.closing(self.cursor()) as cursor:
-                cursor.execute("SET SESSION sql_mode=%s", (sql_mode,))
+                cursor.execute("SET SESSION sql_mode=%s", (self._sql_mode,))
 
         self.autocommit(False)
 
@@ -88,11 +186,61 @@ class Connection(object):
         if self.closed:
             raise self.InterfaceError(0, "")
 
+    def _check_busy(self):
+        if (self._busy_thread is not None and
+            self._busy_thread != threading.get_ident()):
+            raise self.ProgrammingError(2014, "Commands out of sync; a query "
+                "is still running on another thread")
+
+    def _set_busy_thread(self):
+        self._busy_thread = threading.get_ident()
+
+    def _clear_busy_thread(self):
+        self._busy_thread = None
+
+    def _check_unbuffered(self):
+        self._check_busy()
+        # An unbuffered result keeps the connection busy until all of its
+        # rows have been read or it has been closed.
+        if (self._unbuffered_result is not None and
+            self._unbuffered_result() is not None):
+            raise self.ProgrammingError(2014, "Commands out of sync; an "
+                "unbuffered result is still being read")
+        # As does a cursor that hasn't read all of its result sets.
+        if self._pending_results is not None:
+            cursor = self._pending_results()
+            if cursor is None or not ord(libmysql.c.mysql_more_results(self._db)):
+                self._pending_results = None
+                if cursor is not None:
+                    cursor._end_results()
+            else:
+                raise self.ProgrammingError(2014, "Commands out of sync; a "
+                    "cursor still has result sets to be read")
+
+    def _set_unbuffered_result(self, result):
+        self._unbuffered_result = weakref.ref(result)
+
+    def _set_pending_results(self, cursor):
+        self._pending_results = weakref.ref(cursor)
+
+    def _clear_pending_results(self, cursor):
+        if (self._pending_results is not None and
+            self._pending_results() in (cursor, None)):
+            self._pending_results = None
+
+    def _clear_unbuffered_result(self, result):
+        if (self._unbuffered_result is not None and
+            self._unbuffered_result() in (result, None)):
+            self._unbuffered_result = None
+
     def _has_error(self):
         return libmysql.c.mysql_errno(self._db) != 0
 
     def _exception(self):
-        err = libmysql.c.mysql_errno(self._db)
+        self._raise_error(libmysql.c.mysql_errno(self._db),
+            libmysql.c.mysql_error(self._db))
+
+    def _raise_error(self, err, message):
         if not err:
             err_cls = self.InterfaceError
         else:
@@ -102,7 +250,7 @@ class Connection(object):
                 err_cls = self.InternalError
             else:
                 err_cls = self.OperationalError
-        raise err_cls(err, libmysql.c.mysql_error(self._db))
+        raise err_cls(err, message)
 
     @property
     def closed(self):
@@ -110,46 +258,190 @@ class Connection(object):
 
     def close(self):
         self._check_closed()
+        self._check_busy()
+        self._statements.clear()
         self._mysql_close(self._db)
         self._db = None
 
     def autocommit(self, flag):
         self._check_closed()
+        self._check_unbuffered()
         res = libmysql.c.mysql_autocommit(self._db, int(flag))
         if ord(res):
             self._exception()
 
     def commit(self):
         self._check_closed()
+        self._check_unbuffered()
         res = libmysql.c.mysql_commit(self._db, "COMMIT")
         if ord(res):
             self._exception()
 
     def rollback(self):
         self._check_closed()
+        self._check_unbuffered()
         res = libmysql.c.mysql_rollback(self._db)
         if ord(res):
             self._exception()
 
-    def cursor(self, cursor_class=None, encoders=None, decoders=None):
+    def ping(self):
+        self._check_closed()
+        self._check_unbuffered()
+        if libmysql.c.mysql_ping(self._db):
+            self._exception()
+
+    def reset(self):
+        # Puts the session back the way it was right after connecting, where
+        # the server supports it, otherwise just rolls back.
+        self._check_closed()
+        self._check_unbuffered()
+        if not libmysql.HAS_RESET_CONNECTION:
+            self.rollback()
+            return
+        # Resetting deallocates the server's prepared statements.
+        self._statements.clear()
+        if libmysql.c.mysql_reset_connection(self._db):
+            self._exception()
+        self._init_session()
+
+    def cursor(self, cursor_class=None, encoders=None, decoders=None,
+        decimal_mode=None, **kwargs):
         if cursor_class is None:
             cursor_class = cursors.Cursor
+        # The cursor only copies the connection's encoders and decoders if
+        # they're asked for, see Cursor.encoders.
         if encoders is None:
-            encoders = self.encoders[:]
+            encoders = self.encoders
         if decoders is None:
-            decoders = self.decoders[:]
-        return cursor_class(self, encoders=encoders, decoders=decoders)
+            decoders = self.decoders
+        if decimal_mode is not None:
+            decoders = [converters.decimal_mode_decoder(decimal_mode)] + list(decoders)
+        return cursor_class(self, encoders=encoders, decoders=decoders, **kwargs)
 
-    def string_literal(self, obj):
+    def load_data(self, table, source, columns=None):
+        # Bulk loads rows, an iterable of sequences or a file with data in
+        # LOAD DATA's default format, with LOAD DATA LOCAL INFILE. The data is
+        # read from source as the server asks for it.
         self._check_closed()
+        if not self._client_flag & CLIENT.LOCAL_FILES:
+            raise self.NotSupportedError(0, "load_data() needs a connection "
+                "made with local_infile=True")
+        if hasattr(source, "read"):
+            chunks = infile.file_chunks(source)
+        else:
+            chunks = infile.tsv_chunks(source)
+        query = "LOAD DATA LOCAL INFILE 'load_data' INTO TABLE %s " \
+            "CHARACTER SET utf8mb4" % quote_identifier(table)
+        if columns is not None:
+            query += " (%s)" % ", ".join([
+                quote_identifier(column) for column in columns
+            ])
+        with contextlib.closing(self.cursor()) as cursor:
+            with infile.serving(self._db, chunks) as infile_source:
+                try:
+                    cursor.execute(query)
+                except self.Error:
+                    if infile_source.exception is not None:
+                        raise infile_source.exception
+                    raise
+            return cursor.rowcount
+
+    def _get_max_statement_size(self):
+        if self.max_statement_size is not None:
+            return self.max_statement_size
+        if self._max_allowed_packet is None:
+            with contextlib.closing(self.cursor()) as cursor:
+                cursor.execute("SELECT @@max_allowed_packet")
+                (self._max_allowed_packet,), = cursor.fetchall()
+        # Leave some room for the packet header.
+        return self._max_allowed_packet - 1024
+
+    def _set_server_option(self, option):
+        res = libmysql.c.mysql_set_server_option(self._db, option)
+        if res:
+            self._exception()
+
+    @contextlib.contextmanager
+    def _multi_statements(self):
+        # Allows several ;-separated statements to be sent at once for the
+        # duration of the block, unless the connection always allows it.
+        if self._client_flag & CLIENT.MULTI_STATEMENTS:
+            yield
+            return
+        self._check_unbuffered()
+        self._set_server_option(libmysql.MYSQL_OPTION_MULTI_STATEMENTS_ON)
+        try:
+            yield
+        finally:
+            self._set_server_option(libmysql.MYSQL_OPTION_MULTI_STATEMENTS_OFF)
+
+    def _get_statement(self, query, convert=True):
+        key = (query, convert)
+        statement = self._statements.get(key)
+        if statement is None or statement.closed:
+            statement = statements.PreparedStatement(self, query, convert)
+            self._statements[key] = statement
+        elif statement.result is not None:
+            # Another cursor is still reading this statement's result, so use
+            # a new one which is closed as soon as it's done with.
+            statement = statements.PreparedStatement(self, query, convert)
+            statement.close_pending = True
+        return statement
+
+    def _get_escape_table(self):
+        # Whether strings can be escaped with ESCAPE_TABLE. This isn't cached
+        # between calls, the charset and sql_mode can be changed by any
+        # statement (SET, CALL, EXECUTE, /*!...*/ comments), and escaping for
+        # the wrong session allows quotes to be injected.
+        if self.character_set_name() not in TRANSLATE_SAFE_CHARSETS:
+            return None
+        # Checking how a quote gets escaped tells us whether the server is in
+        # NO_BACKSLASH_ESCAPES mode.
+        try:
+            quote = self._c_string_literal("'")
+        except self.ProgrammingError:
+            return None
+        if quote == "'\\''":
+            return ESCAPE_TABLE
+        return None
+
+    def _c_string_literal(self, obj):
         if isinstance(obj, str):
             obj = obj.encode('utf-8')
         elif not isinstance(obj, bytes):
             obj = str(obj).encode('utf-8')
-        buf = create_string_buffer(len(obj) * 2)
+        buf = create_string_buffer(len(obj) * 2 + 1)
         length = libmysql.c.mysql_real_escape_string(self._db, buf, obj, len(obj))
+        if length > len(obj) * 2:
+            # (unsigned long)-1, escaping isn't possible in this sql_mode.
+            raise self.ProgrammingError(0, "Can't escape strings in the "
+                "connection's sql_mode")
         return "'%s'" % string_at(buf, length).decode('utf-8', 'surrogateescape')
 
+    def string_literal(self, obj):
+        # A single value is escaped by libmysqlclient, checking how the
+        # session escapes strings would cost more than that.
+        self._check_closed()
+        return self._c_string_literal(obj)
+
+    def _string_escaper(self):
+        # A function escaping a list of strings the way the session escapes
+        # them now, which is only looked up once, so it mustn't be used once
+        # anything else has been sent.
+        table = self._get_escape_table()
+        if table is None:
+            c_string_literal = self._c_string_literal
+            return lambda objs: [c_string_literal(obj) for obj in objs]
+        return lambda objs: [
+            "'%s'" % to_text(obj).translate(table) for obj in objs
+        ]
+
+    def string_literals(self, objs):
+        # Escapes a whole batch of values, checking once per batch how the
+        # session currently escapes strings.
+        self._check_closed()
+        return self._string_escaper()(objs)
+
     def character_set_name(self):
         self._check_closed()
         return libmysql.c.mysql_character_set_name(self._db).decode('ascii')
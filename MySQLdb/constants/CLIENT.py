@@ -1,4 +1,7 @@
 # File is named this way because that's how it is in MySQLdb, and SQLAlchemy
 # looks for it.
 
-FOUND_ROWS = 2
\ No newline at end of file
+FOUND_ROWS = 2
+LOCAL_FILES = 128
+MULTI_STATEMENTS = 1 << 16
+MULTI_RESULTS = 1 << 17
@@ -1,6 +1,6 @@
-import math
+import functools
 from datetime import datetime, date, time, timedelta
-from decimal import Decimal
+from decimal import Context, Decimal
 
 from MySQLdb.constants import field_types
 
@@ -43,26 +43,54 @@ DEFAULT_ENCODERS = [
 ]
 
 
-def datetime_decoder(value):
-    date_part, time_part = value.split(b" ", 1)
-    return datetime.combine(
-        date_decoder(date_part),
-        time(*[int(part) for part in time_part.split(b":")])
+def _fraction(value):
+    # Up to six digits of fractional seconds, as microseconds.
+    return int(value[:6].ljust(6, b"0")) if value else 0
+
+def _slice_datetime(value):
+    return datetime(
+        int(value[:4]), int(value[5:7]), int(value[8:10]),
+        int(value[11:13]), int(value[14:16]), int(value[17:19]),
+        _fraction(value[20:]),
     )
 
+def datetime_decoder(value):
+    # MySQL always sends "YYYY-MM-DD HH:MM:SS" followed by the fractional
+    # seconds, if the column has any, which fromisoformat parses in C. Older
+    # Pythons only take 3 or 6 digits of them, the rest are sliced apart.
+    try:
+        return datetime.fromisoformat(value.decode("ascii"))
+    except ValueError:
+        return _slice_datetime(value)
+
 def date_decoder(value):
-    return date(*[int(part) for part in value.split(b"-")])
+    return date.fromisoformat(value.decode("ascii"))
 
-def time_decoder(value):
-    # MySQLdb returns a timedelta here, immitate this nonsense.
-    hours, minutes, seconds = value.split(b":")
-    td = timedelta(
-        hours = int(hours),
-        minutes = int(minutes),
-        seconds = int(seconds),
-        microseconds = int(math.modf(float(seconds))[0]*1000000),
+def _slice_timedelta(value):
+    i = value.index(b":")
+    return timedelta(0,
+        int(value[:i]) * 3600 + int(value[i + 1:i + 3]) * 60 + int(value[i + 4:i + 6]),
+        _fraction(value[i + 7:]),
     )
-    if hours[0] == '-':
+
+def time_decoder(value):
+    # MySQLdb returns a timedelta here, immitate this nonsense. The sign
+    # applies to the whole value, and the hours can go up to 838, but most
+    # values are times of day, which fromisoformat parses in C.
+    negative = value[:1] == b"-"
+    if negative:
+        value = value[1:]
+    if value[2:3] == b":" and value[:2] < b"24":
+        try:
+            t = time.fromisoformat(value.decode("ascii"))
+        except ValueError:
+            td = _slice_timedelta(value)
+        else:
+            td = timedelta(0, t.hour * 3600 + t.minute * 60 + t.second,
+                t.microsecond)
+    else:
+        td = _slice_timedelta(value)
+    if negative:
         td = -td
     return td
 
@@ -74,6 +102,15 @@ def timestamp_decoder(value):
 def decode(val):
     return val.decode('utf-8')
 
+def decimal_decoder(value):
+    return Decimal(value.decode("ascii"))
+
+def scaled_decoder(value):
+    # MySQL always sends as many digits after the point as the column's
+    # scale, so without the point the value is an int scaled by
+    # 10 ** Description.scale.
+    return int(value.replace(b".", b""))
+
 _simple_field_decoders = {
     field_types.TINY: int,
     field_types.SHORT: int,
@@ -84,8 +121,8 @@ _simple_field_decoders = {
     field_types.FLOAT: float,
     field_types.DOUBLE: float,
 
-    field_types.DECIMAL: Decimal,
-    field_types.NEWDECIMAL: Decimal,
+    field_types.DECIMAL: decimal_decoder,
+    field_types.NEWDECIMAL: decimal_decoder,
 
     field_types.BLOB: bytes,
     field_types.VAR_STRING: decode,
@@ -100,6 +137,64 @@ _simple_field_decoders = {
 def fallback_decoder(connection, field):
     return _simple_field_decoders.get(field[1])
 
+def interning_decoder(maxsize=4096, type_codes=(field_types.DATE,
+    field_types.DATETIME, field_types.TIMESTAMP)):
+    # Returns a decoder to put in front of the others for columns with few
+    # distinct values: the last maxsize values of each type are cached, so
+    # repeated ones are decoded once and share the same object.
+    decoders = dict(
+        (type_code, functools.lru_cache(maxsize)(_simple_field_decoders[type_code]))
+        for type_code in type_codes
+    )
+    def decoder(connection, field):
+        return decoders.get(field[1])
+    return decoder
+
+DECIMAL_TYPES = frozenset([field_types.DECIMAL, field_types.NEWDECIMAL])
+
+def _decimal_decoder(decoder):
+    def decimal_decoder(connection, field):
+        if field[1] in DECIMAL_TYPES:
+            return decoder
+    return decimal_decoder
+
+DECIMAL_MODES = {
+    "decimal": _decimal_decoder(decimal_decoder),
+    "float": _decimal_decoder(float),
+    "scaled": _decimal_decoder(scaled_decoder),
+}
+
+# The decoders made for each decimal.Context's settings, so cursors using
+# equal contexts share the plans and row builders cached for them.
+_context_decoders = {}
+
+def _context_key(context):
+    return (context.prec, context.rounding, context.Emin, context.Emax,
+        context.clamp, frozenset([
+            signal for signal, enabled in context.traps.items() if enabled
+        ]))
+
+def decimal_mode_decoder(mode):
+    # Returns a decoder to put in front of the others, decoding DECIMAL
+    # columns as Decimals, floats or scaled ints, or as Decimals rounded to
+    # the precision of a decimal.Context.
+    if isinstance(mode, Context):
+        key = _context_key(mode)
+        try:
+            return _context_decoders[key]
+        except KeyError:
+            pass
+        # A copy, so changing the context afterwards doesn't change what the
+        # cached decoder does.
+        create_decimal = mode.copy().create_decimal
+        decoder = _context_decoders[key] = _decimal_decoder(
+            lambda value: create_decimal(value.decode("ascii")))
+        return decoder
+    try:
+        return DECIMAL_MODES[mode]
+    except KeyError:
+        raise ValueError("Unknown decimal_mode %r" % (mode,))
+
 DEFAULT_DECODERS = [
     fallback_decoder,
 ]
@@ -1,11 +1,21 @@
 import collections
 import ctypes
+import functools
 import itertools
+import queue
 import re
+import threading
 import warnings
 import weakref
+try:
+    from collections.abc import Mapping, Sequence
+except ImportError:
+    from collections import Mapping, Sequence
 
-from MySQLdb import libmysql
+from MySQLdb import columns, converters, export, lazy, libmysql
+from MySQLdb.cache import EncoderCache
+from MySQLdb.constants import CLIENT
+from MySQLdb.exceptions import InternalError
 
 
 INSERT_VALUES = re.compile(
@@ -16,21 +26,84 @@ INSERT_VALUES = re.compile(
 )
 
 
+@functools.lru_cache(maxsize=256)
+def match_insert_values(query):
+    matched = INSERT_VALUES.match(query)
+    if matched is not None:
+        return matched.group("start", "values", "end")
+
 
 class Cursor(object):
-    def __init__(self, connection, encoders, decoders):
+    # Whether results are read with mysql_use_result (rows are streamed off
+    # the wire) rather than mysql_store_result (buffered on the client).
+    _use_result = False
+    # Whether the rows stay in a MYSQL_RES until the result is closed, which
+    # blob_views relies on.
+    _supports_blob_views = True
+
+    def __init__(self, connection, encoders, decoders, forward_only=False,
+        blob_views=False):
         self.connection = weakref.proxy(connection)
         self.arraysize = 1
-        self.encoders = encoders
-        self.decoders = decoders
+        # The connection's lists are shared until the encoders or decoders
+        # properties hand them out.
+        self._encoders = encoders
+        self._decoders = decoders
+        self._shared_encoders = encoders is connection.encoders
+        self._shared_decoders = decoders is connection.decoders
+        self._encoder_cache = None
+        # Don't keep rows around once they've been fetched.
+        self.forward_only = forward_only
+        # Return binary columns as read-only memoryviews of the client
+        # library's buffer rather than copying them into bytes.
+        self.blob_views = blob_views
 
         self._result = None
         self._executed = None
         self.rowcount = -1
+        # Whether the last query may have more result sets after _result,
+        # and whether it turned on multiple statements to send them.
+        self._more_results = False
+        self._multi_statements = False
+        # Whether the last query was a callproc().
+        self._procedure = False
+        # The queue, stop event and thread of the last prefetch(), which has
+        # to be stopped before the connection is used for anything else.
+        self._prefetching = None
+
+        if blob_views and (self._use_result or not self._supports_blob_views):
+            raise connection.NotSupportedError(0, "blob_views can't be used "
+                "with %s" % self.__class__.__name__)
 
     def __del__(self):
         self.close()
 
+    @property
+    def encoders(self):
+        # The list can be changed in place, so the cursor makes a copy of the
+        # connection's the first time it's asked for.
+        if self._shared_encoders:
+            self._encoders = list(self._encoders)
+            self._shared_encoders = False
+        return self._encoders
+
+    @encoders.setter
+    def encoders(self, encoders):
+        self._encoders = encoders
+        self._shared_encoders = False
+
+    @property
+    def decoders(self):
+        if self._shared_decoders:
+            self._decoders = list(self._decoders)
+            self._shared_decoders = False
+        return self._decoders
+
+    @decoders.setter
+    def decoders(self, decoders):
+        self._decoders = decoders
+        self._shared_decoders = False
+
     def _check_closed(self):
         if not self.connection or not self.connection._db:
             raise self.connection.InterfaceError(0, "")
@@ -39,49 +112,232 @@ class Cursor(object):
         if not self._executed:
             raise self.connection.ProgrammingError("execute() first")
 
+    def _stop_prefetch(self):
+        if self._prefetching is not None:
+            _stop_prefetch(*self._prefetching)
+            self._prefetching = None
+
     def _clear(self):
+        self._stop_prefetch()
         if self._result is not None:
             self._result.close()
             self._result = None
+        # Any result sets left over have to be read before the connection can
+        # be used again.
+        while self._next_result():
+            pass
+        self._procedure = False
         self.rowcount = -1
 
-    def _query(self, query):
+    def _next_result(self):
+        # Moves on to the next result set of the last query, returns False
+        # once there aren't any more.
+        if not self._more_results:
+            return False
+        if self._result is not None:
+            self._result.close()
+            self._result = None
+        db = self.connection._db
+        if not ord(libmysql.c.mysql_more_results(db)):
+            self._end_results()
+            return False
+        r = libmysql.c.mysql_next_result(db)
+        if r > 0:
+            self._results_exception()
+        self._result = self._new_result()
+        self._check_more_results()
+        if self._procedure and not self._more_results and not self._result._result:
+            # The status every CALL ends with isn't one of the procedure's
+            # result sets.
+            return False
+        return True
+
+    def _new_result(self):
+        return Result(self, self._use_result, self.forward_only)
+
+    def _check_more_results(self):
+        # Rows of an unbuffered result have to be read before it's known if
+        # more results follow.
+        db = self.connection._db
+        if self._result.unbuffered or ord(libmysql.c.mysql_more_results(db)):
+            self._more_results = True
+            self.connection._set_pending_results(self)
+        else:
+            self._end_results()
+
+    def _results_exception(self):
+        # The error has to be read before _end_results() makes another call.
+        db = self.connection._db
+        err = libmysql.c.mysql_errno(db)
+        message = libmysql.c.mysql_error(db)
+        self._end_results()
+        self.connection._raise_error(err, message)
+
+    def _end_results(self):
+        self._more_results = False
+        self.connection._clear_pending_results(self)
+        if self._multi_statements:
+            self._multi_statements = False
+            self.connection._set_server_option(
+                libmysql.MYSQL_OPTION_MULTI_STATEMENTS_OFF)
+
+    def _format_query(self, query, args):
+        if args is not None:
+            query %= self._escape_data(args)
+        if isinstance(query, str):
+            query = query.encode('utf-8', 'surrogateescape')
+        return query
+
+    def _start_query(self, query):
         self._executed = query
         self.connection._check_closed()
-        r = libmysql.c.mysql_real_query(self.connection._db, ctypes.c_char_p(query), len(query))
+        self.connection._check_unbuffered()
+
+    def _send_query(self, query):
+        self._start_query(query)
+        return libmysql.c.mysql_real_query(self.connection._db, ctypes.c_char_p(query), len(query))
+
+    def _query(self, query):
+        r = self._send_query(query)
         if r:
+            self._results_exception()
+        try:
+            self._result = self._new_result()
+        except self.connection.Error:
+            self._end_results()
+            raise
+        self._check_more_results()
+
+    def _batch_exception(self, index):
+        try:
             self.connection._exception()
-        self._result = Result(self)
+        except self.connection.Error as e:
+            # Which of the statements in the batch failed.
+            e.batch_index = index
+            raise
+
+    def _query_batch(self, statements, first_index):
+        # Sends several statements in one round trip and reads all of their
+        # results, returning the total number of affected rows.
+        self._clear()
+        r = self._send_query(b";\n".join(statements))
+        if r:
+            self._batch_exception(first_index)
+        db = self.connection._db
+        rowcount = 0
+        index = first_index
+        while True:
+            result = libmysql.c.mysql_store_result(db)
+            if result:
+                libmysql.c.mysql_free_result(result)
+            elif libmysql.c.mysql_errno(db):
+                self._batch_exception(index)
+            else:
+                rowcount += libmysql.c.mysql_affected_rows(db)
+            r = libmysql.c.mysql_next_result(db)
+            if r < 0:
+                break
+            index += 1
+            if r > 0:
+                self._batch_exception(index)
+        return rowcount
+
+    def _execute_batched(self, query, args, batch_size):
+        cache = self._get_encoder_cache()
+        budget = self.connection._get_max_statement_size()
+        rowcount = 0
+        statements = []
+        size = 0
+        first_index = 0
+        with self.connection._multi_statements():
+            # How strings are escaped is looked up again after each batch, as
+            # the statements may have changed it, and the statement that
+            # didn't fit is escaped again.
+            escape_strings = self.connection._string_escaper()
+            for i, arg in enumerate(args):
+                statement = (query % self._escape_data(arg, cache,
+                    escape_strings)).encode('utf-8', 'surrogateescape')
+                if statements and (len(statements) >= batch_size or
+                    size + len(statement) > budget):
+                    rowcount += self._query_batch(statements, first_index)
+                    escape_strings = self.connection._string_escaper()
+                    statement = (query % self._escape_data(arg, cache,
+                        escape_strings)).encode('utf-8', 'surrogateescape')
+                    statements = []
+                    size = 0
+                    first_index = i
+                statements.append(statement)
+                size += len(statement) + 2
+            if statements:
+                rowcount += self._query_batch(statements, first_index)
+        return rowcount
 
-    def _get_encoder(self, val):
-        for encoder in self.encoders:
+    def _get_encoder_cache(self):
+        # Encoders are resolved by the type of the value, the results are
+        # shared between all the cursors using the connection's encoders. A
+        # cursor with encoders of its own has a cache of its own.
+        if self._shared_encoders:
+            return self.connection._encoder_cache.get(self._encoders)
+        if self._encoder_cache is None:
+            self._encoder_cache = EncoderCache()
+        return self._encoder_cache.get(self._encoders)
+
+    def _get_encoder(self, val, cache=None):
+        if cache is None:
+            cache = self._get_encoder_cache()
+        try:
+            return cache[type(val)]
+        except KeyError:
+            pass
+        for encoder in self._encoders:
             res = encoder(val)
             if res:
+                cache[type(val)] = res
                 return res
 
     def _get_decoder(self, val):
-        for decoder in self.decoders:
+        for decoder in self._decoders:
             res = decoder(self.connection, val)
             if res:
                 return res
 
-    def _escape_data(self, args):
+    def _escape_data(self, args, cache=None, escape_strings=None):
         self._check_closed()
+        if cache is None:
+            cache = self._get_encoder_cache()
+        if escape_strings is None:
+            escape_strings = self.connection.string_literals
+        get_encoder = self._get_encoder
+        quote_string = converters.unicode_to_quoted_sql
         # MySQLdb's argument escaping rules are completely at odds with the
         # DB-API spec, unfortunately the project this codebase was originally
         # written for uses those features, so we emulate them.
-        if isinstance(args, collections.Sequence) and not isinstance(args, str):
+        if isinstance(args, Sequence) and not isinstance(args, str):
+            encoders = [get_encoder(arg, cache) for arg in args]
+            # Strings are escaped together, so how to escape them is only
+            # looked up once per row.
+            strings = [
+                arg for arg, encoder in zip(args, encoders)
+                if encoder is quote_string
+            ]
+            if not strings:
+                return tuple([
+                    encoder(self.connection, arg)
+                    for arg, encoder in zip(args, encoders)
+                ])
+            literals = iter(escape_strings(strings))
             return tuple([
-                self._get_encoder(arg)(self.connection, arg)
-                for arg in args
+                next(literals) if encoder is quote_string
+                else encoder(self.connection, arg)
+                for arg, encoder in zip(args, encoders)
             ])
-        elif isinstance(args, collections.Mapping):
+        elif isinstance(args, Mapping):
             return dict([
-                (key, self._get_encoder(value)(self.connection, value))
+                (key, get_encoder(value, cache)(self.connection, value))
                 for key, value in args.items()
             ])
         else:
-            return self._get_encoder(args)(self.connection, args)
+            return get_encoder(args, cache)(self.connection, args)
 
     @property
     def description(self):
@@ -93,6 +349,13 @@ class Cursor(object):
         return iter(self.fetchone, None)
 
     def close(self):
+        self._stop_prefetch()
+        try:
+            if (self._more_results and self.connection is not None and
+                not self.connection.closed):
+                self._clear()
+        except ReferenceError:
+            pass
         self.connection = None
         if self._result is not None:
             self._result.close()
@@ -101,12 +364,7 @@ class Cursor(object):
     def execute(self, query, args=None):
         self._check_closed()
         self._clear()
-
-        if args is not None:
-            query %= self._escape_data(args)
-        if isinstance(query, str):
-            query = query.encode('utf-8', 'surrogateescape')
-        self._query(query)
+        self._query(self._format_query(query, args))
 
     def executemany(self, query, args):
         self._check_closed()
@@ -114,32 +372,101 @@ class Cursor(object):
         if not args:
             return
 
-        matched = INSERT_VALUES.match(query)
-        if not matched:
+        matched = match_insert_values(query)
+        if not matched and self.connection.multi_statement_batch:
+            self.rowcount = self._execute_batched(query, args,
+                self.connection.multi_statement_batch)
+        elif not matched:
             rowcount = 0
             for arg in args:
                 self.execute(query, arg)
                 rowcount += self.rowcount
             self.rowcount = rowcount
         else:
-            start, values, end = matched.group("start", "values", "end")
-            sql_params = [
-                values % self._escape_data(arg)
-                for arg in args
-            ]
-            multirow_query = start + ",\n".join(sql_params) + end
-            self._query(multirow_query.encode('utf-8', 'surrogateescape'))
+            start, values, end = matched
+            start = start.encode('utf-8', 'surrogateescape')
+            end = end.encode('utf-8', 'surrogateescape')
+            cache = self._get_encoder_cache()
+            # Rows are sent as soon as there are enough of them to fill a
+            # statement, so there's never more than one statement's worth of
+            # SQL in memory, and no statement exceeds max_allowed_packet.
+            budget = (self.connection._get_max_statement_size() - len(start) -
+                len(end))
+            rowcount = 0
+            chunk = []
+            size = 0
+            # How strings are escaped is only looked up once per chunk, the
+            # row that didn't fit is escaped again for the next one.
+            escape_strings = self.connection._string_escaper()
+            for arg in args:
+                sql_params = (values % self._escape_data(arg, cache,
+                    escape_strings)).encode('utf-8', 'surrogateescape')
+                if chunk and size + len(sql_params) > budget:
+                    rowcount += self._insert_chunk(start, chunk, end)
+                    escape_strings = self.connection._string_escaper()
+                    sql_params = (values % self._escape_data(arg, cache,
+                        escape_strings)).encode('utf-8', 'surrogateescape')
+                    chunk = []
+                    size = 0
+                chunk.append(sql_params)
+                size += len(sql_params) + 2
+            if chunk:
+                rowcount += self._insert_chunk(start, chunk, end)
+            self.rowcount = rowcount
         return self.rowcount
 
-    def callproc(self, procname, args=()):
+    def _insert_chunk(self, start, chunk, end):
+        self._clear()
+        self._query(start + b",\n".join(chunk) + end)
+        return self.rowcount
+
+    def execute_multi(self, statements):
+        # Sends all the statements, each a query or a (query, args) pair, in
+        # one round trip. The first one's result is current, nextset() moves
+        # on to the following ones.
         self._check_closed()
         self._clear()
+        queries = []
+        for statement in statements:
+            if isinstance(statement, (str, bytes)):
+                query, args = statement, None
+            else:
+                query, args = statement
+            queries.append(self._format_query(query, args))
+        if not queries:
+            return
+        connection = self.connection
+        if not connection._client_flag & CLIENT.MULTI_STATEMENTS:
+            connection._check_unbuffered()
+            connection._set_server_option(
+                libmysql.MYSQL_OPTION_MULTI_STATEMENTS_ON)
+            self._multi_statements = True
+        self._query(b";\n".join(queries))
 
-        query = "SELECT %s(%s)" % (procname, ",".join(["%s"] * len(args)))
-        query %= self._escape_data(args)
-        if isinstance(query, str):
-            query = query.encode('utf-8', 'surrogateescape')
-        self._query(query)
+    def nextset(self):
+        self._check_executed()
+        self._stop_prefetch()
+        if self._next_result():
+            return True
+        return None
+
+    def callproc(self, procname, args=()):
+        # Like MySQLdb, the arguments are passed in as @_procname_n session
+        # variables, so OUT and INOUT parameters can be read back from them
+        # once all of the procedure's result sets have been read.
+        names = ["@_%s_%d" % (procname, i) for i in range(len(args))]
+        call = "CALL %s(%s)" % (procname, ",".join(names))
+        if not args:
+            self.execute(call)
+            self._procedure = True
+            return args
+        self.execute_multi([
+            ("SET %s" % ",".join(["%s=%%s" % name for name in names]), args),
+            call,
+        ])
+        self._procedure = True
+        # Skip over the SET's result.
+        self._next_result()
         return args
 
 
@@ -163,12 +490,176 @@ class Cursor(object):
             return None
         return self._result.fetchone()
 
+    @property
+    def rownumber(self):
+        # The index of the next row in the result set, None if there isn't one.
+        if self._result is None or self._result.rows is None:
+            return None
+        return self._result.row_index
+
+    def scroll(self, value, mode="relative"):
+        self._check_executed()
+        if self._result is None:
+            raise self.connection.ProgrammingError("Can't scroll a query with "
+                "no result rows")
+        self._result.scroll(value, mode)
+
+    def _has_result_set(self):
+        # Unlike fetchall(), the columnar fetches don't raise for a query
+        # without result rows.
+        self._check_executed()
+        return self._result is not None and self._result.rows is not None
+
+    def fetch_columns(self):
+        # All the remaining rows as a columns.ColumnBatch, None if there is no
+        # result set.
+        if not self._has_result_set():
+            return None
+        return self._result.fetch_columns()
+
+    def fetch_column_batches(self, size=65536):
+        # The remaining rows as a columns.ColumnBatch of up to size rows at a
+        # time, none if there is no result set.
+        if not self._has_result_set():
+            return
+        while True:
+            batch = self._result.fetch_columns(size)
+            if not batch.num_rows:
+                break
+            yield batch
+
+    def fetch_numpy(self, batch_size=export.BATCH_SIZE):
+        # The remaining rows as a numpy masked structured array, built
+        # batch_size rows at a time straight from the rows' text, None if
+        # there is no result set.
+        if not self._has_result_set():
+            return None
+        return export.to_numpy(self._result, batch_size)
+
+    def fetch_arrow(self, batch_size=export.BATCH_SIZE):
+        # The remaining rows as a pyarrow.Table, None if there is no result
+        # set.
+        if not self._has_result_set():
+            return None
+        return export.to_arrow(self._result, batch_size)
+
+    def fetch_arrow_batches(self, batch_size=export.BATCH_SIZE):
+        # The remaining rows as pyarrow.RecordBatches of up to batch_size
+        # rows, none if there is no result set.
+        if not self._has_result_set():
+            return iter(())
+        return export.to_arrow_batches(self._result, batch_size)
+
+    def prefetch(self, size=1000, depth=2):
+        # Iterates over the remaining rows, while up to depth batches of size
+        # rows are fetched and decoded ahead on a background thread. The
+        # connection mustn't be used for anything else until the iterator is
+        # exhausted or closed, or the cursor executes another query or is
+        # closed, which stops the thread first.
+        self._check_executed()
+        self._stop_prefetch()
+        rows = PrefetchIterator(self.fetchmany, size, depth)
+        self._prefetching = (rows._queue, rows._stop, rows._thread)
+        return rows
+
     def setinputsizes(self, *args):
         pass
 
     def setoutputsize(self, *args):
         pass
 
+
+class _Failure(object):
+    def __init__(self, exception):
+        self.exception = exception
+
+def _put(queue_, stop, item):
+    # Gives up once the iterator has been closed, so the thread doesn't wait
+    # forever on a queue nobody reads.
+    while not stop.is_set():
+        try:
+            queue_.put(item, timeout=0.1)
+        except queue.Full:
+            continue
+        return True
+    return False
+
+def _prefetch(queue_, stop, fetchmany, size):
+    # The thread only gets the queue and the stop event rather than the
+    # iterator itself, so an iterator that's dropped without being closed can
+    # still be collected, which stops the thread.
+    try:
+        while not stop.is_set():
+            rows = fetchmany(size)
+            if not rows:
+                break
+            if not _put(queue_, stop, rows):
+                return
+    except BaseException as e:
+        _put(queue_, stop, _Failure(e))
+        return
+    _put(queue_, stop, PrefetchIterator._DONE)
+
+def _stop_prefetch(queue_, stop, thread):
+    # Waits for the thread to finish whatever fetchmany() it's in, rows it
+    # had fetched ahead are dropped.
+    stop.set()
+    if thread is threading.current_thread():
+        return
+    while thread.is_alive():
+        try:
+            while True:
+                queue_.get_nowait()
+        except queue.Empty:
+            pass
+        thread.join(0.1)
+
+class PrefetchIterator(object):
+    _DONE = object()
+
+    def __init__(self, fetchmany, size, depth):
+        self._queue = queue.Queue(depth)
+        self._stop = threading.Event()
+        self._rows = iter(())
+        self._finished = False
+        self._thread = threading.Thread(target=_prefetch,
+            args=(self._queue, self._stop, fetchmany, size))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def __del__(self):
+        self._stop.set()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        for row in self._rows:
+            return row
+        if self._finished:
+            raise StopIteration
+        item = self._queue.get()
+        if item is self._DONE or isinstance(item, _Failure):
+            self._finished = True
+            self._thread.join()
+            if item is self._DONE:
+                raise StopIteration
+            raise item.exception
+        self._rows = iter(item)
+        return next(self._rows)
+
+    def close(self):
+        # Stops fetching ahead, any rows that were fetched ahead are dropped.
+        self._finished = True
+        _stop_prefetch(self._queue, self._stop, self._thread)
+        self._rows = iter(())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
 class DictCursor(Cursor):
     def _make_row(self, row):
         return dict(
@@ -190,6 +681,90 @@ class DictCursor(Cursor):
             row = self._make_row(row)
         return row
 
+class SSCursor(Cursor):
+    # Server side cursor, rows are not buffered on the client, so the
+    # connection can't be used for anything else until all the rows have been
+    # fetched or the cursor is closed. Fetched rows are never retained.
+    _use_result = True
+
+class SSDictCursor(SSCursor, DictCursor):
+    pass
+
+class LazyRowCursor(Cursor):
+    # Rows are lazy.Row objects, which only decode a column the first time
+    # it's read, for queries where most of the columns usually aren't.
+    def _new_result(self):
+        return LazyRowResult(self, self._use_result, self.forward_only)
+
+class LazyCursor(Cursor):
+    # Rows are left in the buffered MYSQL_RES and decoded as they're fetched,
+    # so only the rows the caller holds on to exist in Python. They can also
+    # be read by index, cursor[i], without moving the cursor.
+    def _new_result(self):
+        return LazyResult(self, self._use_result, self.forward_only)
+
+    def __getitem__(self, index):
+        self._check_executed()
+        if self._result is None:
+            raise IndexError(index)
+        return self._result.get(index)
+
+def _missing_decoder(type_code, val):
+    raise InternalError("No decoder for type %s, value: %s" % (type_code, val))
+
+_row_builders = {}
+_ROW_BUILDERS_MAX_SIZE = 1024
+
+def get_row_builder(decoders, type_codes):
+    # Returns a function taking the column addresses and lengths of a row and
+    # returning the decoded row. It is generated once for each distinct set of
+    # decoders, with the per-column loop unrolled and each decoder bound to a
+    # local, so the columns which are returned as bytes skip the decoder call
+    # entirely.
+    key = tuple([
+        decoder if decoder is not None else (None, type_code)
+        for decoder, type_code in zip(decoders, type_codes)
+    ])
+    try:
+        return _row_builders[key]
+    except KeyError:
+        pass
+
+    namespace = {
+        "string_at": ctypes.string_at,
+        "missing_decoder": _missing_decoder,
+    }
+    columns = []
+    for i, decoder in enumerate(key):
+        value = "string_at(v%d, l%d)" % (i, i)
+        if decoder is memoryview:
+            # Stands in for bytes when the result hands out BlobViews.
+            value = "view(v%d, l%d)" % (i, i)
+        elif isinstance(decoder, tuple):
+            value = "missing_decoder(%d, %s)" % (decoder[1], value)
+        elif decoder is not bytes:
+            namespace["d%d" % i] = decoder
+            value = "d%d(%s)" % (i, value)
+        columns.append("None if v%d is None else %s" % (i, value))
+    if memoryview in key:
+        source = "def build_row(values, lengths, view):\n"
+    else:
+        source = "def build_row(values, lengths):\n"
+    if columns:
+        source += "    %s, = values\n" % ", ".join(
+            "v%d" % i for i in range(len(columns)))
+        source += "    %s, = lengths\n" % ", ".join(
+            "l%d" % i for i in range(len(columns)))
+    source += "    return (%s)\n" % "".join(
+        "\n        %s," % column for column in columns)
+    exec(source, namespace)
+    build_row = namespace["build_row"]
+
+    if len(_row_builders) >= _ROW_BUILDERS_MAX_SIZE:
+        _row_builders.clear()
+    _row_builders[key] = build_row
+    return build_row
+
 _Description = collections.namedtuple("Description", [
     "name", "type_code", "display_size", "internal_size", "precision", "scale", "null_ok"
 ])
@@ -200,52 +775,264 @@ class Description(_Description):
         self.charsetnr = charsetnr
         return self
 
+class BlobViews(object):
+    # Hands out read-only memoryviews of values in a stored MYSQL_RES. When
+    # the result is closed every view still around is released, so using it
+    # raises ValueError, but freeing the MYSQL_RES is left until the last
+    # buffer a view was made from is gone, as views sliced off them aren't
+    # released. Nor are views something else (say numpy.frombuffer()) still
+    # holds a buffer of, they stay usable until they're dropped.
+    def __init__(self):
+        self._views = []
+        self._result = None
+
+    def view(self, address, length):
+        # The buffer's size is rounded up to a power of two, as ctypes keeps
+        # every array type it creates.
+        size = 1 << max(length - 1, 0).bit_length()
+        buf = (ctypes.c_char * size).from_address(address)
+        buf._owner = self
+        view = memoryview(buf).cast("B")[:length].toreadonly()
+        self._views.append(weakref.ref(view))
+        return view
+
+    def close(self, result):
+        self._result = result
+        for ref in self._views:
+            view = ref()
+            if view is not None:
+                try:
+                    view.release()
+                except BufferError:
+                    pass
+        del self._views[:]
+
+    def __del__(self):
+        if self._result:
+            libmysql.c.mysql_free_result(self._result)
+            self._result = None
+
 class Result(object):
-    def __init__(self, cursor):
+    _views = None
+
+    def __init__(self, cursor, unbuffered=False, forward_only=False):
         self.cursor = cursor
-        self._result = libmysql.c.mysql_store_result(self.cursor.connection._db)
-        self.description = None
+        self.connection = cursor.connection
+        self.unbuffered = unbuffered
+        # Unbuffered rows can't be revisited anyway, so there's no reason to
+        # hold on to them.
+        self.forward_only = forward_only or unbuffered
+        self._result = self._open()
+        if cursor.blob_views and self._result:
+            self._views = BlobViews()
+        self._description = None
         self.rows = None
         self.row_index = 0
+        if not self._result and self.connection._has_error():
+            self.connection._exception()
         # TOOD: this is a hack, find a better way.
         if self.cursor._executed.upper().startswith(b"CREATE"):
             cursor.rowcount = -1
+        elif self._result and unbuffered:
+            # The number of rows isn't known until they've all been read.
+            cursor.rowcount = -1
         else:
-            cursor.rowcount = libmysql.c.mysql_affected_rows(cursor.connection._db)
+            cursor.rowcount = libmysql.c.mysql_affected_rows(self.connection._db)
         if not self._result:
-            cursor.lastrowid = libmysql.c.mysql_insert_id(cursor.connection._db)
+            cursor.lastrowid = libmysql.c.mysql_insert_id(self.connection._db)
             return
+        if unbuffered:
+            self.connection._set_unbuffered_result(self)
 
-
-        self.description = self._describe()
-        self.row_decoders = [
-            self.cursor._get_decoder(field)
-            for field in self.description
-        ]
+        self._db = self.connection._db
+        self._load_plan()
+        self._column_filler = None
+        self._eof = False
 
         self.rows = []
 
-    def _get_row(self):
-        row = libmysql.c.mysql_fetch_row(self._result)
-        if not row:
-            if self.cursor.connection._has_error():
-                self.cursor.connection.exception()
-            return
-        n = libmysql.c.mysql_num_fields(self._result)
-        lengths = libmysql.c.mysql_fetch_lengths(self._result)
-        r = [None] * n
-        for i, decoder in enumerate(self.row_decoders):
-            if not row[i]:
-                r[i] = None
+    def _open(self):
+        if self.unbuffered:
+            return libmysql.c.mysql_use_result(self.connection._db)
+        return libmysql.c.mysql_store_result(self.connection._db)
+
+    def _load_plan(self):
+        # Everything the fetch loop needs is resolved once per result, rather
+        # than once per row, and is shared by all results with the same shape.
+        self._field_count = libmysql.c.mysql_num_fields(self._result)
+        key = (self.__class__, self._views is not None,
+            tuple(self.cursor._decoders), self._signature())
+        plan = self.connection._result_plans.get(key)
+        if plan is None:
+            self._description = self._describe()
+            row_decoders = [
+                self.cursor._get_decoder(field)
+                for field in self._description
+            ]
+            plan = (row_decoders, self._make_row_builder(row_decoders))
+            self.connection._result_plans[key] = plan
+        self.row_decoders, self._build_row = plan
+
+    def _make_row_builder(self, row_decoders):
+        if self._views is not None:
+            row_decoders = [
+                memoryview if decoder is bytes else decoder
+                for decoder in row_decoders
+            ]
+        return get_row_builder(
+            row_decoders, [field[1] for field in self._description]
+        )
+
+    def _get_rows(self, size=None):
+        # Fetches and decodes up to size rows (all of them if size is None) in
+        # a single loop.
+        rows = []
+        if not self._result or self._eof:
+            return rows
+        result = self._result
+        n = self._field_count
+        build_row = self._build_row
+        if self._views is not None:
+            build_row = functools.partial(build_row, view=self._views.view)
+        fetch_row = libmysql.c.mysql_fetch_row
+        fetch_lengths = libmysql.c.mysql_fetch_lengths
+        append = rows.append
+        if size is None:
+            counter = itertools.repeat(None)
+        else:
+            counter = itertools.repeat(None, size)
+        for _ in counter:
+            row = fetch_row(result)
+            if not row:
+                self._eof = True
+                self._release()
+                if libmysql.c.mysql_errno(self._db):
+                    self.connection._exception()
+                break
+            # Slicing the pointers turns them into plain ints in one call.
+            append(build_row(row[:n], fetch_lengths(result)[:n]))
+        return rows
+
+    def fetch_columns(self, size=None):
+        self._check_rows("fetch_columns")
+        # Rows fetched this way aren't kept, so they can't be revisited
+        # either.
+        self.forward_only = True
+        description = self.description
+        fill_row = self._column_filler
+        if fill_row is None:
+            fields = libmysql.c.mysql_fetch_fields(self._result)
+            type_codes = [field[1] for field in description]
+            fill_row = self._column_filler = columns.get_column_filler([
+                columns.column_typecode(fields[i], decoder)
+                for i, decoder in enumerate(self.row_decoders)
+            ], self.row_decoders, type_codes)
+        cols = columns.new_columns(fill_row.typecodes)
+        appends = [col.append for col in cols]
+        nulls = [[] for col in cols]
+        # Rows that were already fetched, but not returned yet.
+        num_rows = columns.append_rows(self.rows[self.row_index:],
+            fill_row.typecodes, appends, nulls)
+        del self.rows[self.row_index:]
+        if size is not None:
+            size -= num_rows
+
+        if self._result and not self._eof and (size is None or size > 0):
+            result = self._result
+            n = self._field_count
+            fetch_row = libmysql.c.mysql_fetch_row
+            fetch_lengths = libmysql.c.mysql_fetch_lengths
+            if size is None:
+                counter = itertools.repeat(None)
             else:
-                val = ctypes.string_at(row[i], lengths[i])
-                if decoder is None:
-                    raise self.cursor.connection.InternalError("No decoder for"
-                        " type %s, value: %s" % (self.description[i][1], val)
-                    )
-                r[i] = decoder(val)
+                counter = itertools.repeat(None, size)
+            for _ in counter:
+                row = fetch_row(result)
+                if not row:
+                    self._eof = True
+                    self._release()
+                    if libmysql.c.mysql_errno(self._db):
+                        self.connection._exception()
+                    break
+                fill_row(row[:n], fetch_lengths(result)[:n], num_rows,
+                    appends, nulls)
+                num_rows += 1
+        self.row_index += num_rows
+        return columns.ColumnBatch(description, cols, [
+            columns.make_validity(num_rows, column_nulls)
+            for column_nulls in nulls
+        ], num_rows)
+
+    def _remaining_rows(self):
+        # How many rows are left to fetch, None for unbuffered results, where
+        # that isn't known until they've all been read.
+        if self.unbuffered:
+            return None
+        if not self._result:
+            return 0
+        return libmysql.c.mysql_num_rows(self._result) - max(len(self.rows),
+            self.row_index)
+
+    def fetch_raw_columns(self, size=None):
+        # Up to size of the remaining rows, as a list of the undecoded values
+        # (bytes or None) of each column. This is what export builds arrays
+        # from.
+        self._check_rows("fetch_raw_columns")
+        if self.row_index < len(self.rows):
+            raise self.cursor.connection.ProgrammingError("Can't fetch raw "
+                "columns while rows that were already decoded are pending")
+        self.forward_only = True
+        n = self._field_count
+        cols = [[] for i in range(n)]
+        if not self._result or self._eof:
+            return cols
+        appends = [col.append for col in cols]
+        result = self._result
+        string_at = ctypes.string_at
+        fetch_row = libmysql.c.mysql_fetch_row
+        fetch_lengths = libmysql.c.mysql_fetch_lengths
+        if size is None:
+            counter = itertools.repeat(None)
+        else:
+            counter = itertools.repeat(None, size)
+        num_rows = 0
+        for _ in counter:
+            row = fetch_row(result)
+            if not row:
+                self._eof = True
+                self._release()
+                if libmysql.c.mysql_errno(self._db):
+                    self.connection._exception()
+                break
+            for append, value, length in zip(appends, row[:n],
+                fetch_lengths(result)[:n]):
+                append(None if value is None else string_at(value, length))
+            num_rows += 1
+        self.row_index += num_rows
+        return cols
+
+    def _signature(self):
+        # Everything about the columns which can influence how they're
+        # decoded, this deliberately leaves out max_length as that depends on
+        # the data.
+        fields = libmysql.c.mysql_fetch_fields(self._result)
+        string_at = ctypes.string_at
+        signature = []
+        for i in range(self._field_count):
+            f = fields[i]
+            signature.append((
+                string_at(f.name, f.name_length), f.type, f.flags, f.charsetnr,
+                f.length, f.decimals,
+            ))
+        return tuple(signature)
 
-        return tuple(r)
+    @property
+    def description(self):
+        # When the plan for this result came out of the cache the description
+        # is only built if someone asks for it.
+        if self._description is None and self._result:
+            self._description = self._describe()
+        return self._description
 
     def _describe(self):
         n = libmysql.c.mysql_num_fields(self._result)
@@ -270,52 +1057,179 @@ class Result(object):
             raise self.cursor.connection.ProgrammingError("Can't %s from a "
                 "query with no result rows" % meth)
 
+    def _release(self):
+        # Once an unbuffered result has been exhausted the connection can be
+        # used for other queries again.
+        if self.unbuffered:
+            try:
+                self.connection._clear_unbuffered_result(self)
+            except ReferenceError:
+                pass
+
     def close(self):
         if self._result:
-            libmysql.c.mysql_free_result(self._result)
+            # For unbuffered results this also reads and discards any rows
+            # that haven't been fetched.
+            if self._views is not None:
+                self._views.close(self._result)
+            else:
+                libmysql.c.mysql_free_result(self._result)
+            self._release()
         self._result = None
 
     def flush(self):
-        if self._result:
-            while True:
-                row = self._get_row()
-                if row is None:
-                    break
-                self.rows.append(row)
+        self.rows.extend(self._get_rows())
+
+    def _scroll_target(self, value, mode):
+        if mode == "relative":
+            return self.row_index + value
+        elif mode == "absolute":
+            return value
+        raise self.cursor.connection.ProgrammingError("Unknown scroll mode %r"
+            % (mode,))
+
+    def scroll(self, value, mode="relative"):
+        self._check_rows("scroll")
+        target = self._scroll_target(value, mode)
+        if target < 0:
+            raise IndexError("Can't scroll to row %d" % target)
+        if self.forward_only:
+            if target < self.row_index:
+                raise self.cursor.connection.NotSupportedError(0, "Can't "
+                    "scroll backwards on a forward only cursor")
+            # The rows in between are read and thrown away.
+            while self.row_index < target:
+                skipped = self._get_rows(min(target - self.row_index, 1000))
+                if not skipped:
+                    raise IndexError("Can't scroll to row %d" % target)
+                self.row_index += len(skipped)
+            return
+        if target > len(self.rows):
+            self.rows.extend(self._get_rows(target - len(self.rows)))
+            if target > len(self.rows):
+                raise IndexError("Can't scroll to row %d" % target)
+        self.row_index = target
 
     def fetchall(self):
         self._check_rows("fetchall")
-        if self._result:
-            self.flush()
-        rows = self.rows[self.row_index:]
-        self.row_index = len(self.rows)
+        rows = self._get_rows()
+        if not self.forward_only:
+            self.rows.extend(rows)
+            rows = self.rows[self.row_index:]
+        self.row_index += len(rows)
         return rows
 
     def fetchmany(self, size):
         self._check_rows("fetchmany")
-        if self._result:
-            for i in range(size - (len(self.rows) - self.row_index)):
-                row = self._get_row()
-                if row is None:
-                    break
-                self.rows.append(row)
-        if self.row_index >= len(self.rows):
-            return []
-        row_end = self.row_index + size
-        if row_end >= len(self.rows):
-            row_end = len(self.rows)
-        rows = self.rows[self.row_index:row_end]
-        self.row_index = row_end
+        if self.forward_only:
+            rows = self._get_rows(size)
+        else:
+            missing = size - (len(self.rows) - self.row_index)
+            if missing > 0:
+                self.rows.extend(self._get_rows(missing))
+            rows = self.rows[self.row_index:self.row_index + size]
+        self.row_index += len(rows)
         return rows
 
     def fetchone(self):
         self._check_rows("fetchone")
-
-        if self.row_index >= len(self.rows):
-            row = self._get_row()
-            if row is None:
-                return
-            self.rows.append(row)
-        row = self.rows[self.row_index]
+        if self.forward_only or self.row_index >= len(self.rows):
+            rows = self._get_rows(1)
+            if not rows:
+                return None
+            if not self.forward_only:
+                self.rows.extend(rows)
+            row = rows[0]
+        else:
+            row = self.rows[self.row_index]
         self.row_index += 1
         return row
+
+
+class LazyResult(Result):
+    # Rows stay in the MYSQL_RES the client library stored them in, and are
+    # decoded each time they're fetched, rather than being kept in rows. The
+    # library's position is moved with mysql_data_seek whenever it's not at
+    # row_index.
+    def __init__(self, cursor, unbuffered=False, forward_only=False):
+        if unbuffered:
+            raise cursor.connection.NotSupportedError(0, "Lazy results have "
+                "to be buffered")
+        super(LazyResult, self).__init__(cursor, unbuffered, forward_only)
+        if self._result:
+            self.num_rows = libmysql.c.mysql_num_rows(self._result)
+        # The row mysql_fetch_row() returns next.
+        self._position = 0
+
+    def _seek(self, index):
+        if self._position != index:
+            libmysql.c.mysql_data_seek(self._result, index)
+            self._position = index
+        self._eof = False
+
+    def _fetch(self, size=None):
+        self._seek(self.row_index)
+        rows = self._get_rows(size)
+        self._position += len(rows)
+        self.row_index += len(rows)
+        return rows
+
+    def _remaining_rows(self):
+        if not self._result:
+            return 0
+        return self.num_rows - self.row_index
+
+    def get(self, index):
+        self._check_rows("get a row")
+        if index < 0:
+            index += self.num_rows
+        if not 0 <= index < self.num_rows:
+            raise IndexError("Row index out of range")
+        self._seek(index)
+        row, = self._get_rows(1)
+        self._position += 1
+        return row
+
+    def scroll(self, value, mode="relative"):
+        self._check_rows("scroll")
+        target = self._scroll_target(value, mode)
+        if not 0 <= target <= self.num_rows:
+            raise IndexError("Can't scroll to row %d" % target)
+        self.row_index = target
+
+    def fetch_columns(self, size=None):
+        self._seek(self.row_index)
+        batch = super(LazyResult, self).fetch_columns(size)
+        self._position = self.row_index
+        return batch
+
+    def fetch_raw_columns(self, size=None):
+        self._seek(self.row_index)
+        cols = super(LazyResult, self).fetch_raw_columns(size)
+        self._position = self.row_index
+        return cols
+
+    def flush(self):
+        pass
+
+    def fetchall(self):
+        self._check_rows("fetchall")
+        return self._fetch()
+
+    def fetchmany(self, size):
+        self._check_rows("fetchmany")
+        return self._fetch(size)
+
+    def fetchone(self):
+        self._check_rows("fetchone")
+        rows = self._fetch(1)
+        return rows[0] if rows else None
+
+
+class LazyRowResult(Result):
+    def _make_row_builder(self, row_decoders):
+        return lazy.get_row_builder(
+            [field[0].decode("utf-8") for field in self._description],
+            row_decoders, [field[1] for field in self._description],
+            self._views is not None
+        )
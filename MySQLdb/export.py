@@ -0,0 +1,197 @@
+import functools
+
+from MySQLdb import columns, converters, cursors, libmysql
+from MySQLdb.constants import field_types, FLAG
+from MySQLdb.exceptions import NotSupportedError
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+BATCH_SIZE = 65536
+
+DATE_TYPES = frozenset([field_types.DATE, field_types.NEWDATE])
+DATETIME_TYPES = frozenset([field_types.DATETIME, field_types.TIMESTAMP])
+BINARY_CHARSET = 63
+
+
+def _require(module, name):
+    if module is None:
+        raise NotSupportedError(0, "%s isn't installed" % name)
+
+def _fields(result):
+    fields = libmysql.c.mysql_fetch_fields(result._result)
+    return [
+        (description, fields[i])
+        for i, description in enumerate(result.description)
+    ]
+
+def _decoders(result):
+    return [
+        functools.partial(cursors._missing_decoder, description[1])
+        if decoder is None else decoder
+        for description, decoder in zip(result.description, result.row_decoders)
+    ]
+
+def _column_names(result):
+    return [field[0].decode("utf-8") for field in result.description]
+
+def _batches(result, batch_size):
+    # The raw values of each column, batch_size rows at a time. The zero
+    # dates MySQL allows have no equivalent in either library, so they're
+    # turned into NULLs.
+    dates = [
+        i for i, field in enumerate(result.description)
+        if field[1] in DATE_TYPES or field[1] in DATETIME_TYPES
+    ]
+    while True:
+        cols = result.fetch_raw_columns(batch_size)
+        if not cols or not cols[0]:
+            break
+        for i in dates:
+            cols[i] = [
+                None if value is None or value.startswith(b"0000-00-00") else value
+                for value in cols[i]
+            ]
+        yield cols
+        if len(cols[0]) < batch_size:
+            break
+
+
+def numpy_dtype(type_code, flags):
+    if type_code in columns.INTEGER_TYPES:
+        return "u8" if flags & FLAG.UNSIGNED else "i8"
+    elif (type_code in columns.FLOAT_TYPES or
+        type_code in converters.DECIMAL_TYPES):
+        return "f8"
+    elif type_code in DATE_TYPES:
+        return "datetime64[D]"
+    elif type_code in DATETIME_TYPES:
+        return "datetime64[us]"
+    return "O"
+
+def _numpy_column(raw, dtype, decoder):
+    if dtype == "O":
+        column = numpy.empty(len(raw), dtype)
+        if decoder is bytes:
+            column[:] = raw
+        else:
+            column[:] = [None if value is None else decoder(value) for value in raw]
+        return column
+    # The text of every value is parsed by numpy in one go, NULLs are masked
+    # so it doesn't matter what stands in for them.
+    if dtype.startswith("datetime64"):
+        text = numpy.array([b"NaT" if value is None else value for value in raw], "S")
+        return text.astype("U").astype(dtype)
+    return numpy.array([b"0" if value is None else value for value in raw],
+        "S").astype(dtype)
+
+def to_numpy(result, batch_size=BATCH_SIZE):
+    # The remaining rows as a numpy masked structured array, with a field for
+    # each column and NULLs masked. Buffered results are filled in place, as
+    # the number of rows is known up front.
+    _require(numpy, "numpy")
+    dtypes = [
+        numpy_dtype(description[1], field.flags)
+        for description, field in _fields(result)
+    ]
+    names = _column_names(result)
+    dtype = numpy.dtype(list(zip(names, dtypes)))
+    decoders = _decoders(result)
+
+    def fill(data, mask, offset, cols):
+        for name, column_dtype, decoder, raw in zip(names, dtypes, decoders, cols):
+            end = offset + len(raw)
+            data[name][offset:end] = _numpy_column(raw, column_dtype, decoder)
+            mask[name][offset:end] = [value is None for value in raw]
+        return end
+
+    total = result._remaining_rows()
+    if total is not None:
+        data = numpy.empty(total, dtype)
+        mask = numpy.zeros(total, numpy.ma.make_mask_descr(dtype))
+        offset = 0
+        for cols in _batches(result, batch_size):
+            offset = fill(data, mask, offset, cols)
+        return numpy.ma.array(data[:offset], mask=mask[:offset])
+
+    pieces = []
+    for cols in _batches(result, batch_size):
+        data = numpy.empty(len(cols[0]), dtype)
+        mask = numpy.zeros(len(cols[0]), numpy.ma.make_mask_descr(dtype))
+        fill(data, mask, 0, cols)
+        pieces.append(numpy.ma.array(data, mask=mask))
+    if not pieces:
+        return numpy.ma.array(numpy.empty(0, dtype))
+    return numpy.ma.concatenate(pieces)
+
+
+def arrow_type(description, field):
+    type_code = description[1]
+    if type_code in columns.INTEGER_TYPES:
+        return (pyarrow.uint64() if field.flags & FLAG.UNSIGNED
+            else pyarrow.int64())
+    elif type_code in columns.FLOAT_TYPES:
+        return pyarrow.float64()
+    elif type_code in converters.DECIMAL_TYPES:
+        scale = field.decimals
+        precision = max(columns.decimal_digits(field), 1)
+        if precision > 38:
+            return pyarrow.decimal256(precision, scale)
+        return pyarrow.decimal128(precision, scale)
+    elif type_code in DATE_TYPES:
+        return pyarrow.date32()
+    elif type_code in DATETIME_TYPES:
+        return pyarrow.timestamp("us")
+    elif type_code == field_types.TIME:
+        return pyarrow.duration("us")
+    elif type_code == field_types.BIT or description.charsetnr == BINARY_CHARSET:
+        return pyarrow.binary()
+    return pyarrow.string()
+
+def _arrow_column(raw, arrow_type, decoder):
+    if pyarrow.types.is_duration(arrow_type):
+        # Arrow can't parse times, so they go through the decoder.
+        return pyarrow.array(
+            [None if value is None else decoder(value) for value in raw],
+            arrow_type)
+    column = pyarrow.array(raw, pyarrow.binary())
+    if pyarrow.types.is_binary(arrow_type):
+        return column
+    column = column.cast(pyarrow.string())
+    if pyarrow.types.is_string(arrow_type):
+        return column
+    return column.cast(arrow_type)
+
+def arrow_schema(result):
+    return pyarrow.schema([
+        (name, arrow_type(description, field))
+        for name, (description, field) in zip(_column_names(result), _fields(result))
+    ])
+
+def to_arrow_batches(result, batch_size=BATCH_SIZE):
+    # Yields the remaining rows as Arrow record batches of up to batch_size
+    # rows. Every value is parsed by Arrow's own casts, other than TIME ones.
+    _require(pyarrow, "pyarrow")
+    return _arrow_batches(result, arrow_schema(result), batch_size)
+
+def _arrow_batches(result, schema, batch_size):
+    decoders = _decoders(result)
+    for cols in _batches(result, batch_size):
+        yield pyarrow.RecordBatch.from_arrays([
+            _arrow_column(raw, field.type, decoder)
+            for raw, field, decoder in zip(cols, schema, decoders)
+        ], schema=schema)
+
+def to_arrow(result, batch_size=BATCH_SIZE):
+    _require(pyarrow, "pyarrow")
+    schema = arrow_schema(result)
+    return pyarrow.Table.from_batches(
+        list(_arrow_batches(result, schema, batch_size)), schema=schema)
@@ -0,0 +1,177 @@
+import contextlib
+import ctypes
+import datetime
+import itertools
+
+from MySQLdb import libmysql
+
+
+# How much TSV is built up before it's handed over to the client library.
+CHUNK_SIZE = 64 * 1024
+
+CR_UNKNOWN_ERROR = 2000
+
+# The escaping LOAD DATA's default FIELDS ESCAPED BY '\\' understands.
+TSV_ESCAPE_TABLE = str.maketrans({
+    "\\": "\\\\",
+    "\t": "\\t",
+    "\n": "\\n",
+    "\0": "\\0",
+})
+
+
+def format_text(value):
+    return value.translate(TSV_ESCAPE_TABLE)
+
+def format_bytes(value):
+    # Non UTF-8 bytes make it through the encoding of the chunk unchanged.
+    return value.decode("utf-8", "surrogateescape").translate(TSV_ESCAPE_TABLE)
+
+def format_bool(value):
+    return "1" if value else "0"
+
+def format_timedelta(value):
+    sign = ""
+    if value < datetime.timedelta(0):
+        sign = "-"
+        value = -value
+    minutes, seconds = divmod(value.days * 86400 + value.seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    text = "%s%d:%02d:%02d" % (sign, hours, minutes, seconds)
+    if value.microseconds:
+        text += ".%06d" % value.microseconds
+    return text
+
+def format_other(value):
+    return str(value).translate(TSV_ESCAPE_TABLE)
+
+FORMATTERS = {
+    str: format_text,
+    bytes: format_bytes,
+    bool: format_bool,
+    int: str,
+    float: repr,
+    datetime.datetime: str,
+    datetime.date: str,
+    datetime.time: str,
+    datetime.timedelta: format_timedelta,
+}
+
+def get_formatter(value_type):
+    for cls in value_type.__mro__:
+        if cls in FORMATTERS:
+            return FORMATTERS[cls]
+    return format_other
+
+def tsv_chunks(rows, chunk_size=CHUNK_SIZE):
+    # Turns rows into LOAD DATA's default format one chunk at a time, so only
+    # about chunk_size bytes of the data are ever held in memory.
+    formatters = {}
+    lines = []
+    size = 0
+    for row in rows:
+        fields = []
+        for value in row:
+            if value is None:
+                fields.append("\\N")
+                continue
+            try:
+                formatter = formatters[type(value)]
+            except KeyError:
+                formatter = formatters[type(value)] = get_formatter(type(value))
+            fields.append(formatter(value))
+        line = "\t".join(fields)
+        lines.append(line)
+        size += len(line) + 1
+        if size >= chunk_size:
+            lines.append("")
+            yield "\n".join(lines).encode("utf-8", "surrogateescape")
+            lines = []
+            size = 0
+    if lines:
+        lines.append("")
+        yield "\n".join(lines).encode("utf-8", "surrogateescape")
+
+def file_chunks(f, chunk_size=CHUNK_SIZE):
+    # The file's contents have to be in LOAD DATA's default format already.
+    while True:
+        data = f.read(chunk_size)
+        if not data:
+            break
+        if isinstance(data, str):
+            data = data.encode("utf-8", "surrogateescape")
+        yield data
+
+
+class InfileSource(object):
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.pending = memoryview(b"")
+        self.exception = None
+
+    def read(self, buf, length):
+        while not self.pending:
+            data = next(self.chunks, None)
+            if data is None:
+                return 0
+            self.pending = memoryview(data)
+        data = self.pending[:length]
+        ctypes.memmove(buf, data.tobytes(), len(data))
+        self.pending = self.pending[len(data):]
+        return len(data)
+
+
+# The sources currently being sent, by the token passed to the client library
+# as the handler's userdata.
+_sources = {}
+_tokens = itertools.count(1)
+
+@libmysql.LOCAL_INFILE_INIT
+def _infile_init(ptr, filename, userdata):
+    ptr[0] = userdata
+    return 0 if userdata in _sources else 1
+
+@libmysql.LOCAL_INFILE_READ
+def _infile_read(ptr, buf, length):
+    source = _sources.get(ptr)
+    if source is None:
+        return -1
+    try:
+        return source.read(buf, length)
+    except BaseException as e:
+        source.exception = e
+        return -1
+
+@libmysql.LOCAL_INFILE_END
+def _infile_end(ptr):
+    pass
+
+@libmysql.LOCAL_INFILE_ERROR
+def _infile_error(ptr, buf, length):
+    source = _sources.get(ptr)
+    if source is None:
+        message = "LOCAL INFILE requests are only served by load_data()"
+    else:
+        message = "Reading the data failed: %r" % (source.exception,)
+    message = message.encode("utf-8")[:length - 1]
+    ctypes.memmove(buf, message + b"\0", len(message) + 1)
+    return CR_UNKNOWN_ERROR
+
+def set_handler(db, token=None):
+    # Without a token any file the server asks for is refused, this is
+    # installed whenever load_data() isn't running so the library's default
+    # handler, which reads local files, is never used.
+    libmysql.c.mysql_set_local_infile_handler(db, _infile_init, _infile_read,
+        _infile_end, _infile_error, token)
+
+@contextlib.contextmanager
+def serving(db, chunks):
+    source = InfileSource(chunks)
+    token = next(_tokens)
+    _sources[token] = source
+    set_handler(db, token)
+    try:
+        yield source
+    finally:
+        set_handler(db)
+        del _sources[token]
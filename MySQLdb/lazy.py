@@ -0,0 +1,120 @@
+import functools
+
+from MySQLdb import cursors
+
+
+# Marks the values of a Row that haven't been decoded yet.
+_UNDECODED = object()
+
+
+class RowPlan(object):
+    # What's shared by all the rows of a result: the column names, where
+    # each of them is, and their decoders (None where the raw bytes are
+    # returned as they are).
+    __slots__ = ("names", "index", "decoders")
+
+    def __init__(self, names, decoders, type_codes):
+        self.names = tuple(names)
+        self.index = {}
+        for i, name in enumerate(names):
+            # With duplicate names, the first column wins, like with
+            # DictCursor.
+            self.index.setdefault(name, i)
+        self.decoders = tuple([
+            functools.partial(cursors._missing_decoder, type_code)
+            if decoder is None else None if decoder is bytes else decoder
+            for decoder, type_code in zip(decoders, type_codes)
+        ])
+
+
+class Row(object):
+    # A row that holds the raw bytes of its columns and decodes each of them
+    # the first time it's read, by index, name or attribute. Iterating over
+    # it or comparing it decodes all of them.
+    __slots__ = ("_raw", "_values", "_plan")
+
+    def __init__(self, raw, plan):
+        self._raw = raw
+        self._values = None
+        self._plan = plan
+
+    def _get(self, i):
+        values = self._values
+        if values is None:
+            values = self._values = [_UNDECODED] * len(self._raw)
+        value = values[i]
+        if value is _UNDECODED:
+            value = self._raw[i]
+            decoder = self._plan.decoders[i]
+            if value is not None and decoder is not None:
+                value = decoder(value)
+            values[i] = value
+        return value
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self._get(self._plan.index[key])
+        elif isinstance(key, slice):
+            return tuple([self._get(i) for i in range(*key.indices(len(self._raw)))])
+        return self._get(key)
+
+    def __getattr__(self, name):
+        try:
+            i = self._plan.index[name]
+        except KeyError:
+            raise AttributeError(name)
+        return self._get(i)
+
+    def __len__(self):
+        return len(self._raw)
+
+    def __iter__(self):
+        for i in range(len(self._raw)):
+            yield self._get(i)
+
+    def __eq__(self, other):
+        if isinstance(other, Row):
+            other = tuple(other)
+        return tuple(self) == other
+
+    __hash__ = None
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return list(self._plan.names)
+
+    def items(self):
+        return list(zip(self._plan.names, self))
+
+    def as_dict(self):
+        return dict(zip(self._plan.names, self))
+
+    def __repr__(self):
+        return "Row(%s)" % ", ".join(
+            "%s=%r" % (name, value) for name, value in self.items()
+        )
+
+
+def get_row_builder(names, decoders, type_codes, views=False):
+    # Like cursors.get_row_builder(), but the row's values are only copied
+    # out of the client library's buffer, decoding them is left to Row. With
+    # views the bytes columns are left in the buffer too, see
+    # cursors.BlobViews.
+    plan = RowPlan(names, decoders, type_codes)
+    if not views:
+        build_raw = cursors.get_row_builder([bytes] * len(plan.decoders),
+            type_codes)
+        def build_row(values, lengths):
+            return Row(build_raw(values, lengths), plan)
+        return build_row
+    build_raw = cursors.get_row_builder([
+        memoryview if decoder is bytes else bytes for decoder in decoders
+    ], type_codes)
+    def build_row(values, lengths, view):
+        return Row(build_raw(values, lengths, view), plan)
+    return build_row
@@ -9,7 +9,9 @@ class MYSQL_RES(ctypes.Structure):
     _fields_ = []
 MYSQL_RES_P = ctypes.POINTER(MYSQL_RES)
 
-MYSQL_ROW = ctypes.POINTER(ctypes.POINTER(ctypes.c_char))
+# Declared as an array of void pointers, rather than char pointers, so that
+# slicing it gives back plain addresses (or None for NULL columns) in one go.
+MYSQL_ROW = ctypes.POINTER(ctypes.c_void_p)
 
 class MYSQL_FIELD(ctypes.Structure):
     _fields_ = [
@@ -37,10 +39,81 @@ class MYSQL_FIELD(ctypes.Structure):
     ]
 MYSQL_FIELD_P = ctypes.POINTER(MYSQL_FIELD)
 
+class MYSQL_STMT(ctypes.Structure):
+    _fields_ = []
+MYSQL_STMT_P = ctypes.POINTER(MYSQL_STMT)
+
+class MYSQL_BIND(ctypes.Structure):
+    _fields_ = [
+        ("length", ctypes.POINTER(ctypes.c_ulong)),
+        ("is_null", ctypes.POINTER(ctypes.c_bool)),
+        ("buffer", ctypes.c_void_p),
+        ("error", ctypes.POINTER(ctypes.c_bool)),
+        ("row_ptr", ctypes.c_void_p),
+        ("store_param_func", ctypes.c_void_p),
+        ("fetch_result", ctypes.c_void_p),
+        ("skip_result", ctypes.c_void_p),
+        ("buffer_length", ctypes.c_ulong),
+        ("offset", ctypes.c_ulong),
+        ("length_value", ctypes.c_ulong),
+        ("param_number", ctypes.c_uint),
+        ("pack_length", ctypes.c_uint),
+        ("buffer_type", ctypes.c_int),
+        ("error_value", ctypes.c_bool),
+        ("is_unsigned", ctypes.c_bool),
+        ("long_data_used", ctypes.c_bool),
+        ("is_null_value", ctypes.c_bool),
+        ("extension", ctypes.c_void_p),
+    ]
+MYSQL_BIND_P = ctypes.POINTER(MYSQL_BIND)
+
+class MYSQL_TIME(ctypes.Structure):
+    _fields_ = [
+        ("year", ctypes.c_uint),
+        ("month", ctypes.c_uint),
+        ("day", ctypes.c_uint),
+        ("hour", ctypes.c_uint),
+        ("minute", ctypes.c_uint),
+        ("second", ctypes.c_uint),
+        ("second_part", ctypes.c_ulong),
+        ("neg", ctypes.c_bool),
+        ("time_type", ctypes.c_int),
+        # Only in newer versions, having it here just makes the structure
+        # large enough for any of them.
+        ("time_zone_displacement", ctypes.c_int),
+    ]
+
 # Hardcoded based on the values I found on two different Linux systems, bad: no
 # cookies
 MYSQL_OPT_CONNECT_TIMEOUT = 0
 MYSQL_INIT_COMMAND = 3
+MYSQL_OPT_LOCAL_INFILE = 8
+MYSQL_OPT_READ_TIMEOUT = 11
+MYSQL_OPT_WRITE_TIMEOUT = 12
+# MariaDB only.
+MYSQL_OPT_NONBLOCK = 6000
+
+# enum_stmt_attr_type
+STMT_ATTR_UPDATE_MAX_LENGTH = 0
+
+# enum_mysql_timestamp_type
+MYSQL_TIMESTAMP_DATE = 0
+MYSQL_TIMESTAMP_DATETIME = 1
+MYSQL_TIMESTAMP_TIME = 2
+
+# Return values of mysql_stmt_fetch
+MYSQL_NO_DATA = 100
+MYSQL_DATA_TRUNCATED = 101
+
+# What a non-blocking call is waiting for, MariaDB only.
+MYSQL_WAIT_READ = 1
+MYSQL_WAIT_WRITE = 2
+MYSQL_WAIT_EXCEPT = 4
+MYSQL_WAIT_TIMEOUT = 8
+
+# enum_mysql_set_option
+MYSQL_OPTION_MULTI_STATEMENTS_ON = 0
+MYSQL_OPTION_MULTI_STATEMENTS_OFF = 1
 
 c = None
 # Prefer the higher version, obscure.
@@ -49,7 +122,11 @@ library_names = [
     "libmysqlclient.so.15",
     "libmysqlclient.so",
     "mysqlclient",
-    "libmysqlclient.18.dylib"]
+    "libmysqlclient.18.dylib",
+    "libmariadb.so.3",
+    "libmariadb.so",
+    "mariadb",
+    "libmariadb.3.dylib"]
 for lib in library_names:
     try:
         c = ctypes.CDLL(lib)
@@ -90,9 +167,18 @@ c.mysql_query.restype = ctypes.c_int
 c.mysql_store_result.argtypes = [MYSQL_P]
 c.mysql_store_result.restype = MYSQL_RES_P
 
+c.mysql_use_result.argtypes = [MYSQL_P]
+c.mysql_use_result.restype = MYSQL_RES_P
+
 c.mysql_num_fields.argtypes = [MYSQL_RES_P]
 c.mysql_num_fields.restype = ctypes.c_uint
 
+c.mysql_num_rows.argtypes = [MYSQL_RES_P]
+c.mysql_num_rows.restype = ctypes.c_ulonglong
+
+c.mysql_data_seek.argtypes = [MYSQL_RES_P, ctypes.c_ulonglong]
+c.mysql_data_seek.restype = None
+
 c.mysql_fetch_row.argtypes = [MYSQL_RES_P]
 c.mysql_fetch_row.restype = MYSQL_ROW
 
@@ -129,6 +215,15 @@ c.mysql_rollback.restype = ctypes.c_char
 c.mysql_set_character_set.argtypes = [MYSQL_P, ctypes.c_char_p]
 c.mysql_set_character_set.restype = ctypes.c_int
 
+c.mysql_ping.argtypes = [MYSQL_P]
+c.mysql_ping.restype = ctypes.c_int
+
+# Only in 5.7 and newer.
+HAS_RESET_CONNECTION = hasattr(c, "mysql_reset_connection")
+if HAS_RESET_CONNECTION:
+    c.mysql_reset_connection.argtypes = [MYSQL_P]
+    c.mysql_reset_connection.restype = ctypes.c_int
+
 c.mysql_close.argtypes = [MYSQL_P]
 c.mysql_close.restype = None
 
@@ -141,3 +236,167 @@ c.mysql_character_set_name.restype = ctypes.c_char_p
 # Second thing is an enum, it looks to be a long on Linux systems.
 c.mysql_options.argtypes = [MYSQL_P, ctypes.c_long, ctypes.c_char_p]
 c.mysql_options.restype = ctypes.c_int
+
+LOCAL_INFILE_INIT = ctypes.CFUNCTYPE(ctypes.c_int,
+    ctypes.POINTER(ctypes.c_void_p), ctypes.c_char_p, ctypes.c_void_p)
+LOCAL_INFILE_READ = ctypes.CFUNCTYPE(ctypes.c_int,
+    ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint)
+LOCAL_INFILE_END = ctypes.CFUNCTYPE(None, ctypes.c_void_p)
+LOCAL_INFILE_ERROR = ctypes.CFUNCTYPE(ctypes.c_int,
+    ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint)
+
+c.mysql_set_local_infile_handler.argtypes = [MYSQL_P, LOCAL_INFILE_INIT,
+    LOCAL_INFILE_READ, LOCAL_INFILE_END, LOCAL_INFILE_ERROR, ctypes.c_void_p]
+c.mysql_set_local_infile_handler.restype = None
+
+c.mysql_set_server_option.argtypes = [MYSQL_P, ctypes.c_int]
+c.mysql_set_server_option.restype = ctypes.c_int
+
+c.mysql_more_results.argtypes = [MYSQL_P]
+c.mysql_more_results.restype = ctypes.c_char
+
+c.mysql_next_result.argtypes = [MYSQL_P]
+c.mysql_next_result.restype = ctypes.c_int
+
+c.mysql_stmt_init.argtypes = [MYSQL_P]
+c.mysql_stmt_init.restype = MYSQL_STMT_P
+
+c.mysql_stmt_prepare.argtypes = [MYSQL_STMT_P, ctypes.c_char_p, ctypes.c_ulong]
+c.mysql_stmt_prepare.restype = ctypes.c_int
+
+c.mysql_stmt_param_count.argtypes = [MYSQL_STMT_P]
+c.mysql_stmt_param_count.restype = ctypes.c_ulong
+
+c.mysql_stmt_field_count.argtypes = [MYSQL_STMT_P]
+c.mysql_stmt_field_count.restype = ctypes.c_uint
+
+c.mysql_stmt_attr_set.argtypes = [MYSQL_STMT_P, ctypes.c_int, ctypes.c_void_p]
+c.mysql_stmt_attr_set.restype = ctypes.c_char
+
+c.mysql_stmt_bind_param.argtypes = [MYSQL_STMT_P, MYSQL_BIND_P]
+c.mysql_stmt_bind_param.restype = ctypes.c_char
+
+c.mysql_stmt_bind_result.argtypes = [MYSQL_STMT_P, MYSQL_BIND_P]
+c.mysql_stmt_bind_result.restype = ctypes.c_char
+
+c.mysql_stmt_execute.argtypes = [MYSQL_STMT_P]
+c.mysql_stmt_execute.restype = ctypes.c_int
+
+c.mysql_stmt_store_result.argtypes = [MYSQL_STMT_P]
+c.mysql_stmt_store_result.restype = ctypes.c_int
+
+c.mysql_stmt_result_metadata.argtypes = [MYSQL_STMT_P]
+c.mysql_stmt_result_metadata.restype = MYSQL_RES_P
+
+c.mysql_stmt_fetch.argtypes = [MYSQL_STMT_P]
+c.mysql_stmt_fetch.restype = ctypes.c_int
+
+c.mysql_stmt_fetch_column.argtypes = [MYSQL_STMT_P, MYSQL_BIND_P, ctypes.c_uint, ctypes.c_ulong]
+c.mysql_stmt_fetch_column.restype = ctypes.c_int
+
+c.mysql_stmt_affected_rows.argtypes = [MYSQL_STMT_P]
+c.mysql_stmt_affected_rows.restype = ctypes.c_ulonglong
+
+c.mysql_stmt_insert_id.argtypes = [MYSQL_STMT_P]
+c.mysql_stmt_insert_id.restype = ctypes.c_ulonglong
+
+c.mysql_stmt_free_result.argtypes = [MYSQL_STMT_P]
+c.mysql_stmt_free_result.restype = ctypes.c_char
+
+c.mysql_stmt_close.argtypes = [MYSQL_STMT_P]
+c.mysql_stmt_close.restype = ctypes.c_char
+
+c.mysql_stmt_errno.argtypes = [MYSQL_STMT_P]
+c.mysql_stmt_errno.restype = ctypes.c_uint
+
+c.mysql_stmt_error.argtypes = [MYSQL_STMT_P]
+c.mysql_stmt_error.restype = ctypes.c_char_p
+
+# MariaDB Connector/C's non-blocking API, each call is started with the _start
+# function and, until that returns 0, continued with the _cont one once the
+# socket is ready.
+HAS_NONBLOCKING = hasattr(c, "mysql_real_connect_start")
+if HAS_NONBLOCKING:
+    c.mysql_get_socket.argtypes = [MYSQL_P]
+    c.mysql_get_socket.restype = ctypes.c_int
+
+    c.mysql_get_timeout_value_ms.argtypes = [MYSQL_P]
+    c.mysql_get_timeout_value_ms.restype = ctypes.c_uint
+
+    c.mysql_real_connect_start.argtypes = [
+        ctypes.POINTER(MYSQL_P),
+    ] + c.mysql_real_connect.argtypes
+    c.mysql_real_connect_start.restype = ctypes.c_int
+    c.mysql_real_connect_cont.argtypes = [
+        ctypes.POINTER(MYSQL_P), MYSQL_P, ctypes.c_int,
+    ]
+    c.mysql_real_connect_cont.restype = ctypes.c_int
+
+    c.mysql_real_query_start.argtypes = [
+        ctypes.POINTER(ctypes.c_int), MYSQL_P, ctypes.c_char_p, ctypes.c_ulong,
+    ]
+    c.mysql_real_query_start.restype = ctypes.c_int
+    c.mysql_real_query_cont.argtypes = [
+        ctypes.POINTER(ctypes.c_int), MYSQL_P, ctypes.c_int,
+    ]
+    c.mysql_real_query_cont.restype = ctypes.c_int
+
+    c.mysql_store_result_start.argtypes = [ctypes.POINTER(MYSQL_RES_P), MYSQL_P]
+    c.mysql_store_result_start.restype = ctypes.c_int
+    c.mysql_store_result_cont.argtypes = [
+        ctypes.POINTER(MYSQL_RES_P), MYSQL_P, ctypes.c_int,
+    ]
+    c.mysql_store_result_cont.restype = ctypes.c_int
+
+    c.mysql_next_result_start.argtypes = [ctypes.POINTER(ctypes.c_int), MYSQL_P]
+    c.mysql_next_result_start.restype = ctypes.c_int
+    c.mysql_next_result_cont.argtypes = [
+        ctypes.POINTER(ctypes.c_int), MYSQL_P, ctypes.c_int,
+    ]
+    c.mysql_next_result_cont.restype = ctypes.c_int
+
+    # Unlike the others these have no return value, and they free the handle
+    # once they're done.
+    c.mysql_close_start.argtypes = [MYSQL_P]
+    c.mysql_close_start.restype = ctypes.c_int
+    c.mysql_close_cont.argtypes = [MYSQL_P, ctypes.c_int]
+    c.mysql_close_cont.restype = ctypes.c_int
+
+    c.mysql_set_character_set_start.argtypes = [
+        ctypes.POINTER(ctypes.c_int), MYSQL_P, ctypes.c_char_p,
+    ]
+    c.mysql_set_character_set_start.restype = ctypes.c_int
+    c.mysql_set_character_set_cont.argtypes = [
+        ctypes.POINTER(ctypes.c_int), MYSQL_P, ctypes.c_int,
+    ]
+    c.mysql_set_character_set_cont.restype = ctypes.c_int
+
+    c.mysql_ping_start.argtypes = [ctypes.POINTER(ctypes.c_int), MYSQL_P]
+    c.mysql_ping_start.restype = ctypes.c_int
+    c.mysql_ping_cont.argtypes = [
+        ctypes.POINTER(ctypes.c_int), MYSQL_P, ctypes.c_int,
+    ]
+    c.mysql_ping_cont.restype = ctypes.c_int
+
+    c.mysql_autocommit_start.argtypes = [
+        ctypes.POINTER(ctypes.c_char), MYSQL_P, ctypes.c_char,
+    ]
+    c.mysql_autocommit_start.restype = ctypes.c_int
+    c.mysql_autocommit_cont.argtypes = [
+        ctypes.POINTER(ctypes.c_char), MYSQL_P, ctypes.c_int,
+    ]
+    c.mysql_autocommit_cont.restype = ctypes.c_int
+
+    c.mysql_commit_start.argtypes = [ctypes.POINTER(ctypes.c_char), MYSQL_P]
+    c.mysql_commit_start.restype = ctypes.c_int
+    c.mysql_commit_cont.argtypes = [
+        ctypes.POINTER(ctypes.c_char), MYSQL_P, ctypes.c_int,
+    ]
+    c.mysql_commit_cont.restype = ctypes.c_int
+
+    c.mysql_rollback_start.argtypes = [ctypes.POINTER(ctypes.c_char), MYSQL_P]
+    c.mysql_rollback_start.restype = ctypes.c_int
+    c.mysql_rollback_cont.argtypes = [
+        ctypes.POINTER(ctypes.c_char), MYSQL_P, ctypes.c_int,
+    ]
+    c.mysql_rollback_cont.restype = ctypes.c_int
@@ -0,0 +1,163 @@
+import collections
+import contextlib
+import threading
+import time
+
+from MySQLdb.connection import connect
+from MySQLdb.exceptions import Error, OperationalError
+
+
+class ConnectionPool(object):
+    # Hands out connections made with connect_kwargs to any number of
+    # threads, keeping between min_size and max_size of them open. A
+    # connection that has been idle for more than ping_interval seconds is
+    # pinged before it's handed out again, and every connection is reset when
+    # it's given back.
+    def __init__(self, min_size=1, max_size=10, ping_interval=30.0,
+        timeout=None, **connect_kwargs):
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError("Need 0 <= min_size <= max_size and max_size >= 1")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.ping_interval = ping_interval
+        self.timeout = timeout
+        self.connect_kwargs = connect_kwargs
+
+        self._cond = threading.Condition()
+        # Idle connections with the time they were given back, the most
+        # recently used one last.
+        self._idle = collections.deque()
+        # Open connections, idle or checked out, and ones being opened.
+        self._size = 0
+        self._closed = False
+
+        self._warm_up()
+
+    def _connect(self):
+        return connect(**self.connect_kwargs)
+
+    def _warm_up(self):
+        # The first min_size connections are opened in parallel, as most of
+        # the time connecting goes on round trips.
+        connections = []
+        errors = []
+        def open_one():
+            try:
+                conn = self._connect()
+            except Exception as e:
+                errors.append(e)
+            else:
+                connections.append(conn)
+        threads = [threading.Thread(target=open_one) for i in range(self.min_size)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            for conn in connections:
+                conn.close()
+            raise errors[0]
+        now = time.time()
+        with self._cond:
+            self._size += len(connections)
+            self._idle.extend((conn, now) for conn in connections)
+
+    @property
+    def closed(self):
+        return self._closed
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def idle(self):
+        return len(self._idle)
+
+    def checkout(self, timeout=None):
+        if timeout is None:
+            timeout = self.timeout
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            with self._cond:
+                conn = self._wait(deadline)
+            if conn is None:
+                try:
+                    return self._connect()
+                except Exception:
+                    self._discard()
+                    raise
+            conn, last_used = conn
+            if time.time() - last_used < self.ping_interval:
+                return conn
+            try:
+                conn.ping()
+            except Error:
+                self._discard(conn)
+            else:
+                return conn
+
+    def _wait(self, deadline):
+        # Returns an idle connection, or None after reserving room for a new
+        # one, must be called with the lock held.
+        while True:
+            if self._closed:
+                raise OperationalError(0, "The pool is closed")
+            if self._idle:
+                return self._idle.pop()
+            if self._size < self.max_size:
+                self._size += 1
+                return None
+            if deadline is None:
+                self._cond.wait()
+            else:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise OperationalError(0, "Timed out waiting for a "
+                        "connection from the pool")
+                self._cond.wait(remaining)
+
+    def _discard(self, conn=None):
+        if conn is not None and not conn.closed:
+            try:
+                conn.close()
+            except Error:
+                pass
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def checkin(self, conn):
+        if conn.closed:
+            self._discard()
+            return
+        try:
+            conn.reset()
+        except Error:
+            self._discard(conn)
+            return
+        with self._cond:
+            if not self._closed:
+                self._idle.append((conn, time.time()))
+                self._cond.notify()
+                return
+        self._discard(conn)
+
+    @contextlib.contextmanager
+    def connection(self, timeout=None):
+        conn = self.checkout(timeout)
+        try:
+            yield conn
+        finally:
+            self.checkin(conn)
+
+    def close(self):
+        # Closes the idle connections, the checked out ones are closed as
+        # they're given back.
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn, last_used in idle:
+            self._discard(conn)
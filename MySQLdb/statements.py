@@ -0,0 +1,597 @@
+import ctypes
+import datetime
+import decimal
+import itertools
+import re
+import weakref
+try:
+    from collections.abc import Sequence
+except ImportError:
+    from collections import Sequence
+
+from MySQLdb import columns, converters, cursors, libmysql
+from MySQLdb.constants import field_types, FLAG
+from MySQLdb.cursors import Cursor, Result
+from MySQLdb.exceptions import NotSupportedError, ProgrammingError
+
+
+PLACEHOLDER = re.compile(r"%(?:\((?P<name>[^)]+)\))?s|%%")
+
+def convert_placeholders(query):
+    # Rewrites a pyformat query to use the ? placeholders the server
+    # understands, returns it along with the names of the parameters, or None
+    # if they're positional.
+    names = []
+    def replace(match):
+        if match.group(0) == "%%":
+            return "%"
+        names.append(match.group("name"))
+        return "?"
+    query = PLACEHOLDER.sub(replace, query)
+    if not any(names):
+        return query, None
+    if not all(names):
+        raise ProgrammingError("Can't mix named and positional parameters")
+    return query, names
+
+
+def _address(array, i):
+    return ctypes.cast(
+        ctypes.addressof(array) + i * ctypes.sizeof(array._type_),
+        ctypes.POINTER(array._type_)
+    )
+
+def _set_time(bind, keep, buffer_type, **kwargs):
+    value = libmysql.MYSQL_TIME(**kwargs)
+    keep.append(value)
+    bind.buffer_type = buffer_type
+    bind.buffer = ctypes.addressof(value)
+    bind.buffer_length = ctypes.sizeof(value)
+
+def _set_bytes(bind, keep, buffer_type, data):
+    buf = ctypes.c_char_p(data)
+    keep.append((data, buf))
+    bind.buffer_type = buffer_type
+    bind.buffer = ctypes.cast(buf, ctypes.c_void_p)
+    bind.buffer_length = len(data)
+
+def bind_param(bind, value, keep):
+    # Fills in a MYSQL_BIND for value, anything which needs to stay alive until
+    # the statement has been executed is added to keep.
+    bind.length = None
+    bind.is_null = None
+    bind.is_unsigned = False
+    if value is None:
+        bind.buffer_type = field_types.NULL
+        bind.buffer = None
+        bind.buffer_length = 0
+    elif isinstance(value, int) and -2 ** 63 <= value < 2 ** 64:
+        if value < 2 ** 63:
+            buf = ctypes.c_longlong(value)
+        else:
+            buf = ctypes.c_ulonglong(value)
+            bind.is_unsigned = True
+        keep.append(buf)
+        bind.buffer_type = field_types.LONGLONG
+        bind.buffer = ctypes.addressof(buf)
+        bind.buffer_length = ctypes.sizeof(buf)
+    elif isinstance(value, float):
+        buf = ctypes.c_double(value)
+        keep.append(buf)
+        bind.buffer_type = field_types.DOUBLE
+        bind.buffer = ctypes.addressof(buf)
+        bind.buffer_length = ctypes.sizeof(buf)
+    elif isinstance(value, datetime.datetime):
+        _set_time(bind, keep, field_types.DATETIME,
+            year=value.year, month=value.month, day=value.day,
+            hour=value.hour, minute=value.minute, second=value.second,
+            second_part=value.microsecond,
+            time_type=libmysql.MYSQL_TIMESTAMP_DATETIME,
+        )
+    elif isinstance(value, datetime.date):
+        _set_time(bind, keep, field_types.DATE,
+            year=value.year, month=value.month, day=value.day,
+            time_type=libmysql.MYSQL_TIMESTAMP_DATE,
+        )
+    elif isinstance(value, datetime.time):
+        _set_time(bind, keep, field_types.TIME,
+            hour=value.hour, minute=value.minute, second=value.second,
+            second_part=value.microsecond,
+            time_type=libmysql.MYSQL_TIMESTAMP_TIME,
+        )
+    elif isinstance(value, datetime.timedelta):
+        delta = abs(value)
+        minutes, seconds = divmod(delta.seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        _set_time(bind, keep, field_types.TIME,
+            hour=delta.days * 24 + hours, minute=minutes, second=seconds,
+            second_part=delta.microseconds, neg=value < datetime.timedelta(0),
+            time_type=libmysql.MYSQL_TIMESTAMP_TIME,
+        )
+    elif isinstance(value, (bytes, bytearray)):
+        _set_bytes(bind, keep, field_types.BLOB, bytes(value))
+    elif isinstance(value, (int, decimal.Decimal)):
+        _set_bytes(bind, keep, field_types.NEWDECIMAL, str(value).encode('ascii'))
+    else:
+        if not isinstance(value, str):
+            value = str(value)
+        _set_bytes(bind, keep, field_types.STRING,
+            value.encode('utf-8', 'surrogateescape'))
+
+
+class PreparedStatement(object):
+    # A server side prepared statement, these are cached per connection, see
+    # Connection._get_statement.
+    def __init__(self, connection, query, convert=True):
+        self.connection = weakref.proxy(connection)
+        if convert:
+            query, self.names = convert_placeholders(query)
+        else:
+            self.names = None
+        self.query = query.encode('utf-8', 'surrogateescape')
+        # The StatementResult currently reading from this statement.
+        self.result = None
+        # Whether the statement should be closed once it's no longer in use.
+        self.close_pending = False
+
+        self._stmt = libmysql.c.mysql_stmt_init(connection._db)
+        if not self._stmt:
+            connection._exception()
+        if libmysql.c.mysql_stmt_prepare(self._stmt, self.query, len(self.query)):
+            try:
+                self._exception()
+            finally:
+                self._close()
+        self.param_count = libmysql.c.mysql_stmt_param_count(self._stmt)
+        self.field_count = libmysql.c.mysql_stmt_field_count(self._stmt)
+        if self.field_count:
+            # Have mysql_stmt_store_result work out how large the result
+            # buffers need to be.
+            update_max_length = ctypes.c_bool(True)
+            libmysql.c.mysql_stmt_attr_set(self._stmt,
+                libmysql.STMT_ATTR_UPDATE_MAX_LENGTH,
+                ctypes.byref(update_max_length)
+            )
+        self._params = (libmysql.MYSQL_BIND * self.param_count)()
+        # Result buffers, allocated the first time they're needed and reused
+        # by every execution afterwards.
+        self.result_buffers = None
+
+    @property
+    def closed(self):
+        return self._stmt is None
+
+    def _exception(self):
+        self.connection._raise_error(libmysql.c.mysql_stmt_errno(self._stmt),
+            libmysql.c.mysql_stmt_error(self._stmt))
+
+    def _close(self):
+        if self._stmt is not None:
+            libmysql.c.mysql_stmt_close(self._stmt)
+            self._stmt = None
+
+    def close(self):
+        # A statement which still has a result being read from is closed when
+        # that result is.
+        if self.result is not None:
+            self.close_pending = True
+        else:
+            self._close()
+
+    def release(self, result):
+        if self.result is result:
+            self.result = None
+            if self.result_buffers is not None:
+                self.result_buffers.shrink(MAX_KEPT_STRING_BUFFER_SIZE)
+            if self.close_pending:
+                self._close()
+
+    def execute(self, args):
+        if len(args) != self.param_count:
+            raise ProgrammingError("Statement takes %d parameters, %d given"
+                % (self.param_count, len(args)))
+        keep = []
+        for bind, arg in zip(self._params, args):
+            bind_param(bind, arg, keep)
+        if self.param_count:
+            if ord(libmysql.c.mysql_stmt_bind_param(self._stmt, self._params)):
+                self._exception()
+        if libmysql.c.mysql_stmt_execute(self._stmt):
+            self._exception()
+        if self.field_count:
+            if libmysql.c.mysql_stmt_store_result(self._stmt):
+                self._exception()
+
+
+# Kinds of result column, by the buffer they're fetched into.
+INT = "int"
+UINT = "uint"
+DOUBLE = "double"
+DATETIME = "datetime"
+DATE = "date"
+TIME = "time"
+STRING = "string"
+
+INTEGER_TYPES = frozenset([
+    field_types.TINY, field_types.SHORT, field_types.LONG,
+    field_types.LONGLONG, field_types.INT24, field_types.YEAR,
+])
+TIME_KINDS = {
+    DATETIME: field_types.DATETIME,
+    DATE: field_types.DATE,
+    TIME: field_types.TIME,
+}
+
+def column_kind(field_type, flags, decoder):
+    # Columns are only fetched as C values when they'd have been decoded with
+    # the default decoder anyway, everything else is fetched as a string and
+    # goes through its decoder.
+    if decoder is int and field_type in INTEGER_TYPES:
+        return UINT if flags & FLAG.UNSIGNED else INT
+    elif decoder is float and field_type == field_types.DOUBLE:
+        return DOUBLE
+    elif (decoder in (converters.datetime_decoder, converters.timestamp_decoder)
+        and field_type in (field_types.DATETIME, field_types.TIMESTAMP)):
+        return DATETIME
+    elif decoder is converters.date_decoder and field_type == field_types.DATE:
+        return DATE
+    elif decoder is converters.time_decoder and field_type == field_types.TIME:
+        return TIME
+    return STRING
+
+def make_datetime(t):
+    return datetime.datetime(t.year, t.month, t.day, t.hour, t.minute,
+        t.second, t.second_part)
+
+def make_date(t):
+    return datetime.date(t.year, t.month, t.day)
+
+def make_timedelta(t):
+    delta = datetime.timedelta(hours=t.hour, minutes=t.minute,
+        seconds=t.second, microseconds=t.second_part)
+    if t.neg:
+        delta = -delta
+    return delta
+
+_binary_row_builders = {}
+
+def get_binary_row_builder(kinds, decoders, type_codes):
+    # Like cursors.get_row_builder, but for rows fetched into ResultBuffers.
+    key = (tuple(kinds), tuple([
+        decoder if decoder is not None else (None, type_code)
+        for decoder, type_code in zip(decoders, type_codes)
+    ]))
+    try:
+        return _binary_row_builders[key]
+    except KeyError:
+        pass
+
+    namespace = {
+        "string_at": ctypes.string_at,
+        "missing_decoder": cursors._missing_decoder,
+        "make_datetime": make_datetime,
+        "make_date": make_date,
+        "make_timedelta": make_timedelta,
+    }
+    columns = []
+    for i, (kind, decoder) in enumerate(zip(*key)):
+        if kind == INT:
+            value = "ints[%d]" % i
+        elif kind == UINT:
+            value = "uints[%d]" % i
+        elif kind == DOUBLE:
+            value = "doubles[%d]" % i
+        elif kind in TIME_KINDS:
+            value = "make_%s(times[%d])" % (
+                "timedelta" if kind == TIME else kind, i)
+        else:
+            value = "string_at(addresses[%d], lengths[%d])" % (i, i)
+            if isinstance(decoder, tuple):
+                value = "missing_decoder(%d, %s)" % (decoder[1], value)
+            elif decoder is not bytes:
+                namespace["d%d" % i] = decoder
+                value = "d%d(%s)" % (i, value)
+        columns.append("None if n%d else %s" % (i, value))
+    source = ("def build_row(nulls, ints, uints, doubles, times, addresses, "
+        "lengths):\n")
+    if columns:
+        source += "    %s, = nulls\n" % ", ".join(
+            "n%d" % i for i in range(len(columns)))
+    source += "    return (%s)\n" % "".join(
+        "\n        %s," % column for column in columns)
+    exec(source, namespace)
+    build_row = namespace["build_row"]
+    build_row.kinds = key[0]
+
+    if len(_binary_row_builders) >= cursors._ROW_BUILDERS_MAX_SIZE:
+        _binary_row_builders.clear()
+    _binary_row_builders[key] = build_row
+    return build_row
+
+
+# The size of the buffer a string column starts with, and the most a cached
+# statement keeps for one between executions, so one large value doesn't stay
+# allocated for as long as the statement is cached.
+STRING_BUFFER_SIZE = 64
+MAX_KEPT_STRING_BUFFER_SIZE = 64 * 1024
+
+
+class ResultBuffers(object):
+    # The MYSQL_BINDs and buffers a statement's rows are fetched into, these
+    # are allocated once per result shape and reused by every execution.
+    def __init__(self, kinds):
+        n = len(kinds)
+        self.kinds = kinds
+        self.binds = (libmysql.MYSQL_BIND * n)()
+        self.lengths = (ctypes.c_ulong * n)()
+        self.nulls = (ctypes.c_bool * n)()
+        self.errors = (ctypes.c_bool * n)()
+        # Integers and doubles share one slot per column.
+        self.ints = (ctypes.c_longlong * n)()
+        self.uints = (ctypes.c_ulonglong * n).from_buffer(self.ints)
+        self.doubles = (ctypes.c_double * n).from_buffer(self.ints)
+        self.times = [
+            libmysql.MYSQL_TIME() if kind in TIME_KINDS else None
+            for kind in kinds
+        ]
+        self.strings = [
+            ctypes.create_string_buffer(STRING_BUFFER_SIZE) if kind == STRING
+            else None
+            for kind in kinds
+        ]
+        self.addresses = [None] * n
+        for i in range(n):
+            self.bind_column(i)
+
+    def bind_column(self, i):
+        kind = self.kinds[i]
+        bind = self.binds[i]
+        bind.length = _address(self.lengths, i)
+        bind.is_null = _address(self.nulls, i)
+        bind.error = _address(self.errors, i)
+        bind.is_unsigned = kind == UINT
+        if kind in (INT, UINT, DOUBLE):
+            bind.buffer_type = (field_types.DOUBLE if kind == DOUBLE
+                else field_types.LONGLONG)
+            bind.buffer = ctypes.addressof(self.ints) + i * 8
+            bind.buffer_length = 8
+        elif kind in TIME_KINDS:
+            bind.buffer_type = TIME_KINDS[kind]
+            bind.buffer = ctypes.addressof(self.times[i])
+            bind.buffer_length = ctypes.sizeof(self.times[i])
+        else:
+            bind.buffer_type = field_types.STRING
+            bind.buffer = ctypes.addressof(self.strings[i])
+            bind.buffer_length = len(self.strings[i])
+            self.addresses[i] = bind.buffer
+
+    def reserve(self, i, size):
+        # Makes sure string column i can hold size bytes.
+        if len(self.strings[i]) < size:
+            self.strings[i] = ctypes.create_string_buffer(size)
+            self.bind_column(i)
+            return True
+        return False
+
+    def shrink(self, size):
+        # Replaces the string buffers that have grown beyond size.
+        for i, buf in enumerate(self.strings):
+            if buf is not None and len(buf) > size:
+                self.strings[i] = ctypes.create_string_buffer(STRING_BUFFER_SIZE)
+                self.bind_column(i)
+
+
+class StatementResult(Result):
+    # The result of executing a PreparedStatement. The rows are buffered on
+    # the client by mysql_stmt_store_result and fetched in the binary
+    # protocol: integers, doubles and temporal values are read straight out of
+    # C buffers, only the remaining columns are fetched as strings and decoded.
+    def __init__(self, cursor, statement, forward_only=False):
+        self.cursor = cursor
+        self.connection = cursor.connection
+        self.statement = statement
+        self.unbuffered = False
+        self.forward_only = forward_only
+        self._result = None
+        self._description = None
+        self.rows = None
+        self.row_index = 0
+
+        stmt = statement._stmt
+        cursor.rowcount = libmysql.c.mysql_stmt_affected_rows(stmt)
+        if not statement.field_count:
+            cursor.lastrowid = libmysql.c.mysql_stmt_insert_id(stmt)
+            return
+        statement.result = self
+        try:
+            self._result = libmysql.c.mysql_stmt_result_metadata(stmt)
+            if not self._result:
+                statement._exception()
+
+            self._db = self.connection._db
+            self._load_plan()
+            self._bind_result()
+        except BaseException:
+            # The statement stays cached, so it mustn't be left looking like
+            # it's still in use.
+            self.close()
+            libmysql.c.mysql_stmt_free_result(stmt)
+            statement.release(self)
+            raise
+        self._column_typecodes = None
+        self._eof = False
+
+        self.rows = []
+
+    def _make_row_builder(self, row_decoders):
+        fields = libmysql.c.mysql_fetch_fields(self._result)
+        type_codes = [field[1] for field in self._description]
+        kinds = [
+            column_kind(type_code, fields[i].flags, decoder)
+            for i, (type_code, decoder) in enumerate(zip(type_codes, row_decoders))
+        ]
+        return get_binary_row_builder(kinds, row_decoders, type_codes)
+
+    def _bind_result(self):
+        statement = self.statement
+        kinds = self._build_row.kinds
+        if statement.result_buffers is None or statement.result_buffers.kinds != kinds:
+            statement.result_buffers = ResultBuffers(kinds)
+        buffers = statement.result_buffers
+        fields = libmysql.c.mysql_fetch_fields(self._result)
+        for i, kind in enumerate(kinds):
+            if kind == STRING:
+                buffers.reserve(i, fields[i].max_length)
+        self._bind()
+
+    def _bind(self):
+        res = libmysql.c.mysql_stmt_bind_result(self.statement._stmt,
+            self.statement.result_buffers.binds)
+        if ord(res):
+            self.statement._exception()
+
+    def _fetch_truncated(self):
+        # A string didn't fit in its buffer, grow the buffer, fetch the value
+        # again, and rebind so the following rows fit.
+        buffers = self.statement.result_buffers
+        for i in range(self._field_count):
+            if (buffers.errors[i] and buffers.kinds[i] == STRING
+                and buffers.reserve(i, buffers.lengths[i])):
+                res = libmysql.c.mysql_stmt_fetch_column(self.statement._stmt,
+                    ctypes.byref(buffers.binds[i]), i, 0)
+                if res:
+                    self.statement._exception()
+        self._bind()
+
+    def _get_rows(self, size=None):
+        return list(self._iter_rows(size))
+
+    def _iter_rows(self, size=None):
+        # Yields up to size rows, each decoded out of the bound buffers as
+        # it's fetched.
+        if not self._result or self._eof:
+            return
+        stmt = self.statement._stmt
+        n = self._field_count
+        build_row = self._build_row
+        buffers = self.statement.result_buffers
+        nulls = buffers.nulls
+        ints = buffers.ints
+        uints = buffers.uints
+        doubles = buffers.doubles
+        times = buffers.times
+        lengths = buffers.lengths
+        fetch = libmysql.c.mysql_stmt_fetch
+        if size is None:
+            counter = itertools.repeat(None)
+        else:
+            counter = itertools.repeat(None, size)
+        for _ in counter:
+            res = fetch(stmt)
+            if res == libmysql.MYSQL_NO_DATA:
+                self._eof = True
+                break
+            elif res == libmysql.MYSQL_DATA_TRUNCATED:
+                self._fetch_truncated()
+            elif res:
+                self.statement._exception()
+            yield build_row(nulls[:n], ints, uints, doubles, times,
+                buffers.addresses, lengths)
+
+    def fetch_columns(self, size=None):
+        # The values are decoded as they're read out of the bound buffers,
+        # each row is appended to the columns as soon as it's fetched, so no
+        # more than one row's tuple is around at a time.
+        self._check_rows("fetch_columns")
+        self.forward_only = True
+        typecodes = self._column_typecodes
+        if typecodes is None:
+            fields = libmysql.c.mysql_fetch_fields(self._result)
+            typecodes = self._column_typecodes = [
+                columns.column_typecode(fields[i], decoder)
+                for i, decoder in enumerate(self.row_decoders)
+            ]
+        cols = columns.new_columns(typecodes)
+        appends = [col.append for col in cols]
+        nulls = [[] for col in cols]
+        # Rows that were already fetched, but not returned yet.
+        num_rows = columns.append_rows(self.rows[self.row_index:], typecodes,
+            appends, nulls)
+        del self.rows[self.row_index:]
+        if size is None or num_rows < size:
+            num_rows = columns.append_rows(
+                self._iter_rows(None if size is None else size - num_rows),
+                typecodes, appends, nulls, num_rows)
+        self.row_index += num_rows
+        return columns.ColumnBatch(self.description, cols, [
+            columns.make_validity(num_rows, column_nulls)
+            for column_nulls in nulls
+        ], num_rows)
+
+    def _no_raw_rows(self):
+        # The binary protocol has no text for the values, which is what
+        # the numpy and Arrow export parse.
+        raise NotSupportedError(0, "Prepared statement results can't be "
+            "fetched as raw columns")
+
+    def _remaining_rows(self):
+        self._no_raw_rows()
+
+    def fetch_raw_columns(self, size=None):
+        self._no_raw_rows()
+
+    def close(self):
+        if self._result:
+            libmysql.c.mysql_free_result(self._result)
+            if not self.statement.closed:
+                libmysql.c.mysql_stmt_free_result(self.statement._stmt)
+            self.statement.release(self)
+        self._result = None
+
+
+class PreparedCursor(Cursor):
+    # Executes queries as server side prepared statements, the statements are
+    # cached by the connection so repeated queries are only parsed once, and
+    # parameters are sent in the binary protocol rather than being escaped.
+    # Parameters are converted by type, the cursor's encoders aren't used.
+    # Rows are fetched into buffers which are reused for every row.
+    _supports_blob_views = False
+    def _statement_args(self, statement, args):
+        if args is None:
+            return ()
+        if statement.names is not None:
+            return tuple([args[name] for name in statement.names])
+        if isinstance(args, Sequence) and not isinstance(args, (str, bytes)):
+            return tuple(args)
+        return (args,)
+
+    def execute(self, query, args=None):
+        self._check_closed()
+        self._clear()
+
+        if isinstance(query, bytes):
+            query = query.decode('utf-8', 'surrogateescape')
+        connection = self.connection
+        connection._check_unbuffered()
+        # Without arguments the query is used as is, just like with
+        # Cursor.execute.
+        statement = connection._get_statement(query, args is not None)
+        self._executed = statement.query
+        try:
+            statement.execute(self._statement_args(statement, args))
+            self._result = StatementResult(self, statement, self.forward_only)
+        finally:
+            if statement.close_pending:
+                statement.close()
+
+    def executemany(self, query, args):
+        self._check_closed()
+        self._clear()
+        if not args:
+            return
+        rowcount = 0
+        for arg in args:
+            self.execute(query, arg)
+            rowcount += self.rowcount
+        self.rowcount = rowcount
+        return self.rowcount
@@ -0,0 +1,65 @@
+"""
+Compares queries/sec of a number of concurrent MySQLdb.aio connections (on
+worker threads, and non-blocking ones where the client library is MariaDB's)
+with the same queries run one after the other on a single synchronous
+connection.
+"""
+import asyncio
+import contextlib
+
+from common import make_parser, connect, best_of, report
+
+from MySQLdb import aio, libmysql
+
+
+QUERY = "SELECT SLEEP(0.001), %s"
+
+def run_sync(conn, queries):
+    with contextlib.closing(conn.cursor()) as cursor:
+        for i in range(queries):
+            cursor.execute(QUERY, (i,))
+            cursor.fetchall()
+
+async def run_one(conn, queries):
+    async with conn.cursor() as cursor:
+        for i in range(queries):
+            await cursor.execute(QUERY, (i,))
+            await cursor.fetchall()
+
+def run_async(loop, connections, queries):
+    loop.run_until_complete(asyncio.gather(*[
+        run_one(conn, queries // len(connections)) for conn in connections
+    ]))
+
+def main():
+    parser = make_parser(__doc__)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    options = parser.parse_args()
+
+    conn = connect(options)
+    report("sync", options.queries,
+        best_of(options.repeat, run_sync, conn, options.queries), "queries")
+    conn.close()
+
+    loop = asyncio.new_event_loop()
+    modes = [("aio threads", False)]
+    if libmysql.HAS_NONBLOCKING:
+        modes.append(("aio non-blocking", True))
+    for name, nonblocking in modes:
+        connections = loop.run_until_complete(asyncio.gather(*[
+            aio.connect(host=options.mysql_host, user=options.mysql_user,
+                passwd=options.mysql_passwd, db=options.mysql_database,
+                nonblocking=nonblocking, loop=loop)
+            for i in range(options.concurrency)
+        ]))
+        report("%s x%d" % (name, options.concurrency), options.queries,
+            best_of(options.repeat, run_async, loop, connections,
+                options.queries),
+            "queries")
+        for conn in connections:
+            loop.run_until_complete(conn.close())
+    loop.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Compares MB/sec of reading large BLOBs as bytes and, with blob_views=True,
+as memoryviews of the client library's buffer.
+"""
+import contextlib
+
+from common import make_parser, connect, best_of, report
+
+
+def run(conn, blob_views):
+    with contextlib.closing(conn.cursor(blob_views=blob_views)) as cursor:
+        cursor.execute("SELECT data FROM bench_blobs")
+        for data, in cursor.fetchall():
+            len(data)
+
+def main():
+    parser = make_parser(__doc__)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--size", type=int, default=4 * 1024 * 1024)
+    options = parser.parse_args()
+
+    conn = connect(options)
+    with contextlib.closing(conn.cursor()) as cursor:
+        cursor.execute("CREATE TEMPORARY TABLE bench_blobs (data LONGBLOB)")
+        for i in range(options.rows):
+            cursor.execute("INSERT INTO bench_blobs (data) VALUES (%s)",
+                (b"x" * options.size,))
+    megabytes = options.rows * options.size / (1024.0 * 1024.0)
+    for name, blob_views in [("bytes", False), ("blob_views", True)]:
+        report(name, megabytes, best_of(options.repeat, run, conn, blob_views),
+            "MB")
+    conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Compares rows/sec of fetching a numeric result as tuples with fetchall() and
+as columns with fetch_columns().
+"""
+import contextlib
+
+from common import make_parser, connect, best_of, report
+
+
+def run(cursor, fetch):
+    cursor.execute("SELECT * FROM bench_columns")
+    fetch(cursor)
+
+def main():
+    parser = make_parser(__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    options = parser.parse_args()
+
+    conn = connect(options)
+    with contextlib.closing(conn.cursor(forward_only=True)) as cursor:
+        cursor.execute("CREATE TEMPORARY TABLE bench_columns (a INT, b BIGINT, "
+            "c DOUBLE, d DOUBLE)")
+        cursor.executemany(
+            "INSERT INTO bench_columns (a, b, c, d) VALUES (%s, %s, %s, %s)",
+            [(i, i * 1000, i / 3.0, None) for i in range(options.rows)]
+        )
+        for name, fetch in [
+            ("fetchall", lambda cur: cur.fetchall()),
+            ("fetch_columns", lambda cur: cur.fetch_columns()),
+        ]:
+            report(name, options.rows, best_of(options.repeat, run, cursor, fetch))
+    conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+import MySQLdb
+
+
+def make_parser(description):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--mysql-host", default="localhost", dest="mysql_host")
+    parser.add_argument("--mysql-user", default="root", dest="mysql_user")
+    parser.add_argument("--mysql-password", default=None, dest="mysql_passwd")
+    parser.add_argument("--mysql-database", default="test_mysqldb",
+        dest="mysql_database")
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser
+
+def connect(options, **kwargs):
+    return MySQLdb.connect(
+        host=options.mysql_host, user=options.mysql_user,
+        passwd=options.mysql_passwd, db=options.mysql_database, **kwargs
+    )
+
+def best_of(repeat, func, *args):
+    # Returns the fastest of `repeat` runs, in seconds.
+    timings = []
+    for i in range(repeat):
+        start = time.time()
+        func(*args)
+        timings.append(time.time() - start)
+    return min(timings)
+
+def report(name, count, seconds, unit="rows"):
+    print("%-30s %12.0f %s/sec" % (name, count / seconds, unit))
@@ -0,0 +1,38 @@
+"""
+Compares rows/sec of fetching a DECIMAL column with each decimal_mode, as
+rows with fetchall() and as columns with fetch_columns().
+"""
+import contextlib
+
+from common import make_parser, connect, best_of, report
+
+
+def run(conn, decimal_mode, fetch):
+    with contextlib.closing(conn.cursor(decimal_mode=decimal_mode)) as cursor:
+        cursor.execute("SELECT * FROM bench_decimals")
+        fetch(cursor)
+
+def main():
+    parser = make_parser(__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    options = parser.parse_args()
+
+    conn = connect(options)
+    with contextlib.closing(conn.cursor()) as cursor:
+        cursor.execute("CREATE TEMPORARY TABLE bench_decimals (a DECIMAL(12, 2), "
+            "b DECIMAL(12, 2))")
+        cursor.executemany(
+            "INSERT INTO bench_decimals (a, b) VALUES (%s, %s)",
+            [("%d.%02d" % (i, i % 100), "-%d.50" % i) for i in range(options.rows)]
+        )
+    for decimal_mode in ["decimal", "float", "scaled"]:
+        for name, fetch in [
+            ("fetchall", lambda cur: cur.fetchall()),
+            ("fetch_columns", lambda cur: cur.fetch_columns()),
+        ]:
+            report("%s %s" % (decimal_mode, name), options.rows,
+                best_of(options.repeat, run, conn, decimal_mode, fetch))
+    conn.close()
+
+if __name__ == "__main__":
+    main()
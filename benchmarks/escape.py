@@ -0,0 +1,63 @@
+"""
+Compares escaping string parameters through mysql_real_escape_string, one
+ctypes call per value, with the translate table based escaping, both for the
+rows of an executemany() INSERT on their own and for the whole INSERT.
+"""
+import contextlib
+
+from common import make_parser, connect, best_of, report
+
+
+def c_escaper(conn):
+    # How every string was escaped before, whatever the session's charset and
+    # sql_mode.
+    c_string_literal = conn._c_string_literal
+    return lambda objs: [c_string_literal(obj) for obj in objs]
+
+def escape_rows(conn, rows, get_escaper):
+    # What executemany() does for each row of an INSERT chunk.
+    with contextlib.closing(conn.cursor()) as cursor:
+        cache = cursor._get_encoder_cache()
+        escape_strings = get_escaper(conn)
+        for row in rows:
+            cursor._escape_data(row, cache, escape_strings)
+
+def insert(conn, rows, get_escaper):
+    conn._string_escaper = lambda: get_escaper(conn)
+    try:
+        with contextlib.closing(conn.cursor()) as cursor:
+            cursor.execute("TRUNCATE TABLE bench_escape")
+            cursor.executemany(
+                "INSERT INTO bench_escape (a, b) VALUES (%s, %s)", rows)
+    finally:
+        del conn._string_escaper
+
+def main():
+    parser = make_parser(__doc__)
+    parser.add_argument("--rows", type=int, default=200000)
+    options = parser.parse_args()
+
+    conn = connect(options)
+    with contextlib.closing(conn.cursor()) as cursor:
+        cursor.execute("CREATE TABLE bench_escape (a VARCHAR(32), "
+            "b VARCHAR(32))")
+    try:
+        rows = [
+            ("user %d's \"name\"" % i, "row %d" % i)
+            for i in range(options.rows)
+        ]
+        for name, func, get_escaper in [
+            ("before: escape rows", escape_rows, c_escaper),
+            ("after: escape rows", escape_rows, type(conn)._string_escaper),
+            ("before: executemany INSERT", insert, c_escaper),
+            ("after: executemany INSERT", insert, type(conn)._string_escaper),
+        ]:
+            report(name, len(rows),
+                best_of(options.repeat, func, conn, rows, get_escaper))
+    finally:
+        with contextlib.closing(conn.cursor()) as cursor:
+            cursor.execute("DROP TABLE bench_escape")
+        conn.close()
+
+if __name__ == "__main__":
+    main()
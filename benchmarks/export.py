@@ -0,0 +1,43 @@
+"""
+Compares rows/sec of fetching a numeric result as tuples with fetchall() and
+as arrays with fetch_numpy() and fetch_arrow(), for whichever of numpy and
+pyarrow are installed.
+"""
+import contextlib
+
+from common import make_parser, connect, best_of, report
+
+from MySQLdb import export
+
+
+def run(cursor, fetch):
+    cursor.execute("SELECT * FROM bench_export")
+    fetch(cursor)
+
+def main():
+    parser = make_parser(__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--batch-size", type=int, default=export.BATCH_SIZE)
+    options = parser.parse_args()
+
+    conn = connect(options)
+    with contextlib.closing(conn.cursor(forward_only=True)) as cursor:
+        cursor.execute("CREATE TEMPORARY TABLE bench_export (a INT, b BIGINT, "
+            "c DOUBLE, d DATETIME)")
+        cursor.executemany(
+            "INSERT INTO bench_export (a, b, c, d) VALUES (%s, %s, %s, %s)",
+            [(i, i * 1000, i / 3.0, "2012-01-01 00:00:00") for i in range(options.rows)]
+        )
+        fetches = [("fetchall", lambda cur: cur.fetchall())]
+        if export.numpy is not None:
+            fetches.append(("fetch_numpy",
+                lambda cur: cur.fetch_numpy(options.batch_size)))
+        if export.pyarrow is not None:
+            fetches.append(("fetch_arrow",
+                lambda cur: cur.fetch_arrow(options.batch_size)))
+        for name, fetch in fetches:
+            report(name, options.rows, best_of(options.repeat, run, cursor, fetch))
+    conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Compares rows/sec of the batched Result fetch loop with the per-row loop it
+replaced (which looked every column up through ctypes POINTER indexing).
+"""
+import contextlib
+import ctypes
+
+from common import make_parser, connect, best_of, report
+
+from MySQLdb import libmysql
+
+
+LEGACY_ROW = ctypes.POINTER(ctypes.POINTER(ctypes.c_char))
+
+def legacy_fetchall(result):
+    # The fetch loop as it was before rows were fetched in batches.
+    rows = []
+    while True:
+        row = libmysql.c.mysql_fetch_row(result._result)
+        if not row:
+            if libmysql.c.mysql_errno(result.connection._db):
+                result.connection._exception()
+            break
+        row = ctypes.cast(row, LEGACY_ROW)
+        n = libmysql.c.mysql_num_fields(result._result)
+        lengths = libmysql.c.mysql_fetch_lengths(result._result)
+        r = [None] * n
+        for i, decoder in enumerate(result.row_decoders):
+            if not row[i]:
+                r[i] = None
+            else:
+                r[i] = decoder(ctypes.string_at(row[i], lengths[i]))
+        rows.append(tuple(r))
+    return rows
+
+def fetch_batches(cursor):
+    while cursor.fetchmany(1000):
+        pass
+
+def run(cursor, fetch):
+    cursor.execute("SELECT * FROM bench_fetch")
+    fetch(cursor)
+
+def main():
+    parser = make_parser(__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    options = parser.parse_args()
+
+    conn = connect(options)
+    with contextlib.closing(conn.cursor()) as cursor:
+        cursor.execute("CREATE TEMPORARY TABLE bench_fetch (a INT, b DOUBLE, "
+            "c VARCHAR(32), d INT, e VARCHAR(32))")
+        cursor.executemany(
+            "INSERT INTO bench_fetch (a, b, c, d, e) VALUES (%s, %s, %s, %s, %s)",
+            [(i, i / 3.0, "row %d" % i, None, "x" * 20) for i in range(options.rows)]
+        )
+        for name, fetch in [
+            ("before: per-row loop", lambda cur: legacy_fetchall(cur._result)),
+            ("after: fetchall", lambda cur: cur.fetchall()),
+            ("after: fetchmany(1000)", fetch_batches),
+        ]:
+            report(name, options.rows, best_of(options.repeat, run, cursor, fetch))
+    conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Compares the peak Python memory and rows/sec of reading a buffered result
+batch by batch with Cursor, which keeps every decoded row, and LazyCursor,
+which leaves the rows in the client library's buffer.
+"""
+import contextlib
+import time
+import tracemalloc
+
+from common import make_parser, connect, report
+
+from MySQLdb.cursors import Cursor, LazyCursor
+
+
+def run(conn, cursor_class):
+    with contextlib.closing(conn.cursor(cursor_class)) as cursor:
+        cursor.execute("SELECT * FROM bench_lazy")
+        while cursor.fetchmany(1000):
+            pass
+
+def main():
+    parser = make_parser(__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    options = parser.parse_args()
+
+    conn = connect(options)
+    with contextlib.closing(conn.cursor()) as cursor:
+        cursor.execute("CREATE TEMPORARY TABLE bench_lazy (a INT, b VARCHAR(100), "
+            "c DOUBLE)")
+        cursor.executemany(
+            "INSERT INTO bench_lazy (a, b, c) VALUES (%s, %s, %s)",
+            [(i, "row %d" % i, i / 3.0) for i in range(options.rows)]
+        )
+    for cursor_class in [Cursor, LazyCursor]:
+        tracemalloc.start()
+        start = time.time()
+        run(conn, cursor_class)
+        seconds = time.time() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        report(cursor_class.__name__, options.rows, seconds)
+        print("%-30s %12.0f KiB peak" % (cursor_class.__name__, peak / 1024.0))
+    conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Compares rows/sec of Connection.load_data with a multi-row INSERT through
+executemany, on the same data.
+"""
+import contextlib
+
+from common import make_parser, connect, best_of, report
+
+
+def insert(conn, rows):
+    with contextlib.closing(conn.cursor()) as cursor:
+        cursor.execute("TRUNCATE TABLE bench_load")
+        cursor.executemany(
+            "INSERT INTO bench_load (a, b, c, d) VALUES (%s, %s, %s, %s)", rows
+        )
+
+def load(conn, rows):
+    with contextlib.closing(conn.cursor()) as cursor:
+        cursor.execute("TRUNCATE TABLE bench_load")
+    conn.load_data("bench_load", iter(rows), ["a", "b", "c", "d"])
+
+def main():
+    parser = make_parser(__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    options = parser.parse_args()
+
+    conn = connect(options, local_infile=True)
+    with contextlib.closing(conn.cursor()) as cursor:
+        cursor.execute("CREATE TABLE bench_load (a INT, b DOUBLE, "
+            "c VARCHAR(32), d INT)")
+    try:
+        rows = [(i, i / 3.0, "row %d" % i, None) for i in range(options.rows)]
+        for name, func in [
+            ("executemany INSERT", insert),
+            ("load_data", load),
+        ]:
+            report(name, options.rows, best_of(options.repeat, func, conn, rows))
+    finally:
+        with contextlib.closing(conn.cursor()) as cursor:
+            cursor.execute("DROP TABLE bench_load")
+        conn.close()
+
+if __name__ == "__main__":
+    main()
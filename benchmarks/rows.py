@@ -0,0 +1,46 @@
+"""
+Compares rows/sec of reading two columns out of a wide result with Cursor,
+DictCursor and LazyRowCursor, which only decodes the columns that are read.
+"""
+import contextlib
+
+from common import make_parser, connect, best_of, report
+
+from MySQLdb.cursors import Cursor, DictCursor, LazyRowCursor
+
+
+COLUMNS = 30
+
+def run(conn, cursor_class, project):
+    with contextlib.closing(conn.cursor(cursor_class)) as cursor:
+        cursor.execute("SELECT * FROM bench_rows")
+        for row in cursor.fetchall():
+            project(row)
+
+def main():
+    parser = make_parser(__doc__)
+    parser.add_argument("--rows", type=int, default=50000)
+    options = parser.parse_args()
+
+    conn = connect(options)
+    names = ["c%d" % i for i in range(COLUMNS)]
+    kinds = ["INT", "DECIMAL(12, 2)", "DATETIME", "VARCHAR(20)"]
+    values = ["1", "12.50", "2012-01-02 03:04:05", "some text"]
+    with contextlib.closing(conn.cursor()) as cursor:
+        cursor.execute("CREATE TEMPORARY TABLE bench_rows (%s)" % ", ".join(
+            "%s %s" % (name, kinds[i % len(kinds)]) for i, name in enumerate(names)))
+        cursor.executemany(
+            "INSERT INTO bench_rows VALUES (%s)" % ", ".join(["%s"] * COLUMNS),
+            [[values[i % len(values)] for i in range(COLUMNS)]] * options.rows
+        )
+    for name, cursor_class, project in [
+        ("Cursor", Cursor, lambda row: (row[0], row[3])),
+        ("DictCursor", DictCursor, lambda row: (row["c0"], row["c3"])),
+        ("LazyRowCursor", LazyRowCursor, lambda row: (row.c0, row.c3)),
+    ]:
+        report(name, options.rows,
+            best_of(options.repeat, run, conn, cursor_class, project))
+    conn.close()
+
+if __name__ == "__main__":
+    main()
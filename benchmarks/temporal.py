@@ -0,0 +1,67 @@
+"""
+Compares values/sec of the DATETIME, DATE and TIME decoders with the ones
+they replaced, and of DATETIME and DATE values repeating through
+interning_decoder().
+"""
+import math
+from datetime import datetime, date, time, timedelta
+
+from common import make_parser, best_of, report
+
+from MySQLdb import converters
+from MySQLdb.constants import field_types
+
+
+def legacy_date_decoder(value):
+    return date(*[int(part) for part in value.split(b"-")])
+
+def legacy_datetime_decoder(value):
+    date_part, time_part = value.split(b" ", 1)
+    return datetime.combine(
+        legacy_date_decoder(date_part),
+        time(*[int(part) for part in time_part.split(b":")])
+    )
+
+def legacy_time_decoder(value):
+    hours, minutes, seconds = value.split(b":")
+    return timedelta(
+        hours = int(hours),
+        minutes = int(minutes),
+        seconds = int(seconds),
+        microseconds = int(math.modf(float(seconds))[0]*1000000),
+    )
+
+def run(decoder, values):
+    for value in values:
+        decoder(value)
+
+def main():
+    parser = make_parser(__doc__)
+    parser.add_argument("--values", type=int, default=100000)
+    parser.add_argument("--distinct", type=int, default=100)
+    options = parser.parse_args()
+
+    datetimes = [
+        ("2012-01-%02d %02d:%02d:%02d" % (i % 28 + 1, i % 24, i % 60, i % 60)).encode()
+        for i in range(options.distinct)
+    ] * (options.values // options.distinct)
+    dates = [value[:10] for value in datetimes]
+    times = [value[11:] for value in datetimes]
+    intern = converters.interning_decoder()
+    interned_datetime = intern(None, (b"", field_types.DATETIME))
+    interned_date = intern(None, (b"", field_types.DATE))
+    for name, decoder, values in [
+        ("legacy datetime", legacy_datetime_decoder, datetimes),
+        ("datetime", converters.datetime_decoder, datetimes),
+        ("interned datetime", interned_datetime, datetimes),
+        ("legacy date", legacy_date_decoder, dates),
+        ("date", converters.date_decoder, dates),
+        ("interned date", interned_date, dates),
+        ("legacy time", legacy_time_decoder, times),
+        ("time", converters.time_decoder, times),
+    ]:
+        report(name, len(values), best_of(options.repeat, run, decoder, values),
+            "values")
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,8 @@
+import asyncio
+
 import MySQLdb
+from MySQLdb import aio
+from MySQLdb.pool import ConnectionPool
 
 
 def pytest_addoption(parser):
@@ -39,4 +43,47 @@ def pytest_funcarg__connection(request):
             conn.close()
 
     request.addfinalizer(close_conn)
-    return conn
\ No newline at end of file
+    return conn
+
+def pytest_funcarg__pool(request):
+    option = request.config.option
+    extra_kwargs = {}
+    if hasattr(request.function, "pool_opts"):
+        extra_kwargs = request.function.pool_opts.kwargs.copy()
+    pool = ConnectionPool(
+        host=option.mysql_host, user=option.mysql_user,
+        passwd=option.mysql_passwd, db=option.mysql_database, **extra_kwargs
+    )
+    request.addfinalizer(pool.close)
+    return pool
+
+def pytest_funcarg__loop(request):
+    loop = asyncio.new_event_loop()
+    request.addfinalizer(loop.close)
+    return loop
+
+def pytest_funcarg__async_connection(request):
+    option = request.config.option
+    loop = request.getfuncargvalue("loop")
+    extra_kwargs = {}
+    if hasattr(request.function, "connect_opts"):
+        extra_kwargs = request.function.connect_opts.kwargs.copy()
+    conn = loop.run_until_complete(aio.connect(
+        host=option.mysql_host, user=option.mysql_user,
+        passwd=option.mysql_passwd, db=option.mysql_database, loop=loop,
+        **extra_kwargs
+    ))
+
+    def close_conn():
+        if not conn.closed:
+            loop.run_until_complete(conn.close())
+
+    request.addfinalizer(close_conn)
+    return conn
+
+def pytest_funcarg__connect_kwargs(request):
+    option = request.config.option
+    return {
+        "host": option.mysql_host, "user": option.mysql_user,
+        "passwd": option.mysql_passwd, "db": option.mysql_database,
+    }
@@ -0,0 +1,165 @@
+import asyncio
+
+import py
+
+from MySQLdb import aio, libmysql
+
+
+class TestAsyncConnection(object):
+    def test_execute(self, loop, async_connection):
+        async def run():
+            async with async_connection.cursor() as cursor:
+                await cursor.execute("SELECT %s, %s", (1, "a"))
+                assert cursor.description[0][0] == b"1"
+                return await cursor.fetchall()
+        assert loop.run_until_complete(run()) == [(1, "a")]
+
+    def test_iterate(self, loop, async_connection):
+        async def run():
+            async with async_connection.cursor() as cursor:
+                await cursor.execute("SELECT 1 UNION ALL SELECT 2 UNION ALL "
+                    "SELECT 3")
+                first = await cursor.fetchone()
+                return [first] + [row async for row in cursor]
+        assert loop.run_until_complete(run()) == [(1,), (2,), (3,)]
+
+    def test_fetchmany(self, loop, async_connection):
+        async def run():
+            async with async_connection.cursor() as cursor:
+                await cursor.execute("SELECT 1 UNION ALL SELECT 2 UNION ALL "
+                    "SELECT 3")
+                return await cursor.fetchmany(2), await cursor.fetchmany(2)
+        assert loop.run_until_complete(run()) == ([(1,), (2,)], [(3,)])
+
+    def test_concurrent(self, loop, async_connection):
+        # Queries sleeping on the worker thread don't block the loop.
+        async def tick(ticks):
+            for i in range(5):
+                ticks.append(i)
+                await asyncio.sleep(0.01)
+
+        async def run():
+            ticks = []
+            async with async_connection.cursor() as cursor:
+                await asyncio.gather(cursor.execute("SELECT SLEEP(0.2)"),
+                    tick(ticks))
+            return ticks
+        assert loop.run_until_complete(run()) == [0, 1, 2, 3, 4]
+
+    def test_shared_executor(self, loop, async_connection):
+        async def run():
+            # Calls from several coroutines are made one after the other,
+            # on the pool of threads all connections share.
+            async with async_connection.cursor() as first:
+                async with async_connection.cursor() as second:
+                    await asyncio.gather(first.execute("SELECT SLEEP(0.1), 1"),
+                        second.execute("SELECT 2"))
+                    return await first.fetchall(), await second.fetchall()
+        assert async_connection._executor is aio.get_executor()
+        assert loop.run_until_complete(run()) == ([(0, 1)], [(2,)])
+
+    def test_executemany(self, loop, async_connection):
+        async def run():
+            async with async_connection.cursor() as cursor:
+                await cursor.execute("CREATE TEMPORARY TABLE things (a INT)")
+                return await cursor.executemany(
+                    "INSERT INTO things (a) VALUES (%s)", [(1,), (2,)])
+        assert loop.run_until_complete(run()) == 2
+
+    def test_error(self, loop, async_connection):
+        async def run():
+            async with async_connection.cursor() as cursor:
+                try:
+                    await cursor.execute("SELECT * FROM nonexistent_table")
+                except async_connection.connection.ProgrammingError:
+                    return True
+        assert loop.run_until_complete(run())
+
+    def test_close(self, loop, async_connection):
+        loop.run_until_complete(async_connection.close())
+        assert async_connection.closed
+
+
+@py.test.mark.skipif("not libmysql.HAS_NONBLOCKING")
+class TestNonBlockingConnection(object):
+    @py.test.mark.connect_opts(nonblocking=True, sql_mode="ANSI")
+    def test_execute(self, loop, async_connection):
+        async def run():
+            async with async_connection.cursor() as cursor:
+                await cursor.execute("SELECT %s, @@sql_mode LIKE '%%ANSI%%'",
+                    ("a",))
+                return await cursor.fetchall()
+        assert loop.run_until_complete(run()) == [("a", 1)]
+
+    @py.test.mark.connect_opts(nonblocking=True)
+    def test_concurrent(self, loop, async_connection):
+        async def tick(ticks):
+            for i in range(5):
+                ticks.append(i)
+                await asyncio.sleep(0.01)
+
+        async def run():
+            ticks = []
+            async with async_connection.cursor() as cursor:
+                await asyncio.gather(cursor.execute("SELECT SLEEP(0.2)"),
+                    tick(ticks))
+            return ticks
+        assert loop.run_until_complete(run()) == [0, 1, 2, 3, 4]
+
+    @py.test.mark.connect_opts(nonblocking=True)
+    def test_shared_connection(self, loop, async_connection):
+        # Queries from several coroutines on one connection wait their turn
+        # rather than interleaving on the wire.
+        async def query(i):
+            async with async_connection.cursor() as cursor:
+                await cursor.execute("SELECT SLEEP(0.01), %s", (i,))
+                return await cursor.fetchall()
+
+        async def run():
+            return await asyncio.gather(async_connection.ping(),
+                *[query(i) for i in range(5)])
+        assert loop.run_until_complete(run())[1:] == [[(0, i)] for i in range(5)]
+
+    @py.test.mark.connect_opts(nonblocking=True)
+    def test_close(self, loop, async_connection):
+        loop.run_until_complete(async_connection.close())
+        assert async_connection.closed
+
+    @py.test.mark.connect_opts(nonblocking=True)
+    def test_connect_args_cleared(self, loop, async_connection):
+        # The password isn't kept around once the connection is made.
+        assert async_connection.connection._connect_args is None
+
+    @py.test.mark.connect_opts(nonblocking=True)
+    def test_cancel(self, loop, async_connection):
+        # A call that's given up on closes the connection without waiting
+        # on the server.
+        async def run():
+            async with async_connection.cursor() as cursor:
+                await asyncio.wait_for(cursor.execute("SELECT SLEEP(10)"), 0.1)
+        start = loop.time()
+        with py.test.raises(asyncio.TimeoutError):
+            loop.run_until_complete(run())
+        assert loop.time() - start < 5
+        assert async_connection.closed
+
+    @py.test.mark.connect_opts(nonblocking=True)
+    def test_transaction(self, loop, async_connection):
+        async def run():
+            await async_connection.ping()
+            async with async_connection.cursor() as cursor:
+                await cursor.execute("SELECT @@autocommit")
+                assert await cursor.fetchall() == [(0,)]
+                await async_connection.autocommit(True)
+                await cursor.execute("SELECT @@autocommit")
+                assert await cursor.fetchall() == [(1,)]
+            await async_connection.commit()
+        loop.run_until_complete(run())
+
+    @py.test.mark.connect_opts(nonblocking=True)
+    def test_error(self, loop, async_connection):
+        async def run():
+            async with async_connection.cursor() as cursor:
+                await cursor.execute("SELECT * FROM nonexistent_table")
+        with py.test.raises(async_connection.connection.ProgrammingError):
+            loop.run_until_complete(run())
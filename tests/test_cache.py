@@ -0,0 +1,42 @@
+from MySQLdb.cache import EncoderCache, LRUCache
+
+
+class TestLRUCache(object):
+    def test_evicts_least_recently_used(self):
+        evicted = []
+        cache = LRUCache(2, on_evict=evicted.append)
+        cache["a"] = 1
+        cache["b"] = 2
+        assert cache.get("a") == 1
+        cache["c"] = 3
+        assert evicted == [2]
+        assert "b" not in cache
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert len(cache) == 2
+
+    def test_clear(self):
+        evicted = []
+        cache = LRUCache(2, on_evict=evicted.append)
+        cache["a"] = 1
+        cache.clear()
+        assert evicted == [1]
+        assert cache.get("a") is None
+
+    def test_disabled(self):
+        evicted = []
+        cache = LRUCache(0, on_evict=evicted.append)
+        cache["a"] = 1
+        assert evicted == [1]
+        assert len(cache) == 0
+
+
+class TestEncoderCache(object):
+    def test_chain_changed_in_place(self):
+        cache = EncoderCache()
+        chain = [str, repr]
+        types = cache.get(chain)
+        types[int] = str
+        assert cache.get(chain) is types
+        chain.insert(0, ascii)
+        assert cache.get(chain) == {}
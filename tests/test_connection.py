@@ -1,4 +1,5 @@
 import contextlib
+import io
 
 import py
 
@@ -25,6 +26,109 @@ class TestConnection(BaseMySQLTests):
     def test_string_literal(self, connection):
         assert connection.string_literal(3) == "'3'"
 
+    def test_string_literal_escaping(self, connection):
+        value = "a\x00b\n\r'\"\\\x1a"
+        expected = connection._c_string_literal(value)
+        assert connection.string_literal(value) == expected
+        assert connection.string_literal(value.encode("utf-8")) == expected
+        assert connection.string_literals([value, 3]) == [expected, "'3'"]
+
+    @py.test.mark.connect_opts(sql_mode="NO_BACKSLASH_ESCAPES")
+    def test_string_literal_no_backslash_escapes(self, connection):
+        assert connection._get_escape_table() is None
+
+    @py.test.mark.connect_opts(sql_mode="NO_BACKSLASH_ESCAPES")
+    def test_executemany_no_backslash_escapes(self, connection):
+        values = [("a'b\\\\",), ("\\\\'",)]
+        with self.create_table(connection, "things", a="VARCHAR(10)"):
+            with contextlib.closing(connection.cursor()) as cur:
+                cur.executemany("INSERT INTO things (a) VALUES (%s)", values)
+                cur.execute("SELECT a FROM things")
+                assert sorted(cur.fetchall()) == sorted(values)
+
+    def assert_backslashes_not_escaped(self, connection):
+        assert connection._get_escape_table() is None
+        assert connection.string_literals(["a'b\\"]) == ["'a''b\\'"]
+
+    def test_escape_table_after_set(self, connection):
+        assert connection._get_escape_table() is not None
+        with contextlib.closing(connection.cursor()) as cur:
+            cur.execute("/* mode */ SET SESSION sql_mode='NO_BACKSLASH_ESCAPES'")
+        self.assert_backslashes_not_escaped(connection)
+
+    def test_escape_table_after_versioned_comment(self, connection):
+        assert connection._get_escape_table() is not None
+        with contextlib.closing(connection.cursor()) as cur:
+            cur.execute("/*!40101 SET SESSION sql_mode='NO_BACKSLASH_ESCAPES' */")
+        self.assert_backslashes_not_escaped(connection)
+
+    def test_escape_table_after_call(self, connection):
+        assert connection._get_escape_table() is not None
+        with contextlib.closing(connection.cursor()) as cur:
+            cur.execute("CREATE PROCEDURE test_mode () "
+                "SET SESSION sql_mode='NO_BACKSLASH_ESCAPES'")
+            try:
+                cur.execute("CALL test_mode()")
+                self.assert_backslashes_not_escaped(connection)
+            finally:
+                cur.execute("DROP PROCEDURE test_mode")
+
+    def test_escape_table_after_execute(self, connection):
+        assert connection._get_escape_table() is not None
+        with contextlib.closing(connection.cursor()) as cur:
+            cur.execute("PREPARE test_mode FROM "
+                "'SET SESSION sql_mode=''NO_BACKSLASH_ESCAPES'''")
+            cur.execute("EXECUTE test_mode")
+            cur.execute("DEALLOCATE PREPARE test_mode")
+        self.assert_backslashes_not_escaped(connection)
+
+    def test_escape_table_after_set_names(self, connection):
+        assert connection._get_escape_table() is not None
+        with contextlib.closing(connection.cursor()) as cur:
+            cur.execute("/*!40101 SET NAMES sjis */")
+        # Escaped just as libmysqlclient escapes it for the session.
+        value = "ソ'"
+        assert connection.string_literals([value]) == [
+            connection._c_string_literal(value)]
+
+    @py.test.mark.connect_opts(local_infile=True)
+    def test_load_data(self, connection):
+        rows = [(i, "row\t%d\n\\" % i) for i in range(1000)] + [(None, None)]
+        with self.create_table(connection, "things", a="INT", b="VARCHAR(20)"):
+            assert connection.load_data("things", iter(rows), ["a", "b"]) == len(rows)
+            assert connection.load_data("things", io.BytesIO(b"7\tx\n"),
+                ["a", "b"]) == 1
+            with contextlib.closing(connection.cursor()) as cursor:
+                cursor.execute("SELECT a, b FROM things")
+                assert cursor.fetchall() == rows + [(7, "x")]
+
+    @py.test.mark.connect_opts(local_infile=True)
+    def test_load_data_error(self, connection):
+        def rows():
+            yield (1,)
+            raise ValueError
+        with self.create_table(connection, "things", a="INT"):
+            with py.test.raises(ValueError):
+                connection.load_data("things", rows())
+
+    def test_load_data_not_enabled(self, connection):
+        with py.test.raises(connection.NotSupportedError):
+            connection.load_data("things", [])
+
+    def test_ping(self, connection):
+        connection.ping()
+        connection.close()
+        with py.test.raises(connection.InterfaceError):
+            connection.ping()
+
+    @py.test.mark.connect_opts(sql_mode="ANSI")
+    def test_reset(self, connection):
+        with contextlib.closing(connection.cursor()) as cursor:
+            cursor.execute("SET @a = 1")
+            connection.reset()
+            cursor.execute("SELECT @@sql_mode LIKE '%%ANSI%%', @@autocommit")
+            assert cursor.fetchall() == [(1, 0)]
+
     @py.test.mark.connect_opts(sql_mode="ANSI")
     def test_sql_mode(self, connection):
         with self.create_table(connection, "people", age="INT"):
@@ -0,0 +1,59 @@
+import datetime
+import decimal
+
+import py
+
+from MySQLdb import converters
+from MySQLdb.constants import field_types
+
+
+class TestDecoders(object):
+    def test_datetime(self):
+        assert converters.datetime_decoder(b"2012-01-02 03:04:05") == \
+            datetime.datetime(2012, 1, 2, 3, 4, 5)
+        assert converters.datetime_decoder(b"2012-01-02 03:04:05.123456") == \
+            datetime.datetime(2012, 1, 2, 3, 4, 5, 123456)
+        # DATETIME(1), (2), (4) and (5) columns.
+        assert converters.datetime_decoder(b"2012-01-02 03:04:05.1") == \
+            datetime.datetime(2012, 1, 2, 3, 4, 5, 100000)
+        assert converters.datetime_decoder(b"2012-01-02 03:04:05.12345") == \
+            datetime.datetime(2012, 1, 2, 3, 4, 5, 123450)
+
+    def test_date(self):
+        assert converters.date_decoder(b"2012-01-02") == datetime.date(2012, 1, 2)
+
+    def test_time(self):
+        assert converters.time_decoder(b"12:20:02") == \
+            datetime.timedelta(hours=12, minutes=20, seconds=2)
+        assert converters.time_decoder(b"838:59:59.5") == \
+            datetime.timedelta(hours=838, minutes=59, seconds=59.5)
+        assert converters.time_decoder(b"-01:30:00") == \
+            -datetime.timedelta(hours=1, minutes=30)
+        assert converters.time_decoder(b"-00:00:00.000001") == \
+            -datetime.timedelta(microseconds=1)
+
+    def test_interning(self):
+        decoder = converters.interning_decoder(maxsize=2)
+        assert decoder(None, (b"a", field_types.VAR_STRING)) is None
+        date_decoder = decoder(None, (b"a", field_types.DATE))
+        value = date_decoder(b"2012-01-02")
+        assert value == datetime.date(2012, 1, 2)
+        assert date_decoder(b"2012-01-02") is value
+
+    def test_decimal(self):
+        assert converters.decimal_decoder(b"-12.50") == decimal.Decimal("-12.50")
+        assert converters.scaled_decoder(b"-12.50") == -1250
+        assert converters.scaled_decoder(b"0.01") == 1
+
+    def test_decimal_mode(self):
+        field = (b"a", field_types.NEWDECIMAL)
+        assert converters.decimal_mode_decoder("float")(None, field) is float
+        assert converters.decimal_mode_decoder("scaled")(None, (b"a", field_types.LONG)) is None
+        decoder = converters.decimal_mode_decoder(decimal.Context(prec=3))(None, field)
+        assert decoder(b"1.2345") == decimal.Decimal("1.23")
+        assert (converters.decimal_mode_decoder(decimal.Context(prec=3)) is
+            converters.decimal_mode_decoder(decimal.Context(prec=3)))
+        assert (converters.decimal_mode_decoder(decimal.Context(prec=3)) is not
+            converters.decimal_mode_decoder(decimal.Context(prec=4)))
+        with py.test.raises(ValueError):
+            converters.decimal_mode_decoder("fixed")
@@ -1,12 +1,18 @@
 # -*- coding: utf-8 -*-
 
+import array
 import contextlib
 import datetime
+import decimal
+import gc
+import pickle
 import warnings
+import weakref
 
 import py
 
-from MySQLdb.cursors import DictCursor
+from MySQLdb.cursors import (DictCursor, LazyCursor, LazyRowCursor, SSCursor,
+    SSDictCursor)
 from MySQLdb.constants import CLIENT
 
 from .base import BaseMySQLTests
@@ -52,6 +58,56 @@ class TestCursor(BaseMySQLTests):
                 with py.test.raises(StopIteration):
                     next(x)
 
+    def test_forward_only(self, connection):
+        with self.create_table(connection, "users", uid="INT"):
+            with contextlib.closing(connection.cursor(forward_only=True)) as cur:
+                cur.executemany("INSERT INTO users (uid) VALUES (%s)", [(i,) for i in range(5)])
+                cur.execute("SELECT * FROM users ORDER BY uid")
+                assert cur.fetchone() == (0,)
+                assert cur.fetchmany(2) == [(1,), (2,)]
+                assert list(cur) == [(3,), (4,)]
+                assert cur.fetchall() == []
+                assert cur._result.rows == []
+
+    def test_row_builder_reused(self, connection):
+        # BLOB columns are decoded by bytes, which the builder skips.
+        with self.create_table(connection, "things", data="BLOB"):
+            with contextlib.closing(connection.cursor()) as cur:
+                cur.executemany("INSERT INTO things (data) VALUES (%s)",
+                    [(b"b",), (b"d",)])
+                cur.execute("SELECT 1, 'a', NULL, data FROM things WHERE data = 'b'")
+                build_row = cur._result._build_row
+                assert cur.fetchall() == [(1, "a", None, b"b")]
+                cur.execute("SELECT 2, 'c', NULL, data FROM things WHERE data = 'd'")
+                assert cur._result._build_row is build_row
+                assert cur.fetchall() == [(2, "c", None, b"d")]
+
+    def test_result_plan_cached(self, connection):
+        with self.create_table(connection, "people", uid="INT"):
+            with contextlib.closing(connection.cursor()) as cur:
+                cur.execute("SELECT uid FROM people")
+                decoders = cur._result.row_decoders
+                cur.execute("SELECT uid FROM people")
+                assert cur._result.row_decoders is decoders
+                assert cur.description[0][0] == b"uid"
+                cur.execute("SELECT uid AS other FROM people")
+                assert cur._result.row_decoders is not decoders
+                assert cur.description[0][0] == b"other"
+
+    def test_encoder_cache_invalidated(self, connection):
+        def int_encoder(obj):
+            if type(obj) is int:
+                return lambda connection, obj: "42"
+        with contextlib.closing(connection.cursor()) as cur:
+            cur.execute("SELECT %s", (3,))
+            assert cur.fetchall() == [(3,)]
+            cur.encoders.insert(0, int_encoder)
+            cur.execute("SELECT %s", (3,))
+            assert cur.fetchall() == [(42,)]
+        with contextlib.closing(connection.cursor()) as cur:
+            cur.execute("SELECT %s", (3,))
+            assert cur.fetchall() == [(3,)]
+
     def test_lastrowid(self, connection):
         with self.create_table(connection, "users", uid="INT NOT NULL AUTO_INCREMENT", primary_key="uid"):
             with contextlib.closing(connection.cursor()) as cur:
@@ -190,6 +246,253 @@ class TestCursor(BaseMySQLTests):
                 r = cursor.executemany("INSERT INTO people (uid) VALUES (%s)", [(1,), (2,)])
                 assert r == 2
 
+    @py.test.mark.connect_opts(max_statement_size=200)
+    def test_executemany_chunked(self, connection):
+        with self.create_table(connection, "people", uid="INT"):
+            with contextlib.closing(connection.cursor()) as cursor:
+                r = cursor.executemany("INSERT INTO people (uid) VALUES (%s)", [(i,) for i in range(100)])
+                assert r == 100
+                assert cursor.rowcount == 100
+                cursor.execute("SELECT COUNT(*), MAX(uid) FROM people")
+                assert cursor.fetchall() == [(100, 99)]
+
+    @py.test.mark.connect_opts(multi_statement_batch=3)
+    def test_executemany_multi_statement_batch(self, connection):
+        with self.create_table(connection, "people", uid="INT", age="INT"):
+            with contextlib.closing(connection.cursor()) as cursor:
+                cursor.executemany("INSERT INTO people (uid, age) VALUES (%s, %s)", [(i, 0) for i in range(10)])
+                r = cursor.executemany("UPDATE people SET age = %s WHERE uid = %s", [(i * 2, i) for i in range(10)])
+                assert r == 9
+                cursor.execute("SELECT uid, age FROM people ORDER BY uid")
+                assert cursor.fetchall() == [(i, i * 2) for i in range(10)]
+
+    @py.test.mark.connect_opts(multi_statement_batch=3)
+    def test_executemany_multi_statement_batch_error(self, connection):
+        with self.create_table(connection, "people", uid="INT", primary_key="uid"):
+            with contextlib.closing(connection.cursor()) as cursor:
+                cursor.executemany("INSERT INTO people (uid) VALUES (%s)", [(i,) for i in range(5)])
+                with py.test.raises(connection.IntegrityError) as exc:
+                    cursor.executemany("UPDATE people SET uid = %s WHERE uid = %s", [(10, 0), (11, 1), (12, 2), (3, 4)])
+                assert exc.value.batch_index == 3
+                cursor.execute("SELECT uid FROM people ORDER BY uid")
+                assert cursor.fetchall() == [(3,), (4,), (10,), (11,), (12,)]
+
+    def test_fetch_columns_no_result_set(self, connection):
+        with contextlib.closing(connection.cursor()) as cursor:
+            cursor.execute("DO 1")
+            assert cursor.fetch_columns() is None
+            assert list(cursor.fetch_column_batches()) == []
+
+    def test_fetch_columns(self, connection):
+        with self.create_table(connection, "things", a="INT", b="BIGINT UNSIGNED",
+            c="DOUBLE", d="VARCHAR(10)"):
+            with contextlib.closing(connection.cursor()) as cursor:
+                cursor.executemany("INSERT INTO things (a, b, c, d) VALUES (%s, %s, %s, %s)", [
+                    (i, 2 ** 64 - 1 - i, i / 2.0, None if i % 3 else str(i))
+                    for i in range(10)
+                ] + [(None, None, None, None)])
+                cursor.execute("SELECT a, b, c, d FROM things ORDER BY a IS NULL, a")
+                assert cursor.fetchone() == (0, 2 ** 64 - 1, 0.0, "0")
+                batch = cursor.fetch_columns()
+                assert len(batch) == 10
+                assert batch.names == ["a", "b", "c", "d"]
+                assert batch.columns[0] == array.array("q", list(range(1, 10)) + [0])
+                assert batch.columns[1].typecode == "Q"
+                assert batch.column("c")[:2] == array.array("d", [0.5, 1.0])
+                assert batch.column("d")[:3] == [None, None, "3"]
+                assert [batch.is_valid(0, i) for i in range(8, 10)] == [True, False]
+                assert [batch.is_valid(3, i) for i in range(3)] == [False, False, True]
+                assert cursor.fetchall() == []
+
+    def test_fetch_column_batches(self, connection):
+        with contextlib.closing(connection.cursor()) as cursor:
+            cursor.execute("SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3")
+            batches = list(cursor.fetch_column_batches(2))
+            assert [list(batch.columns[0]) for batch in batches] == [[1, 2], [3]]
+
+    def test_decimal_mode(self, connection):
+        with self.create_table(connection, "things", a="DECIMAL(10, 2)"):
+            with contextlib.closing(connection.cursor()) as cursor:
+                cursor.executemany("INSERT INTO things (a) VALUES (%s)",
+                    [("-12.50",), (None,), ("0.01",)])
+                cursor.execute("SELECT a FROM things")
+                assert cursor.fetchall() == [(decimal.Decimal("-12.50"),), (None,),
+                    (decimal.Decimal("0.01"),)]
+            with contextlib.closing(connection.cursor(decimal_mode="float")) as cursor:
+                cursor.execute("SELECT a FROM things")
+                assert cursor.fetchall() == [(-12.5,), (None,), (0.01,)]
+            with contextlib.closing(connection.cursor(decimal_mode="scaled")) as cursor:
+                cursor.execute("SELECT a FROM things")
+                assert cursor.description[0].scale == 2
+                batch = cursor.fetch_columns()
+                assert batch.columns[0] == array.array("q", [-1250, 0, 1])
+                assert not batch.is_valid(0, 1)
+
+    def test_decimal_mode_scaled_boundary(self, connection):
+        # DECIMAL(18, 0) has the most digits that always fit in 64 bits.
+        big = [(-10 ** 18 + 1, -10 ** 19 + 1), (10 ** 18 - 1, 10 ** 19 - 1)]
+        with self.create_table(connection, "things", a="DECIMAL(18, 0)",
+            b="DECIMAL(19, 0)"):
+            with contextlib.closing(connection.cursor()) as cursor:
+                cursor.executemany("INSERT INTO things (a, b) VALUES (%s, %s)",
+                    [(str(a), str(b)) for a, b in big])
+            with contextlib.closing(connection.cursor(decimal_mode="scaled")) as cursor:
+                cursor.execute("SELECT a, b FROM things ORDER BY a")
+                batch = cursor.fetch_columns()
+                assert batch.columns[0] == array.array("q", [a for a, b in big])
+                assert batch.columns[1] == [b for a, b in big]
+
+    def test_fetch_numpy(self, connection):
+        numpy = py.test.importorskip("numpy")
+        with self.create_table(connection, "things", a="INT", b="BIGINT UNSIGNED",
+            c="DOUBLE", d="DATETIME(6)", e="VARCHAR(10)"):
+            with contextlib.closing(connection.cursor()) as cursor:
+                cursor.executemany("INSERT INTO things (a, b, c, d, e) VALUES (%s, %s, %s, %s, %s)", [
+                    (1, 2 ** 64 - 1, 0.5, datetime.datetime(2012, 1, 2, 3, 4, 5, 6), "x"),
+                    (None, None, None, None, None),
+                ])
+                cursor.execute("SELECT a, b, c, d, e FROM things ORDER BY a IS NULL")
+                data = cursor.fetch_numpy(batch_size=1)
+                assert data.dtype.names == ("a", "b", "c", "d", "e")
+                assert data.dtype["a"] == numpy.int64
+                assert data.dtype["b"] == numpy.uint64
+                assert data["b"][0] == 2 ** 64 - 1
+                assert data["c"][0] == 0.5
+                assert data["d"][0] == numpy.datetime64("2012-01-02T03:04:05.000006")
+                assert data["e"][0] == "x"
+                assert list(data.mask[1]) == [True] * 5
+                assert cursor.fetchall() == []
+
+    def test_fetch_arrow(self, connection):
+        pyarrow = py.test.importorskip("pyarrow")
+        with self.create_table(connection, "things", a="INT", b="DECIMAL(10, 2)",
+            c="DATE", d="TEXT", e="BLOB"):
+            with contextlib.closing(connection.cursor()) as cursor:
+                cursor.executemany("INSERT INTO things (a, b, c, d, e) VALUES (%s, %s, %s, %s, %s)", [
+                    (i, "%d.25" % i, datetime.date(2012, 1, i + 1), "é", b"\xff")
+                    for i in range(3)
+                ] + [(None, None, None, None, None)])
+                cursor.execute("SELECT a, b, c, d, e FROM things ORDER BY a IS NULL, a")
+                table = cursor.fetch_arrow(batch_size=2)
+                assert table.schema.types == [pyarrow.int64(),
+                    pyarrow.decimal128(10, 2), pyarrow.date32(), pyarrow.string(),
+                    pyarrow.binary()]
+                assert table.num_rows == 4
+                assert table.column("a").to_pylist() == [0, 1, 2, None]
+                assert table.column("c").to_pylist()[1] == datetime.date(2012, 1, 2)
+                assert table.column("d").to_pylist()[0] == "é"
+                assert table.column("e").to_pylist()[0] == b"\xff"
+
+                cursor.execute("SELECT a FROM things")
+                batches = list(cursor.fetch_arrow_batches(3))
+                assert [batch.num_rows for batch in batches] == [3, 1]
+
+    def test_scroll(self, connection):
+        with contextlib.closing(connection.cursor()) as cursor:
+            cursor.execute("SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3")
+            assert cursor.rownumber == 0
+            cursor.scroll(2)
+            assert cursor.rownumber == 2
+            assert cursor.fetchone() == (3,)
+            cursor.scroll(-2)
+            assert cursor.fetchone() == (2,)
+            cursor.scroll(0, "absolute")
+            assert cursor.fetchall() == [(1,), (2,), (3,)]
+            with py.test.raises(IndexError):
+                cursor.scroll(1)
+            with py.test.raises(IndexError):
+                cursor.scroll(-1, "absolute")
+
+    def test_scroll_forward_only(self, connection):
+        with contextlib.closing(connection.cursor(forward_only=True)) as cursor:
+            cursor.execute("SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3")
+            cursor.scroll(1)
+            assert cursor.fetchone() == (2,)
+            with py.test.raises(connection.NotSupportedError):
+                cursor.scroll(-1)
+
+    def test_blob_views(self, connection):
+        with self.create_table(connection, "things", a="BLOB", b="TEXT"):
+            with contextlib.closing(connection.cursor()) as cursor:
+                cursor.executemany("INSERT INTO things (a, b) VALUES (%s, %s)",
+                    [(b"\x00" * 1000, "x"), (None, None), (b"", "")])
+            cursor = connection.cursor(blob_views=True)
+            cursor.execute("SELECT a, b FROM things")
+            rows = cursor.fetchall()
+            view = rows[0][0]
+            assert isinstance(view, memoryview)
+            assert view.readonly
+            assert view.tobytes() == b"\x00" * 1000
+            assert rows[0][1].tobytes() == b"x"
+            assert rows[1] == (None, None)
+            assert len(rows[2][0]) == 0
+            part = view[:10]
+            # A view with a buffer still exported can't be released.
+            exported = rows[0][1]
+            buf = pickle.PickleBuffer(exported)
+            cursor.close()
+            with py.test.raises(ValueError):
+                view.tobytes()
+            # Views sliced off before then stay usable.
+            assert part.tobytes() == b"\x00" * 10
+            assert exported.tobytes() == b"x"
+            assert buf.raw().tobytes() == b"x"
+            # And the views after it are still released.
+            with py.test.raises(ValueError):
+                rows[2][1].tobytes()
+
+    def test_execute_multi(self, connection):
+        with contextlib.closing(connection.cursor()) as cursor:
+            cursor.execute_multi(["SELECT 1", ("SELECT %s", ("a",)), "DO 1",
+                "SELECT 2 UNION ALL SELECT 3"])
+            assert cursor.fetchall() == [(1,)]
+            assert cursor.nextset()
+            assert cursor.fetchall() == [("a",)]
+            assert cursor.nextset()
+            assert cursor.description is None
+            assert cursor.nextset()
+            assert cursor.fetchall() == [(2,), (3,)]
+            assert cursor.nextset() is None
+            # Multiple statements are only allowed for execute_multi().
+            with py.test.raises(connection.ProgrammingError):
+                cursor.execute("SELECT 1; SELECT 2")
+
+    def test_execute_multi_error(self, connection):
+        with contextlib.closing(connection.cursor()) as cursor:
+            cursor.execute_multi(["SELECT 1", "SELECT * FROM nonexistent_table",
+                "SELECT 2"])
+            assert cursor.fetchall() == [(1,)]
+            with py.test.raises(connection.ProgrammingError):
+                cursor.nextset()
+            cursor.execute("SELECT 3")
+            assert cursor.fetchall() == [(3,)]
+
+    def test_execute_multi_pending(self, connection):
+        with contextlib.closing(connection.cursor()) as cursor:
+            cursor.execute_multi(["SELECT 1", "SELECT 2"])
+            with contextlib.closing(connection.cursor()) as cursor2:
+                with py.test.raises(connection.ProgrammingError):
+                    cursor2.execute("SELECT 3")
+                # Running another query reads the rest of the result sets.
+                cursor.execute("SELECT 4")
+                cursor2.execute("SELECT 3")
+                assert cursor2.fetchall() == [(3,)]
+
+    def test_callproc(self, connection):
+        with contextlib.closing(connection.cursor()) as cursor:
+            cursor.execute("CREATE PROCEDURE test_proc (IN a INT, OUT b INT) "
+                "BEGIN SELECT a; SELECT a + 1; SET b = a * 2; END")
+            try:
+                assert cursor.callproc("test_proc", (3, None)) == (3, None)
+                assert cursor.fetchall() == [(3,)]
+                assert cursor.nextset()
+                assert cursor.fetchall() == [(4,)]
+                assert cursor.nextset() is None
+                cursor.execute("SELECT @_test_proc_1")
+                assert cursor.fetchall() == [(6,)]
+            finally:
+                cursor.execute("DROP PROCEDURE test_proc")
+
     def test_unicode(self, connection):
         with self.create_table(connection, "snippets", content="TEXT"):
             with contextlib.closing(connection.cursor()) as cursor:
@@ -236,3 +539,173 @@ class TestDictCursor(BaseMySQLTests):
                 assert row == {"country": "Italy"}
                 row = cur.fetchone()
                 assert row is None
+
+
+class TestSSCursor(BaseMySQLTests):
+    def test_fetch(self, connection):
+        with self.create_table(connection, "users", uid="INT"):
+            with contextlib.closing(connection.cursor()) as cur:
+                cur.executemany("INSERT INTO users (uid) VALUES (%s)", [(i,) for i in range(10)])
+            with contextlib.closing(connection.cursor(SSCursor)) as cur:
+                cur.execute("SELECT * FROM users ORDER BY uid")
+                assert cur.rowcount == -1
+                assert cur.fetchone() == (0,)
+                assert cur.fetchmany(2) == [(1,), (2,)]
+                assert list(cur) == [(i,) for i in range(3, 10)]
+                assert cur.fetchall() == []
+
+    def test_connection_busy(self, connection):
+        with self.create_table(connection, "users", uid="INT"):
+            with contextlib.closing(connection.cursor()) as cur:
+                cur.executemany("INSERT INTO users (uid) VALUES (%s)", [(i,) for i in range(3)])
+            with contextlib.closing(connection.cursor(SSCursor)) as cur:
+                cur.execute("SELECT * FROM users ORDER BY uid")
+                cur.fetchone()
+                with contextlib.closing(connection.cursor()) as other:
+                    with py.test.raises(connection.ProgrammingError):
+                        other.execute("SELECT 1")
+                    with py.test.raises(connection.ProgrammingError):
+                        connection.commit()
+                    cur.fetchall()
+                    other.execute("SELECT 1")
+                    assert other.fetchall() == [(1,)]
+
+    def test_close_releases_connection(self, connection):
+        with self.create_table(connection, "users", uid="INT"):
+            with contextlib.closing(connection.cursor()) as cur:
+                cur.executemany("INSERT INTO users (uid) VALUES (%s)", [(i,) for i in range(3)])
+            cur = connection.cursor(SSCursor)
+            cur.execute("SELECT * FROM users")
+            cur.fetchone()
+            cur.close()
+            with contextlib.closing(connection.cursor()) as cur:
+                cur.execute("SELECT COUNT(*) FROM users")
+                assert cur.fetchall() == [(3,)]
+
+    def test_dict_cursor(self, connection):
+        with self.create_table(connection, "people", name="VARCHAR(20)"):
+            with contextlib.closing(connection.cursor()) as cur:
+                cur.execute("INSERT INTO people (name) VALUES ('guido')")
+            with contextlib.closing(connection.cursor(SSDictCursor)) as cur:
+                cur.execute("SELECT * FROM people")
+                assert cur.fetchall() == [{"name": "guido"}]
+
+    def test_blob_views(self, connection):
+        with py.test.raises(connection.NotSupportedError):
+            connection.cursor(SSCursor, blob_views=True)
+
+    def test_prefetch(self, connection):
+        with self.create_table(connection, "users", uid="INT"):
+            with contextlib.closing(connection.cursor()) as cur:
+                cur.executemany("INSERT INTO users (uid) VALUES (%s)", [(i,) for i in range(100)])
+            with contextlib.closing(connection.cursor(SSCursor)) as cur:
+                cur.execute("SELECT * FROM users ORDER BY uid")
+                assert cur.fetchone() == (0,)
+                with cur.prefetch(size=7) as rows:
+                    assert list(rows) == [(i,) for i in range(1, 100)]
+                cur.execute("SELECT * FROM users ORDER BY uid")
+                with cur.prefetch(size=7) as rows:
+                    assert next(rows) == (0,)
+                cur.execute("SELECT COUNT(*) FROM users")
+                assert cur.fetchall() == [(100,)]
+
+    def test_prefetch_error(self, connection):
+        with contextlib.closing(connection.cursor(SSCursor)) as cur:
+            cur.execute("SELECT 1")
+            cur._result._build_row = lambda values, lengths: 1 / 0
+            with py.test.raises(ZeroDivisionError):
+                list(cur.prefetch())
+
+    def test_prefetch_abandoned(self, connection):
+        with self.create_table(connection, "users", uid="INT"):
+            with contextlib.closing(connection.cursor()) as cur:
+                cur.executemany("INSERT INTO users (uid) VALUES (%s)", [(i,) for i in range(100)])
+            with contextlib.closing(connection.cursor(SSCursor)) as cur:
+                cur.execute("SELECT * FROM users ORDER BY uid")
+                rows = cur.prefetch(size=7, depth=1)
+                assert next(rows) == (0,)
+                # Dropping the iterator without closing it stops its thread.
+                thread = rows._thread
+                ref = weakref.ref(rows)
+                del rows
+                gc.collect()
+                assert ref() is None
+                thread.join(1)
+                assert not thread.is_alive()
+
+    def test_prefetch_break(self, connection):
+        with self.create_table(connection, "users", uid="INT"):
+            with contextlib.closing(connection.cursor()) as cur:
+                cur.executemany("INSERT INTO users (uid) VALUES (%s)", [(i,) for i in range(1000)])
+            with contextlib.closing(connection.cursor(SSCursor)) as cur:
+                cur.execute("SELECT * FROM users ORDER BY uid")
+                for row in cur.prefetch(size=7, depth=1):
+                    break
+                thread = cur._prefetching[2]
+                # The thread is stopped before the next query is sent.
+                cur.execute("SELECT COUNT(*) FROM users")
+                assert not thread.is_alive()
+                assert cur.fetchall() == [(1000,)]
+
+
+class TestLazyCursor(BaseMySQLTests):
+    def test_fetch(self, connection):
+        with self.create_table(connection, "users", uid="INT"):
+            with contextlib.closing(connection.cursor()) as cur:
+                cur.executemany("INSERT INTO users (uid) VALUES (%s)", [(i,) for i in range(10)])
+            with contextlib.closing(connection.cursor(LazyCursor)) as cur:
+                cur.execute("SELECT * FROM users ORDER BY uid")
+                assert cur.rowcount == 10
+                assert cur.fetchone() == (0,)
+                assert cur.fetchmany(2) == [(1,), (2,)]
+                assert cur[0] == (0,)
+                assert cur[-1] == (9,)
+                with py.test.raises(IndexError):
+                    cur[10]
+                # Reading by index doesn't move the cursor.
+                assert cur.rownumber == 3
+                assert cur.fetchone() == (3,)
+                cur.scroll(-3)
+                assert cur.fetchone() == (1,)
+                cur.scroll(8, "absolute")
+                assert cur.fetchall() == [(8,), (9,)]
+                assert cur.fetchone() is None
+                cur.scroll(0, "absolute")
+                assert list(cur) == [(i,) for i in range(10)]
+                # No rows are kept on the Python side.
+                assert cur._result.rows == []
+
+    def test_fetch_columns(self, connection):
+        with contextlib.closing(connection.cursor(LazyCursor)) as cur:
+            cur.execute("SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3")
+            cur.scroll(1)
+            assert list(cur.fetch_columns().columns[0]) == [2, 3]
+
+
+class TestLazyRowCursor(BaseMySQLTests):
+    def test_fetch(self, connection):
+        with contextlib.closing(connection.cursor(LazyRowCursor)) as cur:
+            cur.execute("SELECT 1 AS a, 'x' AS b, CAST('2012-01-02' AS DATE) AS c, NULL AS d")
+            row = cur.fetchone()
+            assert row[0] == 1
+            assert row["b"] == "x"
+            assert row.c == datetime.date(2012, 1, 2)
+            assert row.d is None
+            assert row[1:3] == ("x", datetime.date(2012, 1, 2))
+            assert row == (1, "x", datetime.date(2012, 1, 2), None)
+            assert row.keys() == ["a", "b", "c", "d"]
+            assert row.as_dict() == {"a": 1, "b": "x", "c": datetime.date(2012, 1, 2), "d": None}
+            with py.test.raises(KeyError):
+                row["e"]
+            with py.test.raises(AttributeError):
+                row.e
+            assert row.get("e", 2) == 2
+
+    def test_decoded_once(self, connection):
+        with contextlib.closing(connection.cursor(LazyRowCursor)) as cur:
+            cur.execute("SELECT 1 AS a, 'x' AS b")
+            row, = cur.fetchall()
+            # Nothing is decoded until it's read, and then only once.
+            assert row._values is None
+            assert row.b is row[1]
+            assert row._values[0] is not None and row._values[0] != 1
@@ -22,8 +22,55 @@ class MySQLDBAPI20Tests(dbapi20.DatabaseAPI20Test):
     def is_table_does_not_exist(self, exc):
         return exc.args[0] == 1051
 
+    lower_func = "test_lower"
+
+    def test_callproc(self):
+        con = self._connect()
+        try:
+            cur = con.cursor()
+            cur.execute("CREATE PROCEDURE %s (s VARCHAR(20)) SELECT LOWER(s)" %
+                self.lower_func)
+        finally:
+            con.close()
+        try:
+            super(MySQLDBAPI20Tests, self).test_callproc()
+        finally:
+            con = self._connect()
+            try:
+                con.cursor().execute("DROP PROCEDURE %s" % self.lower_func)
+            finally:
+                con.close()
+
+    def help_nextset_setUp(self, cur):
+        cur.execute("CREATE PROCEDURE deleteme () BEGIN "
+            "SELECT COUNT(*) FROM %sbooze; SELECT name FROM %sbooze; END" %
+            (self.table_prefix, self.table_prefix))
+
+    def help_nextset_tearDown(self, cur):
+        cur.execute("DROP PROCEDURE deleteme")
+
     def test_nextset(self):
-        py.test.skip("No idea what this is, skipping for now")
+        con = self._connect()
+        try:
+            cur = con.cursor()
+            try:
+                self.executeDDL1(cur)
+                for sql in self._populate():
+                    cur.execute(sql)
+
+                self.help_nextset_setUp(cur)
+
+                cur.callproc("deleteme")
+                numberofrows = cur.fetchone()
+                assert numberofrows[0] == len(self.samples)
+                assert cur.nextset()
+                names = cur.fetchall()
+                assert len(names) == len(self.samples)
+                assert cur.nextset() is None
+            finally:
+                self.help_nextset_tearDown(cur)
+        finally:
+            con.close()
 
     def test_setoutputsize(self):
         py.test.skip("No idea what this is, skipping for now")
\ No newline at end of file
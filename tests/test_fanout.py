@@ -0,0 +1,103 @@
+import time
+from urllib.parse import quote
+
+import py
+
+from MySQLdb.fanout import fanout, fanout_rows, parse_dsn, FanOutError
+
+
+class TestFanOut(object):
+    def test_parse_dsn(self):
+        assert parse_dsn("mysql://us%40r:pw@db1:3307/shard_1?charset=utf8") == {
+            "host": "db1", "port": 3307, "user": "us@r", "passwd": "pw",
+            "db": "shard_1", "charset": "utf8",
+        }
+        assert parse_dsn("mysql://db1/?connect_timeout=5&local_infile=yes&"
+            "use_unicode=0") == {
+            "host": "db1", "connect_timeout": 5, "local_infile": True,
+            "use_unicode": False,
+        }
+        with py.test.raises(ValueError):
+            parse_dsn("postgres://db1/shard_1")
+        with py.test.raises(ValueError):
+            parse_dsn("mysql://db1/?local_infile=maybe")
+
+    def test_dsn_charset(self, connect_kwargs):
+        userinfo = quote(connect_kwargs["user"], safe="")
+        if connect_kwargs["passwd"]:
+            userinfo += ":" + quote(connect_kwargs["passwd"], safe="")
+        dsn = "mysql://%s@%s/%s?charset=utf8mb4" % (userinfo,
+            connect_kwargs["host"], connect_kwargs["db"])
+        result, = fanout([dsn], "SELECT @@character_set_client")
+        assert result.rows == [("utf8mb4",)]
+
+    def test_queued_shard_timeout(self, connect_kwargs):
+        # Each shard gets the whole timeout from when it starts.
+        results = fanout([connect_kwargs] * 3, "SELECT SLEEP(0.4)",
+            timeout=0.6, max_workers=1)
+        assert all(result.ok for result in results)
+
+    def test_fanout(self, connection, connect_kwargs):
+        results = fanout([connection, connect_kwargs, connect_kwargs],
+            "SELECT %s", (1,))
+        assert [result.shard for result in results] == [0, 1, 2]
+        assert [result.rows for result in results] == [[(1,)]] * 3
+        assert all(result.ok for result in results)
+
+    def test_same_connection(self, connection):
+        with py.test.raises(ValueError):
+            fanout([connection, connection], "SELECT 1")
+
+    def test_abandoned(self, connection, connect_kwargs):
+        # Shards still queued when iteration stops aren't run. Each shard
+        # that connects records it, before autocommit is turned off.
+        cursor = connection.cursor()
+        cursor.execute("CREATE TABLE fanout_runs (a INT)")
+        try:
+            shard = dict(connect_kwargs,
+                init_command=b"INSERT INTO fanout_runs VALUES (1)")
+            rows = fanout_rows([shard] * 5, "SELECT SLEEP(0.3)", max_workers=1)
+            assert next(rows) == (0,)
+            rows.close()
+            time.sleep(1.5)
+            cursor.execute("SELECT COUNT(*) FROM fanout_runs")
+            assert cursor.fetchall()[0][0] <= 2
+        finally:
+            cursor.execute("DROP TABLE fanout_runs")
+
+    def test_parallel(self, connect_kwargs):
+        start = time.time()
+        results = fanout([connect_kwargs] * 4, "SELECT SLEEP(0.5)")
+        assert all(result.ok for result in results)
+        assert time.time() - start < 1.5
+
+    def test_partial_failure(self, connect_kwargs):
+        bad = dict(connect_kwargs, db="nonexistent_database")
+        results = fanout([connect_kwargs, bad], "SELECT 1")
+        assert results[0].rows == [(1,)]
+        assert not results[1].ok
+        with py.test.raises(FanOutError) as exc:
+            list(fanout_rows([connect_kwargs, bad], "SELECT 1"))
+        assert [result.shard for result in exc.value.failures] == [1]
+
+    def test_timeout(self, connect_kwargs):
+        start = time.time()
+        results = fanout([connect_kwargs, connect_kwargs], "SELECT SLEEP(%s)",
+            (5,), timeout=0.5)
+        assert [result.ok for result in results] == [False, False]
+        assert time.time() - start < 1
+
+    def test_timeout_connection(self, connection):
+        results = fanout([connection], "SELECT SLEEP(%s)", (1,), timeout=0.2)
+        assert not results[0].ok
+        # The query is still running, so the connection can't be used.
+        with py.test.raises(connection.ProgrammingError):
+            connection.cursor().execute("SELECT 1")
+        time.sleep(1.5)
+        cursor = connection.cursor()
+        cursor.execute("SELECT 1")
+        assert cursor.fetchall() == [(1,)]
+
+    def test_rows(self, connect_kwargs):
+        rows = fanout_rows([connect_kwargs] * 3, "SELECT 1 UNION ALL SELECT 2")
+        assert sorted(rows) == [(1,)] * 3 + [(2,)] * 3
@@ -0,0 +1,68 @@
+import contextlib
+import threading
+
+import py
+
+from MySQLdb.exceptions import OperationalError
+
+
+class TestConnectionPool(object):
+    @py.test.mark.pool_opts(min_size=3, max_size=3)
+    def test_warm_up(self, pool):
+        assert pool.size == 3
+        assert pool.idle == 3
+
+    def test_reuse(self, pool):
+        with pool.connection() as conn:
+            pass
+        with pool.connection() as conn2:
+            assert conn2 is conn
+        assert pool.size == 1
+
+    @py.test.mark.pool_opts(min_size=0, max_size=2)
+    def test_max_size(self, pool):
+        conn = pool.checkout()
+        conn2 = pool.checkout()
+        with py.test.raises(OperationalError):
+            pool.checkout(timeout=0.1)
+        threading.Timer(0.1, pool.checkin, [conn]).start()
+        assert pool.checkout(timeout=5) is conn
+        pool.checkin(conn)
+        pool.checkin(conn2)
+
+    def test_checkin_resets(self, pool):
+        with pool.connection() as conn:
+            conn.autocommit(True)
+        with pool.connection() as conn:
+            with contextlib.closing(conn.cursor()) as cursor:
+                cursor.execute("SELECT @@autocommit")
+                assert cursor.fetchall() == [(0,)]
+
+    def test_closed_connection_discarded(self, pool):
+        with pool.connection() as conn:
+            conn.close()
+        assert pool.size == 0
+        with pool.connection() as conn2:
+            assert conn2 is not conn
+
+    @py.test.mark.pool_opts(ping_interval=0)
+    def test_dead_connection_replaced(self, pool):
+        conn = pool.checkout()
+        conn2 = pool.checkout()
+        with contextlib.closing(conn.cursor()) as cursor:
+            cursor.execute("SELECT CONNECTION_ID()")
+            (connection_id,), = cursor.fetchall()
+        pool.checkin(conn)
+        with contextlib.closing(conn2.cursor()) as cursor:
+            cursor.execute("KILL %s", (connection_id,))
+        with pool.connection() as conn3:
+            assert conn3 is not conn
+            with contextlib.closing(conn3.cursor()) as cursor:
+                cursor.execute("SELECT 1")
+                assert cursor.fetchall() == [(1,)]
+        pool.checkin(conn2)
+
+    def test_closed(self, pool):
+        pool.close()
+        with py.test.raises(OperationalError):
+            pool.checkout()
@@ -0,0 +1,149 @@
+import array
+import contextlib
+import datetime
+
+import py
+
+from MySQLdb import statements
+from MySQLdb.statements import PreparedCursor
+
+from .base import BaseMySQLTests
+
+
+class TestPreparedCursor(BaseMySQLTests):
+    def test_select(self, connection):
+        with self.create_table(connection, "people", uid="INT", name="VARCHAR(20)"):
+            with contextlib.closing(connection.cursor(PreparedCursor)) as cur:
+                cur.executemany("INSERT INTO people (uid, name) VALUES (%s, %s)", [(1, "alex"), (2, "guido")])
+                assert cur.rowcount == 2
+                cur.execute("SELECT name FROM people WHERE uid = %s", (2,))
+                assert cur.fetchall() == [("guido",)]
+                cur.execute("SELECT name FROM people WHERE uid = %(uid)s", {"uid": 1})
+                assert cur.fetchall() == [("alex",)]
+                cur.execute("SELECT uid FROM people WHERE name LIKE 'g%'")
+                assert cur.fetchall() == [(2,)]
+
+    def test_roundtrip(self, connection):
+        values = (
+            None, 3, 2 ** 63, 1.5, "m\xf2\r\n",
+            datetime.datetime(2011, 5, 6, 12, 30, 1), datetime.date(2011, 5, 6),
+        )
+        with self.create_table(connection, "things", a="INT", b="INT",
+            c="BIGINT UNSIGNED", d="DOUBLE", e="VARCHAR(20)", f="DATETIME",
+            g="DATE"):
+            with contextlib.closing(connection.cursor(PreparedCursor)) as cur:
+                cur.execute("INSERT INTO things (a, b, c, d, e, f, g) VALUES "
+                    "(%s, %s, %s, %s, %s, %s, %s)", values)
+                cur.execute("SELECT a, b, c, d, e, f, g FROM things")
+                assert cur.fetchall() == [values]
+
+    def test_binary_result(self, connection):
+        values = [
+            (-3, 2 ** 64 - 1, 0.25, datetime.datetime(2011, 5, 6, 12, 30, 1),
+                datetime.date(2011, 5, 6), datetime.timedelta(hours=-25),
+                b"x" * 100),
+            (None, None, None, None, None, None, None),
+        ]
+        with self.create_table(connection, "things", a="INT",
+            b="BIGINT UNSIGNED", c="DOUBLE", d="DATETIME", e="DATE", f="TIME",
+            g="TEXT"):
+            with contextlib.closing(connection.cursor(PreparedCursor)) as cur:
+                cur.executemany("INSERT INTO things VALUES "
+                    "(%s, %s, %s, %s, %s, %s, %s)", values)
+                cur.execute("SELECT * FROM things ORDER BY a IS NULL")
+                assert cur.fetchall() == values
+
+    def test_large_buffers_dropped(self, connection):
+        with self.create_table(connection, "things", a="LONGBLOB"):
+            with contextlib.closing(connection.cursor(PreparedCursor)) as cur:
+                cur.executemany("INSERT INTO things VALUES (%s)",
+                    [(b"x" * 10,), (b"x" * 1000000,)])
+                cur.execute("SELECT a FROM things ORDER BY LENGTH(a)")
+                assert [len(a) for a, in cur.fetchall()] == [10, 1000000]
+                statement = cur._result.statement
+                assert len(statement.result_buffers.strings[0]) >= 1000000
+                cur.execute("DO 1")
+                size = len(statement.result_buffers.strings[0])
+                assert size <= statements.MAX_KEPT_STRING_BUFFER_SIZE
+
+    def test_fetch_columns(self, connection):
+        with self.create_table(connection, "things", a="INT", b="DOUBLE",
+            c="VARCHAR(10)"):
+            with contextlib.closing(connection.cursor(PreparedCursor)) as cur:
+                cur.executemany("INSERT INTO things VALUES (%s, %s, %s)",
+                    [(i, i / 2.0, str(i)) for i in range(5)] + [(None, None, None)])
+                cur.execute("SELECT a, b, c FROM things ORDER BY a IS NULL, a")
+                assert cur.fetchone() == (0, 0.0, "0")
+                batch = cur.fetch_columns()
+                assert len(batch) == 5
+                assert batch.columns[0] == array.array("q", [1, 2, 3, 4, 0])
+                assert batch.column("b")[:2] == array.array("d", [0.5, 1.0])
+                assert batch.column("c") == ["1", "2", "3", "4", None]
+                assert [batch.is_valid(0, i) for i in range(3, 5)] == [True, False]
+                assert cur.fetchall() == []
+                cur.execute("SELECT a FROM things WHERE a IS NOT NULL ORDER BY a")
+                batches = list(cur.fetch_column_batches(2))
+                assert [list(batch.columns[0]) for batch in batches] == [[0, 1], [2, 3], [4]]
+
+    def test_fetch_raw_columns(self, connection):
+        py.test.importorskip("numpy")
+        with contextlib.closing(connection.cursor(PreparedCursor)) as cur:
+            cur.execute("SELECT 1")
+            with py.test.raises(connection.NotSupportedError):
+                cur.fetch_numpy()
+            with py.test.raises(connection.NotSupportedError):
+                cur._result.fetch_raw_columns()
+            assert cur.fetchall() == [(1,)]
+
+    def test_result_error(self, connection):
+        def fail(result):
+            raise connection.InternalError(0, "bind failed")
+        with contextlib.closing(connection.cursor(PreparedCursor)) as cur:
+            bind_result = statements.StatementResult._bind_result
+            statements.StatementResult._bind_result = fail
+            try:
+                with py.test.raises(connection.InternalError):
+                    cur.execute("SELECT %s", (1,))
+            finally:
+                statements.StatementResult._bind_result = bind_result
+            # The cached statement isn't left busy, so it's used again.
+            statement, = connection._statements._items.values()
+            assert statement.result is None
+            cur.execute("SELECT %s", (1,))
+            assert cur._result.statement is statement
+            assert cur.fetchall() == [(1,)]
+
+    def test_statement_cached(self, connection):
+        with contextlib.closing(connection.cursor(PreparedCursor)) as cur:
+            cur.execute("SELECT CONCAT(%s, 'x')", ("a",))
+            statement = cur._result.statement
+            cur.execute("SELECT CONCAT(%s, 'x')", ("b",))
+            assert cur._result.statement is statement
+            assert cur.fetchall() == [("bx",)]
+
+    def test_statement_in_use(self, connection):
+        with contextlib.closing(connection.cursor(PreparedCursor)) as cur1:
+            with contextlib.closing(connection.cursor(PreparedCursor)) as cur2:
+                cur1.execute("SELECT CONCAT(%s, 'x')", ("a",))
+                cur2.execute("SELECT CONCAT(%s, 'x')", ("b",))
+                assert cur1._result.statement is not cur2._result.statement
+                assert cur2.fetchall() == [("bx",)]
+                assert cur1.fetchall() == [("ax",)]
+
+    @py.test.mark.connect_opts(statement_cache_size=1)
+    def test_statement_evicted(self, connection):
+        with contextlib.closing(connection.cursor(PreparedCursor)) as cur:
+            cur.execute("SELECT CONCAT(%s, 'x')", ("a",))
+            statement = cur._result.statement
+            with contextlib.closing(connection.cursor(PreparedCursor)) as other:
+                other.execute("SELECT CONCAT(%s, 'y')", ("a",))
+                assert other.fetchall() == [("ay",)]
+            assert not statement.closed
+            assert cur.fetchall() == [("ax",)]
+            cur.execute("SELECT 1")
+            assert statement.closed
+
+    def test_error(self, connection):
+        with contextlib.closing(connection.cursor(PreparedCursor)) as cur:
+            with py.test.raises(connection.ProgrammingError):
+                cur.execute("SELECT * FROM nonexistant WHERE a = %s", (1,))